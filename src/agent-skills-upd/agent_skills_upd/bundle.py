@@ -0,0 +1,211 @@
+"""Offline bundles: many resources from any sources in one file.
+
+A bundle is a zip laid out like an agent-resources repo (so it is also a
+valid local archive source) with a `bundle.json` index at its root:
+
+    {
+      "format": 1,
+      "created_at": 1760000000.0,
+      "resources": [
+        {"type": "skill", "name": "pdf", "path": ".claude/skills/pdf",
+         "source": "anthropics/pdf", "sha256": "...", "files": {...}},
+        ...
+      ]
+    }
+
+Zip members are compressed individually and listed in the central
+directory, so installing one resource seeks straight to its members and
+inflates only those. The index carries each resource's digest, which is
+checked on install.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from agent_skills_upd import integrity, metrics, tracing
+from agent_skills_upd.exceptions import (
+    SkillUpdError,
+    RepoNotFoundError,
+    ResourceNotFoundError,
+)
+from agent_skills_upd.fetcher import (
+    RESOURCE_CONFIGS,
+    ResourceType,
+    fetch_clawdhub_skill,
+    install_from_provider,
+)
+
+if TYPE_CHECKING:
+    from agent_skills_upd.providers import SourceProvider
+
+BUNDLE_INDEX = "bundle.json"
+BUNDLE_FORMAT = 1
+
+
+@dataclass
+class BundleItem:
+    """A resource to pack into a bundle."""
+
+    resource_type: ResourceType
+    name: str | None
+    # Provider to fetch from, or None for a Clawdhub skill (name is the slug)
+    provider: "SourceProvider | None"
+    ref: str  # as given by the user, kept in the index
+
+
+def fetch_item(item: BundleItem, root: Path) -> Path:
+    """Install an item into the repo-shaped scratch tree at root (not recorded)."""
+    dest = root / RESOURCE_CONFIGS[item.resource_type].source_subdir
+    if item.provider is None:
+        return fetch_clawdhub_skill(item.name, dest, record=False).path
+    return install_from_provider(
+        item.provider, item.name, dest, item.resource_type, record=False
+    )
+
+
+def _write_members(archive: zipfile.ZipFile, root: Path, path: Path) -> dict[str, str]:
+    """Add a resource's files to the zip, hashing them as they are read."""
+    files = [path] if path.is_file() else sorted(p for p in path.rglob("*") if p.is_file())
+    digests = {}
+    for file in files:
+        arcname = file.relative_to(root).as_posix()
+        info = zipfile.ZipInfo.from_file(file, arcname)
+        info.compress_type = zipfile.ZIP_DEFLATED
+        digest = hashlib.sha256()
+        with file.open("rb") as source, archive.open(info, "w") as target:
+            while chunk := source.read(integrity.HASH_CHUNK_SIZE):
+                digest.update(chunk)
+                target.write(chunk)
+        digests["" if file == path else file.relative_to(path).as_posix()] = digest.hexdigest()
+    return digests
+
+
+def create_bundle(output: Path, items: list[BundleItem]) -> list[dict]:
+    """
+    Fetch resources and pack them into a bundle at output.
+
+    Args:
+        output: Bundle file to write (replaced atomically)
+        items: Resources to include
+
+    Returns:
+        The index entries written
+
+    Raises:
+        SkillUpdError: If a resource is listed twice or can't be fetched
+    """
+    entries: list[dict] = []
+    seen: set[tuple[ResourceType, str]] = set()
+    output.parent.mkdir(parents=True, exist_ok=True)
+    partial = output.with_name(f".{output.name}.{os.getpid()}.part")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        root = Path(tmp_dir)
+        try:
+            with zipfile.ZipFile(partial, "w") as archive:
+                for item in items:
+                    with tracing.span("bundle.fetch", ref=item.ref):
+                        path = fetch_item(item, root)
+                    name = path.stem if path.is_file() else path.name
+                    if (item.resource_type, name) in seen:
+                        raise SkillUpdError(
+                            f"{item.resource_type.value.capitalize()} '{name}' is listed twice."
+                        )
+                    seen.add((item.resource_type, name))
+
+                    with tracing.span("bundle.write", ref=item.ref):
+                        files = _write_members(archive, root, path)
+                    entries.append(
+                        {
+                            "type": item.resource_type.value,
+                            "name": name,
+                            "path": path.relative_to(root).as_posix(),
+                            "source": item.ref,
+                            "sha256": integrity.resource_digest(files),
+                            "files": files,
+                        }
+                    )
+
+                index = {"format": BUNDLE_FORMAT, "created_at": time.time(), "resources": entries}
+                archive.writestr(BUNDLE_INDEX, json.dumps(index, indent=2, sort_keys=True))
+            partial.replace(output)
+        finally:
+            partial.unlink(missing_ok=True)
+    return entries
+
+
+def read_bundle_index(bundle: Path) -> list[dict]:
+    """
+    Read a bundle's resource index (only the index member is inflated).
+
+    Raises:
+        RepoNotFoundError: If the bundle doesn't exist
+        SkillUpdError: If the file isn't a bundle
+    """
+    if not bundle.exists():
+        raise RepoNotFoundError(f"Bundle not found: {bundle}")
+    try:
+        with zipfile.ZipFile(bundle) as archive:
+            index = json.loads(archive.read(BUNDLE_INDEX))
+    except (zipfile.BadZipFile, KeyError, ValueError) as exc:
+        raise SkillUpdError(f"Not a bundle (no readable {BUNDLE_INDEX}): {bundle}") from exc
+    if index.get("format") != BUNDLE_FORMAT:
+        raise SkillUpdError(f"Unsupported bundle format {index.get('format')!r}: {bundle}")
+    return index["resources"]
+
+
+@metrics.instrument_install("bundle")
+def fetch_bundle_resource(
+    bundle: Path,
+    name: str,
+    dest: Path | list[Path],
+    resource_type: ResourceType,
+    overwrite: bool = True,
+) -> Path | list[Path]:
+    """
+    Install one resource from a bundle, without network access.
+
+    Only the resource's own members are read from the bundle, and their
+    digest is checked against the bundle index.
+
+    Args:
+        bundle: Bundle written by `create_bundle`
+        name: Name of the resource
+        dest: Destination directory, or a list of them
+        resource_type: Type of resource (SKILL, COMMAND, or AGENT)
+        overwrite: Whether to overwrite existing resource
+
+    Returns:
+        Path to the installed resource (a list when dest is a list)
+
+    Raises:
+        ResourceNotFoundError: If the bundle doesn't contain the resource
+        IntegrityError: If the bundled files don't match the index
+    """
+    from agent_skills_upd.providers import LocalArchiveProvider
+
+    entries = read_bundle_index(bundle)
+    entry = next(
+        (
+            entry
+            for entry in entries
+            if entry["type"] == resource_type.value and entry["name"] == name
+        ),
+        None,
+    )
+    if entry is None:
+        available = sorted(e["name"] for e in entries if e["type"] == resource_type.value)
+        raise ResourceNotFoundError(
+            f"{resource_type.value.capitalize()} '{name}' not found in bundle {bundle}.\n"
+            f"Available: {', '.join(available) or 'none'}"
+        )
+
+    provider = LocalArchiveProvider(bundle)
+    return install_from_provider(provider, name, dest, resource_type, overwrite, entry["sha256"])
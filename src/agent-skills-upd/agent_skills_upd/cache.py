@@ -0,0 +1,66 @@
+"""Local cache locations for agent-skills-upd.
+
+Besides the writable cache directory, read-only cache layers (e.g. a cache
+baked into a container image) can be listed in AGENT_SKILLS_UPD_CACHE_LAYERS.
+Archives, Clawdhub packages and default-branch refs are looked up in the writable cache first
+and then in each layer, in order; everything is written to the writable
+cache only, so layers are used in place and never copied.
+"""
+
+import os
+from pathlib import Path
+
+CACHE_DIR_ENV = "AGENT_SKILLS_UPD_CACHE_DIR"
+LAYERS_ENV = "AGENT_SKILLS_UPD_CACHE_LAYERS"
+# Subdirectories holding repo archives, bare git mirrors and Clawdhub packages
+ARCHIVE_CACHE_SUBDIR = "archives"
+GIT_CACHE_SUBDIR = "git"
+CLAWDHUB_CACHE_SUBDIR = "clawdhub"
+
+
+def get_cache_dir() -> Path:
+    """Return the cache directory, honoring AGENT_SKILLS_UPD_CACHE_DIR and XDG."""
+    override = os.environ.get(CACHE_DIR_ENV)
+    if override:
+        return Path(override).expanduser()
+
+    xdg_cache = os.environ.get("XDG_CACHE_HOME")
+    base = Path(xdg_cache).expanduser() if xdg_cache else Path.home() / ".cache"
+    return base / "agent-skills-upd"
+
+
+def get_cache_layers() -> list[Path]:
+    """Return the read-only cache layers, in lookup order (os.pathsep-separated)."""
+    cache_dir = get_cache_dir()
+    layers = []
+    for entry in os.environ.get(LAYERS_ENV, "").split(os.pathsep):
+        layer = Path(entry).expanduser() if entry.strip() else None
+        if layer is not None and layer != cache_dir and layer not in layers:
+            layers.append(layer)
+    return layers
+
+
+def find_in_layers(path: Path) -> Path | None:
+    """
+    Return the first read-only layer's copy of a path in the cache directory.
+
+    Args:
+        path: Location inside the writable cache directory
+
+    Returns:
+        The same relative location in a layer, or None if no layer has it
+    """
+    try:
+        relative = path.relative_to(get_cache_dir())
+    except ValueError:
+        return None
+    for layer in get_cache_layers():
+        candidate = layer / relative
+        if candidate.exists():
+            return candidate
+    return None
+
+
+def safe_host(host: str) -> str:
+    """Turn a host (optionally with scheme/port) into a single path component."""
+    return host.split("://", 1)[-1].strip("/").replace("/", "_").replace(":", "_")
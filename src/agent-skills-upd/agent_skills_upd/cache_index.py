@@ -0,0 +1,332 @@
+"""Usage index of the download cache, with size-capped eviction.
+
+Repo archives, git mirrors and Clawdhub packages are recorded in `cache.db` each time they
+are used: their size, when they were last used and how often, plus hit,
+miss and revalidation counts (and the bytes a reused entry saved). When a
+size cap is configured, least recently used (or least frequently used)
+entries are evicted after downloads until the cache fits again; `gc`
+does the same on demand.
+
+Only those entries, in the writable cache, are ever evicted.
+The install registry, default-branch refs, compiled config, locks and
+read-only cache layers stay where they are.
+"""
+
+import os
+import re
+import shutil
+import sqlite3
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from agent_skills_upd import db, locks
+from agent_skills_upd.cache import (
+    ARCHIVE_CACHE_SUBDIR,
+    CLAWDHUB_CACHE_SUBDIR,
+    GIT_CACHE_SUBDIR,
+    get_cache_dir,
+)
+from agent_skills_upd.exceptions import SkillUpdError
+
+CACHE_DB = "cache.db"
+MAX_SIZE_ENV = "AGENT_SKILLS_UPD_CACHE_MAX_SIZE"
+POLICY_ENV = "AGENT_SKILLS_UPD_CACHE_POLICY"
+POLICIES = ("lru", "lfu")
+# Entries used this recently may still be read by a running install.
+GC_GRACE_SECONDS = 300.0
+
+_SIZE_RE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([kmgt]?)i?b?\s*$", re.IGNORECASE)
+_SIZE_UNITS = {"": 1, "k": 1024, "m": 1024**2, "g": 1024**3, "t": 1024**4}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    size INTEGER NOT NULL DEFAULT 0,
+    last_used REAL NOT NULL DEFAULT 0,
+    uses INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS requests (
+    kind TEXT NOT NULL,
+    result TEXT NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    bytes_saved INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (kind, result)
+);
+"""
+
+
+@dataclass
+class CacheEntry:
+    """One evictable cache entry (a repo archive, git mirror or Clawdhub package)."""
+
+    key: str
+    kind: str
+    size: int
+    last_used: float
+    uses: int
+
+
+@dataclass
+class CacheStats:
+    """Cache usage summary, as reported by `cache stats`."""
+
+    hits: int = 0
+    misses: int = 0
+    revalidated: int = 0
+    bytes_saved: int = 0
+    total_size: int = 0
+    entries: int = 0
+    largest: list[CacheEntry] = field(default_factory=list)
+
+    @property
+    def requests(self) -> int:
+        return self.hits + self.misses + self.revalidated
+
+    @property
+    def hit_ratio(self) -> float:
+        """Share of requests served from the cache (revalidations included)."""
+        return (self.hits + self.revalidated) / self.requests if self.requests else 0.0
+
+    @property
+    def miss_ratio(self) -> float:
+        return self.misses / self.requests if self.requests else 0.0
+
+
+def parse_size(value: str) -> int:
+    """
+    Parse a size such as 500M, 2G or 1048576 into bytes.
+
+    Raises:
+        SkillUpdError: If the size can't be parsed
+    """
+    match = _SIZE_RE.match(value)
+    if not match:
+        raise SkillUpdError(f"Invalid size '{value}'. Expected e.g. 500M, 2G or 1048576.")
+    number, unit = match.groups()
+    return int(float(number) * _SIZE_UNITS[unit.lower()])
+
+
+def format_size(size: float) -> str:
+    """Format a byte count for humans (e.g. 1.5 MB)."""
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def max_cache_size() -> int | None:
+    """Return the configured size cap in bytes, or None for an unbounded cache."""
+    value = os.environ.get(MAX_SIZE_ENV, "").strip()
+    if not value:
+        return None
+    return parse_size(value) or None
+
+
+def eviction_policy() -> str:
+    """Return the configured eviction policy (lru or lfu)."""
+    policy = os.environ.get(POLICY_ENV, "lru").strip().lower()
+    return policy if policy in POLICIES else "lru"
+
+
+@contextmanager
+def _connect() -> Iterator[sqlite3.Connection]:
+    with db.connect(get_cache_dir() / CACHE_DB, _SCHEMA) as conn:
+        yield conn
+
+
+def _key(path: Path) -> str:
+    return path.relative_to(get_cache_dir()).as_posix()
+
+
+def _entry_files(path: Path, kind: str) -> list[Path]:
+    """Return what belongs to an entry: the archive and its metadata, or the mirror."""
+    if kind == "archive":
+        return [path, path.with_name(f"{path.name}.json")]
+    return [path]
+
+
+def _entry_size(path: Path, kind: str) -> int:
+    total = 0
+    for item in _entry_files(path, kind):
+        if item.is_dir():
+            for dirpath, _, filenames in os.walk(item):
+                for name in filenames:
+                    try:
+                        total += os.lstat(os.path.join(dirpath, name)).st_size
+                    except OSError:
+                        pass
+        else:
+            try:
+                total += item.stat().st_size
+            except OSError:
+                pass
+    return total
+
+
+def _entry_lock(path: Path) -> Path:
+    # The lock fetches take while writing the entry.
+    return path.with_name(f"{path.name}.lock")
+
+
+def record_use(path: Path, kind: str, result: str) -> None:
+    """
+    Record a use of a cache entry and evict if the cache grew past its cap.
+
+    Args:
+        path: Archive, git mirror directory or Clawdhub package, in the
+            cache or in a read-only cache layer (counted, but never evicted)
+        kind: "archive", "git" or "clawdhub"
+        result: "hit", "miss" (downloaded) or "revalidated"
+    """
+    try:
+        size = _entry_size(path, kind)
+        with _connect() as conn, db.transaction(conn):
+            if path.is_relative_to(get_cache_dir()):
+                conn.execute(
+                    "INSERT INTO entries (key, kind, size, last_used, uses) "
+                    "VALUES (?, ?, ?, ?, 1) "
+                    "ON CONFLICT (key) DO UPDATE SET size = excluded.size, "
+                    "last_used = excluded.last_used, uses = uses + 1",
+                    (_key(path), kind, size, time.time()),
+                )
+            conn.execute(
+                "INSERT INTO requests (kind, result, count, bytes_saved) VALUES (?, ?, 1, ?) "
+                "ON CONFLICT (kind, result) DO UPDATE SET count = count + 1, "
+                "bytes_saved = bytes_saved + excluded.bytes_saved",
+                (kind, result, 0 if result == "miss" else size),
+            )
+        if result == "miss" and max_cache_size() is not None:
+            gc()
+    except (OSError, ValueError, sqlite3.Error, SkillUpdError):
+        # Bookkeeping must never fail an install.
+        pass
+
+
+def _discover() -> dict[str, tuple[Path, str]]:
+    """Find every evictable entry on disk, keyed like the index."""
+    cache_dir = get_cache_dir()
+    found: dict[str, tuple[Path, str]] = {}
+    for path in (cache_dir / ARCHIVE_CACHE_SUBDIR).rglob("*.tar.gz"):
+        if not path.name.startswith("."):
+            found[_key(path)] = (path, "archive")
+    for path in (cache_dir / CLAWDHUB_CACHE_SUBDIR).glob("*/*.pkg"):
+        found[_key(path)] = (path, "clawdhub")
+    git_dir = cache_dir / GIT_CACHE_SUBDIR
+    if git_dir.is_dir():
+        for path in git_dir.glob("*/*/*.git"):
+            if path.is_dir():
+                found[_key(path)] = (path, "git")
+    return found
+
+
+def _sync_entries(conn: sqlite3.Connection) -> list[CacheEntry]:
+    """Reconcile the index with the disk and return every entry."""
+    found = _discover()
+    with db.transaction(conn):
+        known = {row["key"] for row in conn.execute("SELECT key FROM entries")}
+        conn.executemany(
+            "DELETE FROM entries WHERE key = ?", [(key,) for key in known - found.keys()]
+        )
+        for key in found.keys() - known:
+            # Written before the index existed (or by an older version).
+            path, kind = found[key]
+            conn.execute(
+                "INSERT INTO entries (key, kind, size, last_used, uses) VALUES (?, ?, ?, ?, 0)",
+                (key, kind, _entry_size(path, kind), path.stat().st_mtime),
+            )
+    return [
+        CacheEntry(row["key"], row["kind"], row["size"], row["last_used"], row["uses"])
+        for row in conn.execute("SELECT * FROM entries")
+    ]
+
+
+def cache_stats(top: int = 10) -> CacheStats:
+    """Return request counts, bytes saved, total size and the largest entries."""
+    stats = CacheStats()
+    with _connect() as conn:
+        entries = _sync_entries(conn)
+        rows = conn.execute(
+            "SELECT result, SUM(count), SUM(bytes_saved) FROM requests GROUP BY result"
+        ).fetchall()
+    counts = {result: count for result, count, _ in rows}
+    stats.hits = counts.get("hit", 0)
+    stats.misses = counts.get("miss", 0)
+    stats.revalidated = counts.get("revalidated", 0)
+    stats.bytes_saved = sum(saved for _, _, saved in rows)
+    stats.entries = len(entries)
+    stats.total_size = sum(entry.size for entry in entries)
+    stats.largest = sorted(entries, key=lambda entry: entry.size, reverse=True)[:top]
+    return stats
+
+
+def gc(
+    max_size: int | None = None,
+    policy: str | None = None,
+    grace: float = GC_GRACE_SECONDS,
+) -> list[CacheEntry]:
+    """
+    Evict entries until the cache fits in max_size.
+
+    Entries are evicted least recently used first (lru) or least often
+    used first (lfu). Each one is removed under the lock fetches take to
+    write it, and entries used within `grace` seconds are kept because a
+    running install may still be reading them.
+
+    Args:
+        max_size: Size cap in bytes (default: AGENT_SKILLS_UPD_CACHE_MAX_SIZE)
+        policy: "lru" or "lfu" (default: AGENT_SKILLS_UPD_CACHE_POLICY)
+        grace: Seconds during which a used entry can't be evicted
+
+    Returns:
+        The evicted entries
+
+    Raises:
+        SkillUpdError: If no size cap is given or configured
+    """
+    if max_size is None:
+        max_size = max_cache_size()
+    if max_size is None:
+        raise SkillUpdError(f"No cache size cap. Pass one or set {MAX_SIZE_ENV} (e.g. 2G).")
+    policy = policy or eviction_policy()
+    if policy not in POLICIES:
+        raise SkillUpdError(f"Unknown eviction policy '{policy}'. Use lru or lfu.")
+
+    cache_dir = get_cache_dir()
+    evicted: list[CacheEntry] = []
+    with _connect() as conn:
+        entries = _sync_entries(conn)
+        total = sum(entry.size for entry in entries)
+        if policy == "lru":
+            entries.sort(key=lambda entry: entry.last_used)
+        else:
+            entries.sort(key=lambda entry: (entry.uses, entry.last_used))
+
+        cutoff = time.time() - grace
+        for entry in entries:
+            if total <= max_size:
+                break
+            if entry.last_used > cutoff:
+                continue
+            path = cache_dir / entry.key
+            with locks.file_lock(_entry_lock(path)):
+                current = conn.execute(
+                    "SELECT last_used FROM entries WHERE key = ?", (entry.key,)
+                ).fetchone()
+                if current is not None and current["last_used"] > cutoff:
+                    # Used by another process since we looked.
+                    continue
+                for item in _entry_files(path, entry.kind):
+                    if item.is_dir():
+                        shutil.rmtree(item, ignore_errors=True)
+                    else:
+                        item.unlink(missing_ok=True)
+                with db.transaction(conn):
+                    conn.execute("DELETE FROM entries WHERE key = ?", (entry.key,))
+            total -= entry.size
+            evicted.append(entry)
+    return evicted
@@ -0,0 +1,128 @@
+"""Shared `bundle` subcommand for skill-upd, command-upd, and agent-upd."""
+
+from pathlib import Path
+from typing import TYPE_CHECKING, Annotated
+
+import typer
+
+from agent_skills_upd.cli.common import (
+    observe_run,
+    parse_clawdhub_skill_ref,
+    parse_local_ref,
+    parse_resource_ref,
+)
+from agent_skills_upd.exceptions import SkillUpdError
+from agent_skills_upd.fetcher import ResourceType
+
+if TYPE_CHECKING:
+    from agent_skills_upd.bundle import BundleItem
+
+KIND_PREFIXES = {f"{kind.value}:": kind for kind in ResourceType}
+
+
+def parse_bundle_ref(
+    ref: str, default_type: ResourceType, repo: str, backend: str
+) -> "BundleItem":
+    """
+    Turn a resource ref into a BundleItem.
+
+    Refs are the same as for `add`, optionally prefixed with `skill:`,
+    `command:` or `agent:` to bundle another kind of resource.
+
+    Raises:
+        typer.BadParameter: If the ref is invalid
+    """
+    from agent_skills_upd.bundle import BundleItem
+    from agent_skills_upd.providers import get_local_provider, get_repo_provider
+
+    resource_type = default_type
+    for prefix, kind in KIND_PREFIXES.items():
+        if ref.startswith(prefix):
+            resource_type, ref = kind, ref[len(prefix) :]
+            break
+
+    local_ref = parse_local_ref(ref)
+    if local_ref:
+        source, name = local_ref
+        if name is None and resource_type != ResourceType.SKILL:
+            raise typer.BadParameter(
+                f"Invalid format: '{ref}'. Expected: <path>#<{resource_type.value}-name>"
+            )
+        return BundleItem(resource_type, name, get_local_provider(source), ref)
+
+    if resource_type == ResourceType.SKILL:
+        slug = parse_clawdhub_skill_ref(ref)
+        if slug:
+            return BundleItem(resource_type, slug, None, ref)
+
+    host, username, name = parse_resource_ref(ref)
+    return BundleItem(
+        resource_type, name, get_repo_provider(host, username, repo, backend), ref
+    )
+
+
+def add_bundle_command(app: typer.Typer, resource_type: ResourceType) -> None:
+    """Register `bundle` on a resource CLI; refs default to that resource type."""
+    kind = resource_type.value
+
+    @app.command(name="bundle")
+    def bundle_command(
+        output: Annotated[
+            Path,
+            typer.Argument(help="Bundle file to write (e.g. resources.zip).", metavar="OUTPUT"),
+        ],
+        refs: Annotated[
+            list[str],
+            typer.Argument(
+                help=(
+                    "Resources to include, as for add; prefix with "
+                    "skill:, command: or agent: for other kinds."
+                ),
+                metavar="REF...",
+            ),
+        ],
+        repo: Annotated[
+            str,
+            typer.Option(
+                "--repo",
+                help="Repository name to fetch from (default: agent-resources).",
+            ),
+        ] = "agent-resources",
+        backend: Annotated[
+            str,
+            typer.Option(
+                "--backend",
+                help="Fetch backend: archive (download tarball) or git (sparse partial clone).",
+            ),
+        ] = "archive",
+        timings: Annotated[
+            bool,
+            typer.Option(
+                "--timings",
+                help="Print a per-phase timing breakdown to stderr.",
+            ),
+        ] = False,
+    ) -> None:
+        from agent_skills_upd.bundle import create_bundle
+
+        try:
+            items = [parse_bundle_ref(ref, resource_type, repo, backend) for ref in refs]
+            with observe_run(timings):
+                entries = create_bundle(output, items)
+        except (typer.BadParameter, SkillUpdError) as e:
+            typer.echo(f"Error: {e}", err=True)
+            raise typer.Exit(1)
+
+        for entry in entries:
+            typer.echo(f"   {entry['type']:<8} {entry['name']}  ({entry['source']})")
+        typer.echo(f"📦 Bundled {len(entries)} resource(s) into {output}")
+
+    bundle_command.__doc__ = f"""
+    Pack resources from any sources into one file for offline installs.
+
+    Install from it later with `add --from-bundle`, without network access.
+
+    Example:
+        {kind}-upd bundle resources.zip user/one user/two command:user/review
+        {kind}-upd add one --from-bundle resources.zip
+    """
@@ -0,0 +1,109 @@
+"""Shared `cache stats` and `cache gc` subcommands for skill-upd, command-upd, and agent-upd."""
+
+import time
+from typing import Annotated
+
+import typer
+
+from agent_skills_upd.exceptions import SkillUpdError
+
+
+def _age(timestamp: float) -> str:
+    seconds = max(time.time() - timestamp, 0)
+    for unit, length in (("d", 86400), ("h", 3600), ("m", 60)):
+        if seconds >= length:
+            return f"{seconds // length:.0f}{unit} ago"
+    return "just now"
+
+
+def add_cache_command(app: typer.Typer) -> None:
+    """Register the `cache` command group on a resource CLI."""
+    cache_app = typer.Typer(help="Inspect and prune the download cache.")
+
+    @cache_app.command(name="stats")
+    def stats_command(
+        top: Annotated[
+            int,
+            typer.Option("--top", help="Number of largest entries to show."),
+        ] = 10,
+    ) -> None:
+        """
+        Show hit and miss ratios, bytes saved and the largest cache entries.
+
+        Example:
+            skill-upd cache stats
+        """
+        from agent_skills_upd.cache import get_cache_dir
+        from agent_skills_upd.cache_index import (
+            cache_stats,
+            eviction_policy,
+            format_size,
+            max_cache_size,
+        )
+
+        try:
+            stats = cache_stats(top)
+            cap = max_cache_size()
+        except SkillUpdError as e:
+            typer.echo(f"Error: {e}", err=True)
+            raise typer.Exit(1)
+
+        cap_text = f"cap {format_size(cap)}, {eviction_policy()}" if cap else "no size cap"
+        typer.echo(
+            f"Cache: {get_cache_dir()} ({stats.entries} entries, "
+            f"{format_size(stats.total_size)}; {cap_text})"
+        )
+        typer.echo(
+            f"Requests: {stats.hits} hits, {stats.revalidated} revalidated, "
+            f"{stats.misses} misses (hit ratio {stats.hit_ratio:.0%}, "
+            f"miss ratio {stats.miss_ratio:.0%})"
+        )
+        typer.echo(f"Bytes saved: {format_size(stats.bytes_saved)}")
+        if stats.largest:
+            typer.echo("Largest entries:")
+        for entry in stats.largest:
+            typer.echo(
+                f"   {format_size(entry.size):>9}  {entry.key}  "
+                f"(used {entry.uses}x, last {_age(entry.last_used)})"
+            )
+
+    @cache_app.command(name="gc")
+    def gc_command(
+        max_size: Annotated[
+            str,
+            typer.Option(
+                "--max-size",
+                help="Size cap such as 500M or 2G (default: $AGENT_SKILLS_UPD_CACHE_MAX_SIZE).",
+            ),
+        ] = "",
+        policy: Annotated[
+            str,
+            typer.Option(
+                "--policy",
+                help="Evict least recently (lru) or least frequently (lfu) used entries first.",
+            ),
+        ] = "",
+    ) -> None:
+        """
+        Evict cached archives, git mirrors and Clawdhub packages until the cache fits its cap.
+
+        Installed resources and the install registry are never touched.
+
+        Example:
+            skill-upd cache gc
+            skill-upd cache gc --max-size 500M --policy lfu
+        """
+        from agent_skills_upd.cache_index import format_size, gc, parse_size
+
+        try:
+            evicted = gc(parse_size(max_size) if max_size else None, policy or None)
+        except SkillUpdError as e:
+            typer.echo(f"Error: {e}", err=True)
+            raise typer.Exit(1)
+
+        for entry in evicted:
+            typer.echo(f"🗑  {entry.key} ({format_size(entry.size)})")
+        freed = sum(entry.size for entry in evicted)
+        typer.echo(f"✅ Evicted {len(evicted)} entries, freed {format_size(freed)}")
+
+    app.add_typer(cache_app, name="cache")
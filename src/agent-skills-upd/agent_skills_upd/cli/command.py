@@ -1,19 +1,31 @@
 """CLI for command-upd command."""
 
+from pathlib import Path
 from typing import Annotated
 
 import typer
 
-from agent_skills_upd.cli.common import fetch_spinner, get_destination, parse_resource_ref, print_success_message
+from agent_skills_upd import negative
+from agent_skills_upd.bundle import fetch_bundle_resource
+from agent_skills_upd.cli.bundle import add_bundle_command
+from agent_skills_upd.cli.cache import add_cache_command
+from agent_skills_upd.cli.common import DefaultCommandGroup, fetch_spinner, get_destinations, parse_local_ref, parse_resource_ref, print_destinations, print_success_message, observe_run
+from agent_skills_upd.cli.lint import add_lint_command
+from agent_skills_upd.cli.prefetch import add_prefetch_command
+from agent_skills_upd.cli.registry import add_registry_commands
+from agent_skills_upd.cli.verify import add_verify_command
+from agent_skills_upd.cli.watch import add_watch_command
+from agent_skills_upd.daemon import run_install
 from agent_skills_upd.exceptions import (
     SkillUpdError,
     RepoNotFoundError,
     ResourceExistsError,
     ResourceNotFoundError,
 )
-from agent_skills_upd.fetcher import ResourceType, fetch_resource
+from agent_skills_upd.fetcher import ResourceType, fetch_local_resource, fetch_resource
 
 app = typer.Typer(
+    cls=DefaultCommandGroup,
     add_completion=False,
     help="Update Claude Code slash commands from GitHub to your project.",
 )
@@ -26,7 +38,7 @@ def add(
         typer.Argument(
             help=(
                 "Command to update in format: <username>/<command-name> or "
-                "<host>/<username>/<command-name>"
+                "<host>/<username>/<command-name> or ./<path>#<command-name>"
             ),
             metavar="USERNAME/COMMAND-NAME",
         ),
@@ -54,19 +66,64 @@ def add(
         ),
     ] = "agent-resources",
     dest: Annotated[
-        str,
+        list[str] | None,
         typer.Option(
             "--dest",
-            help="Custom destination path.",
+            help="Custom destination path (repeat to install to several).",
         ),
-    ] = "",
+    ] = None,
     environment: Annotated[
         str,
         typer.Option(
             "--env",
-            help="Target environment (claude, opencode, codex).",
+            help="Target environment (claude, opencode, codex); comma-separate several or use all.",
+        ),
+    ] = "",
+    backend: Annotated[
+        str,
+        typer.Option(
+            "--backend",
+            help="Fetch backend: archive (download tarball) or git (sparse partial clone).",
+        ),
+    ] = "archive",
+    timings: Annotated[
+        bool,
+        typer.Option(
+            "--timings",
+            help="Print a per-phase timing breakdown to stderr.",
+        ),
+    ] = False,
+    trace_file: Annotated[
+        str,
+        typer.Option(
+            "--trace",
+            help="Append trace spans to FILE (.json: Chrome trace, otherwise JSON lines).",
+            metavar="FILE",
         ),
     ] = "",
+    sha256: Annotated[
+        str,
+        typer.Option(
+            "--sha256",
+            help="Expected SHA-256 of the command; nothing is installed on mismatch.",
+            metavar="DIGEST",
+        ),
+    ] = "",
+    from_bundle: Annotated[
+        str,
+        typer.Option(
+            "--from-bundle",
+            help="Install from a bundle file instead of the network; the ref is the command name.",
+            metavar="BUNDLE",
+        ),
+    ] = "",
+    refresh: Annotated[
+        bool,
+        typer.Option(
+            "--refresh",
+            help="Forget recently cached not-found results and look again.",
+        ),
+    ] = False,
 ) -> None:
     """
     Update a slash command from a GitHub user's agent-resources repository.
@@ -79,31 +136,73 @@ def add(
         command-upd kasperjunge/review-pr --global
     """
     try:
-        host, username, command_name = parse_resource_ref(command_ref)
+        local_ref = None if from_bundle else parse_local_ref(command_ref)
+        if from_bundle:
+            command_name = command_ref
+        elif local_ref:
+            local_source, command_name = local_ref
+            if command_name is None:
+                raise typer.BadParameter(
+                    f"Invalid format: '{command_ref}'. Expected: <path>#<command-name>"
+                )
+        else:
+            host, username, command_name = parse_resource_ref(command_ref)
     except typer.BadParameter as e:
         typer.echo(f"Error: {e}", err=True)
         raise typer.Exit(1)
 
-    dest_path = get_destination(
+    dest_paths = get_destinations(
         "commands",
         global_install,
-        dest if dest else None,
+        dest,
         environment if environment else None,
     )
+    # One destination keeps the single-path API; several fan out from one fetch.
+    dest_path = dest_paths[0] if len(dest_paths) == 1 else dest_paths
     scope = "user" if global_install else "project"
+    if refresh:
+        negative.clear()
 
     try:
-        with fetch_spinner():
-            command_path = fetch_resource(
-                username,
-                command_name,
-                dest_path,
-                ResourceType.COMMAND,
-                overwrite,
-                host=host,
-                repo=repo,
-            )
-        print_success_message("command", host, command_name, username)
+        with observe_run(timings, trace_file), fetch_spinner():
+            if from_bundle:
+                fetch_bundle_resource(
+                    Path(from_bundle).expanduser(),
+                    command_name,
+                    dest_path,
+                    ResourceType.COMMAND,
+                    overwrite,
+                )
+            elif local_ref:
+                run_install(
+                    fetch_local_resource,
+                    local_source,
+                    command_name,
+                    dest_path,
+                    ResourceType.COMMAND,
+                    overwrite,
+                    sha256 or None,
+                )
+            else:
+                command_path = run_install(
+                    fetch_resource,
+                    username,
+                    command_name,
+                    dest_path,
+                    ResourceType.COMMAND,
+                    overwrite,
+                    host=host,
+                    repo=repo,
+                    backend=backend,
+                    expected_sha256=sha256 or None,
+                )
+        if from_bundle:
+            typer.echo(f"✅ Installed command '{command_name}' from bundle {from_bundle}")
+        elif local_ref:
+            typer.echo(f"✅ Installed command '{command_name}' from {local_source}")
+        else:
+            print_success_message("command", host, command_name, username)
+        print_destinations(dest_paths)
     except RepoNotFoundError as e:
         typer.echo(f"Error: {e}", err=True)
         raise typer.Exit(1)
@@ -118,5 +217,14 @@ def add(
         raise typer.Exit(1)
 
 
+add_cache_command(app)
+add_bundle_command(app, ResourceType.COMMAND)
+add_lint_command(app)
+add_prefetch_command(app, ResourceType.COMMAND)
+add_registry_commands(app, ResourceType.COMMAND)
+add_verify_command(app, ResourceType.COMMAND)
+add_watch_command(app, ResourceType.COMMAND)
+
+
 if __name__ == "__main__":
     app()
@@ -1,17 +1,22 @@
 """Shared CLI utilities for skill-upd, command-upd, and agent-upd."""
 
 import random
+import sys
 from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
+from typing import TYPE_CHECKING
 from urllib.parse import urlparse
 
 import typer
-import yaml
-from rich.console import Console
-from rich.live import Live
-from rich.spinner import Spinner
+from typer.core import TyperGroup
 
-console = Console()
+from agent_skills_upd import metrics, tracing
+from agent_skills_upd.config import load_user_config
+from agent_skills_upd.fetcher import CLAWDHUB_HOST
+
+if TYPE_CHECKING:
+    from rich.console import Console
 
 # Default environment configurations
 DEFAULT_ENVIRONMENTS = {
@@ -62,18 +67,64 @@ DEFAULT_ENVIRONMENTS = {
 }
 
 
-def get_environment_config(environment: str | None = None) -> dict:
-    """Simple config loading - no caching, no complexity."""
-    config_path = Path.home() / ".agent-resources-config.yaml"
+DEFAULT_COMMAND = "add"
+
+
+class DefaultCommandGroup(TyperGroup):
+    """Command group that runs `add` when no subcommand is named.
+
+    Keeps `skill-upd user/skill` working alongside `skill-upd watch`.
+    Subcommand names are therefore reserved as the first argument: a
+    resource named like one (e.g. a clawd slug `watch`) is installed with
+    an explicit `add`, which the help epilog spells out.
+    """
+
+    def parse_args(self, ctx, args: list[str]) -> list[str]:
+        if args and args[0] not in self.commands and args[0] not in ctx.help_option_names:
+            args = [DEFAULT_COMMAND, *args]
+        return super().parse_args(ctx, args)
+
+    def format_help(self, ctx, formatter) -> None:
+        # Subcommands are registered after the group is created, so the
+        # epilog naming them is built when help is shown.
+        reserved = sorted(name for name in self.commands if name != DEFAULT_COMMAND)
+        if reserved:
+            self.epilog = (
+                f"Without a subcommand, arguments are passed to `{DEFAULT_COMMAND}`. "
+                f"These names are reserved as the first argument: {', '.join(reserved)}. "
+                f"To install a resource with one of these names, name "
+                f"`{DEFAULT_COMMAND}` explicitly, e.g. `{DEFAULT_COMMAND} {reserved[0]}`."
+            )
+        super().format_help(ctx, formatter)
+
 
-    # Load user config if exists
-    user_config: dict = {}
-    if config_path.exists():
-        with config_path.open("r") as file_handle:
-            user_config = yaml.safe_load(file_handle) or {}
+@lru_cache(maxsize=1)
+def get_console() -> "Console":
+    """Create the rich console on first use so plain runs never import rich."""
+    from rich.console import Console
+
+    return Console()
+
+
+def is_interactive() -> bool:
+    """Return True when stdout is a terminal that can render rich output."""
+    try:
+        return sys.stdout.isatty()
+    except (AttributeError, ValueError):
+        return False
+
+
+def get_environments() -> dict:
+    """Return all environments: defaults merged with the user config."""
+    user_config = load_user_config()
 
     # Merge with defaults - simple and straightforward
-    environments = {**DEFAULT_ENVIRONMENTS, **user_config.get("environments", {})}
+    return {**DEFAULT_ENVIRONMENTS, **user_config.get("environments", {})}
+
+
+def get_environment_config(environment: str | None = None) -> dict:
+    """Resolve an environment from defaults merged with the user config."""
+    environments = get_environments()
 
     # Default to claude if no environment specified
     env_name = environment or "claude"
@@ -135,6 +186,59 @@ def parse_resource_ref(ref: str) -> tuple[str, str, str]:
     return host, username, name
 
 
+LOCAL_REF_PREFIXES = ("./", "../", "/", "~", "file://")
+
+
+def parse_local_ref(ref: str) -> tuple[Path, str | None] | None:
+    """
+    Parse a local source reference such as './repo#name' or 'file:///tmp/res.zip'.
+
+    The path is a working tree or a .tar.gz/.zip archive laid out like an
+    agent-resources repo; the optional '#name' fragment selects the resource.
+
+    Returns:
+        Tuple of (source path, resource name or None), or None if ref isn't local
+
+    Raises:
+        typer.BadParameter: If the fragment is empty
+    """
+    ref = ref.strip()
+    if ref != "." and not ref.startswith(LOCAL_REF_PREFIXES):
+        return None
+
+    path, sep, name = ref.partition("#")
+    if sep and not name:
+        raise typer.BadParameter(
+            f"Invalid format: '{ref}'. Expected: <path>#<name> or <path>"
+        )
+    if path.startswith("file://"):
+        path = urlparse(path).path
+    return Path(path).expanduser(), name or None
+
+
+def parse_clawdhub_skill_ref(ref: str) -> str | None:
+    """Parse clawdhub.com/<skill-name> or https://clawdhub.com/<skill-name>."""
+    ref = ref.strip()
+    if not ref:
+        raise typer.BadParameter("Skill reference cannot be empty.")
+
+    if ref.startswith("http://") or ref.startswith("https://"):
+        parsed = urlparse(ref)
+        if parsed.netloc != CLAWDHUB_HOST:
+            return None
+        slug = parsed.path.strip("/")
+    elif ref.startswith(f"{CLAWDHUB_HOST}/"):
+        slug = ref[len(f"{CLAWDHUB_HOST}/") :].strip("/")
+    else:
+        return None
+
+    if not slug or "/" in slug:
+        raise typer.BadParameter(
+            f"Invalid format: '{ref}'. Expected: {CLAWDHUB_HOST}/<skill-name>"
+        )
+    return slug
+
+
 def get_destination(
     resource_subdir: str,
     global_install: bool,
@@ -172,11 +276,95 @@ def get_destination(
     return base / env_dir
 
 
+def get_destinations(
+    resource_subdir: str,
+    global_install: bool,
+    custom_dests: list[str] | None = None,
+    environment: str | None = None,
+) -> list[Path]:
+    """
+    Get every destination directory for a resource.
+
+    Args:
+        resource_subdir: The subdirectory name (e.g., "skills", "commands", "agents")
+        global_install: If True, install to home directory, else to current directory
+        custom_dests: Optional custom destination paths (repeated --dest)
+        environment: Optional environment name, a comma-separated list of
+            names, or "all" for every environment that supports the resource
+
+    Returns:
+        Destination directories, without duplicates
+    """
+    if custom_dests:
+        paths = [get_destination(resource_subdir, global_install, dest) for dest in custom_dests]
+    elif environment == "all":
+        key = f"{resource_subdir.rstrip('s')}_dir"
+        paths = [
+            get_destination(resource_subdir, global_install, None, name)
+            for name, env_config in get_environments().items()
+            if key in env_config
+        ]
+    else:
+        names = [name.strip() for name in (environment or "").split(",") if name.strip()]
+        paths = [
+            get_destination(resource_subdir, global_install, None, name)
+            for name in names or [None]
+        ]
+
+    unique: list[Path] = []
+    for path in paths:
+        if path not in unique:
+            unique.append(path)
+    return unique
+
+
+def print_destinations(paths: list[Path]) -> None:
+    """List install locations after a multi-destination install."""
+    if len(paths) < 2:
+        return
+    typer.echo(f"📂 Installed to {len(paths)} locations:")
+    for path in paths:
+        typer.echo(f"   {path}")
+
+
 @contextmanager
 def fetch_spinner():
-    """Show spinner during fetch operation."""
-    with Live(Spinner("dots", text="Fetching..."), console=console, transient=True):
+    """Show spinner during fetch operation (skipped when not on a terminal)."""
+    if not is_interactive():
         yield
+        return
+
+    from rich.live import Live
+    from rich.spinner import Spinner
+
+    with Live(Spinner("dots", text="Fetching..."), console=get_console(), transient=True):
+        yield
+
+
+@contextmanager
+def observe_run(timings: bool = False, trace_file: str | None = None):
+    """
+    Wrap an install with observability output.
+
+    Collects tracing spans when --timings or --trace is given and exports
+    metrics when AGENT_SKILLS_UPD_METRICS_FILE is set.
+    """
+    try:
+        if not timings and not trace_file:
+            yield
+            return
+
+        with tracing.tracing() as tracer:
+            try:
+                with tracing.span("total"):
+                    yield
+            finally:
+                if timings:
+                    typer.echo(tracing.format_timings(tracer), err=True)
+                if trace_file:
+                    tracing.write_trace(tracer, Path(trace_file).expanduser())
+    finally:
+        metrics.flush()
 
 
 def print_success_message(
@@ -187,7 +375,7 @@ def print_success_message(
     share_name: str | None = None,
 ) -> None:
     """Print branded success message with rotating CTA."""
-    console.print(f"✅ Installed {resource_type} '{name}' via 🧩 agent-skills-upd", style="dim")
+    message = f"✅ Installed {resource_type} '{name}' via 🧩 agent-skills-upd"
 
     username_visible = username + "/"
     host_visible = host + "/"
@@ -204,4 +392,12 @@ def print_success_message(
         "🦞 More skills on ClawdHub: https://clawdhub.com",
         f"📢 Share: uvx upd-{resource_type} {host_visible}{username_visible}{share_ref}",
     ]
-    console.print(random.choice(ctas), style="dim")
+    cta = random.choice(ctas)
+    if not is_interactive():
+        typer.echo(message)
+        typer.echo(cta)
+        return
+
+    console = get_console()
+    console.print(message, style="dim")
+    console.print(cta, style="dim")
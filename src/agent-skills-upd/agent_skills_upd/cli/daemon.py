@@ -0,0 +1,67 @@
+"""CLI for agent-skills-upd-daemon command."""
+
+from pathlib import Path
+from typing import Annotated
+
+import typer
+
+from agent_skills_upd.daemon import daemon_available, get_socket_path, serve, stop
+from agent_skills_upd.exceptions import SkillUpdError
+
+app = typer.Typer(
+    add_completion=False,
+    help="Run a local daemon that keeps skill-upd/command-upd/agent-upd warm.",
+)
+
+SocketOption = Annotated[
+    Path | None,
+    typer.Option(
+        "--socket",
+        help="Unix socket path (default: $AGENT_SKILLS_UPD_SOCKET or the cache dir).",
+    ),
+]
+
+
+@app.command()
+def start(socket: SocketOption = None) -> None:
+    """
+    Start the daemon in the foreground.
+
+    While it runs, skill-upd, command-upd and agent-upd send installs to it
+    instead of fetching in-process.
+
+    Example:
+        agent-skills-upd-daemon start &
+    """
+    socket_path = socket or get_socket_path()
+    try:
+        serve(socket_path, ready=lambda: typer.echo(f"Listening on {socket_path}"))
+    except SkillUpdError as e:
+        typer.echo(f"Error: {e}", err=True)
+        raise typer.Exit(1)
+    except KeyboardInterrupt:
+        pass
+
+
+@app.command(name="stop")
+def stop_command(socket: SocketOption = None) -> None:
+    """Stop a running daemon."""
+    socket_path = socket or get_socket_path()
+    if not stop(socket_path):
+        typer.echo(f"No daemon running on {socket_path}", err=True)
+        raise typer.Exit(1)
+    typer.echo("Daemon stopped")
+
+
+@app.command()
+def status(socket: SocketOption = None) -> None:
+    """Report whether a daemon is running."""
+    socket_path = socket or get_socket_path()
+    if not daemon_available(socket_path):
+        typer.echo(f"No daemon running on {socket_path}")
+        raise typer.Exit(1)
+    typer.echo(f"Daemon running on {socket_path}")
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,42 @@
+"""Shared `lint` subcommand for skill-upd, command-upd, and agent-upd."""
+
+from pathlib import Path
+from typing import Annotated
+
+import typer
+
+
+def add_lint_command(app: typer.Typer) -> None:
+    """Register `lint` on a resource CLI."""
+
+    @app.command(name="lint")
+    def lint_command(
+        path: Annotated[
+            Path,
+            typer.Argument(help="Repository or install directory (default: current directory)."),
+        ] = Path("."),
+    ) -> None:
+        """
+        Validate every skill, command and agent under a directory.
+
+        Checks frontmatter YAML, missing names, names that don't match the
+        file or directory, and duplicate names.
+
+        Example:
+            skill-upd lint
+            skill-upd lint ~/src/agent-resources
+        """
+        from agent_skills_upd.lint import lint_tree
+
+        if not path.is_dir():
+            typer.echo(f"Error: Not a directory: {path}", err=True)
+            raise typer.Exit(1)
+
+        resources, issues = lint_tree(path)
+        for issue in issues:
+            typer.echo(f"{issue.path}: {issue.message}", err=True)
+        if issues:
+            broken = len({issue.path for issue in issues})
+            typer.echo(f"❌ {len(issues)} problem(s) in {broken} of {len(resources)} resource(s)")
+            raise typer.Exit(1)
+        typer.echo(f"✅ {len(resources)} resource(s) OK")
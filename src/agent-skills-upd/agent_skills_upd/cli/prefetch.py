@@ -0,0 +1,99 @@
+"""Shared `prefetch` subcommand for skill-upd, command-upd, and agent-upd."""
+
+from pathlib import Path
+from typing import Annotated
+
+import typer
+
+from agent_skills_upd.cli.bundle import parse_bundle_ref
+from agent_skills_upd.cli.common import observe_run
+from agent_skills_upd.exceptions import SkillUpdError
+from agent_skills_upd.fetcher import ResourceType
+
+
+def add_prefetch_command(app: typer.Typer, resource_type: ResourceType) -> None:
+    """Register `prefetch` on a resource CLI; refs default to that resource type."""
+    kind = resource_type.value
+
+    @app.command(name="prefetch")
+    def prefetch_command(
+        refs: Annotated[
+            list[str] | None,
+            typer.Argument(
+                help=(
+                    "Resources to prefetch, as for add; prefix with "
+                    "skill:, command: or agent: for other kinds."
+                ),
+                metavar="[REF...]",
+            ),
+        ] = None,
+        manifest: Annotated[
+            Path | None,
+            typer.Option(
+                "--manifest",
+                "-f",
+                help="File listing refs, one per line (# starts a comment line).",
+            ),
+        ] = None,
+        repo: Annotated[
+            str,
+            typer.Option(
+                "--repo",
+                help="Repository name to fetch from (default: agent-resources).",
+            ),
+        ] = "agent-resources",
+        backend: Annotated[
+            str,
+            typer.Option(
+                "--backend",
+                help="Fetch backend: archive (download tarball) or git (sparse partial clone).",
+            ),
+        ] = "archive",
+        jobs: Annotated[
+            int,
+            typer.Option("--jobs", "-j", help="Number of refs fetched concurrently."),
+        ] = 8,
+        timings: Annotated[
+            bool,
+            typer.Option(
+                "--timings",
+                help="Print a per-phase timing breakdown to stderr.",
+            ),
+        ] = False,
+    ) -> None:
+        from agent_skills_upd.prefetch import prefetch, read_ref_list
+
+        try:
+            all_refs = list(refs or [])
+            if manifest is not None:
+                all_refs += read_ref_list(manifest)
+            if not all_refs:
+                raise typer.BadParameter("Give refs to prefetch or a --manifest.")
+            items = [parse_bundle_ref(ref, resource_type, repo, backend) for ref in all_refs]
+            with observe_run(timings):
+                results = prefetch(items, max(jobs, 1))
+        except (typer.BadParameter, SkillUpdError) as e:
+            typer.echo(f"Error: {e}", err=True)
+            raise typer.Exit(1)
+
+        failed = [result for result in results if result.error]
+        for result in results:
+            if result.error:
+                typer.echo(f"❌ {result.item.ref}: {result.error}", err=True)
+            else:
+                kind_label = result.item.resource_type.value
+                typer.echo(f"   {kind_label:<8} {result.name}  ({result.item.ref})")
+        typer.echo(f"📥 Prefetched {len(results) - len(failed)} of {len(results)} ref(s)")
+        if failed:
+            raise typer.Exit(1)
+
+    prefetch_command.__doc__ = f"""
+    Download everything the given refs need into the cache, without installing.
+
+    Later installs of these refs are served from the cache (e.g. in a
+    later Docker layer). Exits non-zero if any ref can't be resolved.
+
+    Example:
+        {kind}-upd prefetch user/one user/two command:user/review
+        {kind}-upd prefetch --manifest resources.txt
+    """
@@ -0,0 +1,125 @@
+"""Shared `list`, `which` and `remove` subcommands for skill-upd, command-upd, and agent-upd.
+
+All three answer from the install registry (see `installs`) rather than
+walking environment directories.
+"""
+
+from typing import Annotated
+
+import typer
+
+from agent_skills_upd.cli.common import get_destinations
+from agent_skills_upd.exceptions import SkillUpdError
+from agent_skills_upd.fetcher import ResourceType
+
+
+def _format_record(record, show_type: bool) -> str:
+    version = f" {record.version}" if record.version else ""
+    kind = f"{record.resource_type:<8} " if show_type else ""
+    return f"{kind}{record.name}{version}  {record.ref}  {record.path}"
+
+
+def add_registry_commands(app: typer.Typer, resource_type: ResourceType) -> None:
+    """Register `list`, `which` and `remove` on a resource CLI."""
+    kind = resource_type.value
+
+    @app.command(name="list")
+    def list_command(
+        all_types: Annotated[
+            bool,
+            typer.Option(
+                "--all",
+                help="List skills, commands and agents, not only this kind.",
+            ),
+        ] = False,
+    ) -> None:
+        from agent_skills_upd.installs import load_records
+
+        records = load_records(None if all_types else kind, with_files=False)
+        for record in records:
+            typer.echo(_format_record(record, all_types))
+        if not records:
+            typer.echo(f"No {'resources' if all_types else kind + 's'} installed.")
+
+    list_command.__doc__ = f"""
+    List installed {kind}s with their version, source and location.
+
+    Example:
+        {kind}-upd list
+        {kind}-upd list --all
+    """
+
+    @app.command(name="which")
+    def which_command(
+        name: Annotated[
+            str,
+            typer.Argument(help=f"Name of the installed {kind}."),
+        ],
+    ) -> None:
+        from agent_skills_upd.installs import load_records
+
+        records = load_records(kind, name, with_files=False)
+        if not records:
+            typer.echo(f"Error: {kind.capitalize()} '{name}' is not installed.", err=True)
+            raise typer.Exit(1)
+        for record in records:
+            typer.echo(_format_record(record, False))
+
+    which_command.__doc__ = f"""
+    Show where a {kind} is installed and which source it came from.
+
+    Example:
+        {kind}-upd which <name>
+    """
+
+    @app.command(name="remove")
+    def remove_command(
+        name: Annotated[
+            str,
+            typer.Argument(help=f"Name of the {kind} to remove."),
+        ],
+        global_install: Annotated[
+            bool,
+            typer.Option(
+                "--global",
+                "-g",
+                help="Remove from ~/.claude/ instead of ./.claude/.",
+            ),
+        ] = False,
+        dest: Annotated[
+            list[str] | None,
+            typer.Option(
+                "--dest",
+                help="Custom destination path (repeat to remove from several).",
+            ),
+        ] = None,
+        environment: Annotated[
+            str,
+            typer.Option(
+                "--env",
+                help="Target environment; comma-separate several or use all.",
+            ),
+        ] = "",
+    ) -> None:
+        from agent_skills_upd.fetcher import remove_resource
+
+        dest_paths = get_destinations(
+            f"{kind}s", global_install, dest, environment if environment else None
+        )
+        try:
+            removed = remove_resource(name, dest_paths, resource_type)
+        except SkillUpdError as e:
+            typer.echo(f"Error: {e}", err=True)
+            raise typer.Exit(1)
+        for path in removed:
+            typer.echo(f"🗑  Removed {kind} '{name}' from {path}")
+
+    remove_command.__doc__ = f"""
+    Remove an installed {kind} and its registry record.
+
+    Takes the same destination options as add.
+
+    Example:
+        {kind}-upd remove <name>
+        {kind}-upd remove <name> --global
+    """
@@ -1,16 +1,31 @@
 """CLI for skill-upd command."""
 
+from pathlib import Path
 from typing import Annotated
-from urllib.parse import urlparse
 
 import typer
 
+from agent_skills_upd import negative
+from agent_skills_upd.bundle import fetch_bundle_resource
+from agent_skills_upd.cli.bundle import add_bundle_command
+from agent_skills_upd.cli.cache import add_cache_command
 from agent_skills_upd.cli.common import (
+    DefaultCommandGroup,
     fetch_spinner,
-    get_destination,
+    get_destinations,
+    parse_local_ref,
     parse_resource_ref,
+    print_destinations,
     print_success_message,
+    observe_run,
+    parse_clawdhub_skill_ref,
 )
+from agent_skills_upd.cli.lint import add_lint_command
+from agent_skills_upd.cli.prefetch import add_prefetch_command
+from agent_skills_upd.cli.registry import add_registry_commands
+from agent_skills_upd.cli.verify import add_verify_command
+from agent_skills_upd.cli.watch import add_watch_command
+from agent_skills_upd.daemon import run_install
 from agent_skills_upd.exceptions import (
     SkillUpdError,
     RepoNotFoundError,
@@ -21,38 +36,18 @@ from agent_skills_upd.fetcher import (
     CLAWDHUB_HOST,
     ResourceType,
     fetch_clawdhub_skill,
+    fetch_local_resource,
     fetch_resource,
 )
+from agent_skills_upd.filters import parse_file_filter
 
 app = typer.Typer(
+    cls=DefaultCommandGroup,
     add_completion=False,
     help="Update Claude Code skills from GitHub to your project.",
 )
 
 
-def parse_clawdhub_skill_ref(ref: str) -> str | None:
-    """Parse clawdhub.com/<skill-name> or https://clawdhub.com/<skill-name>."""
-    ref = ref.strip()
-    if not ref:
-        raise typer.BadParameter("Skill reference cannot be empty.")
-
-    if ref.startswith("http://") or ref.startswith("https://"):
-        parsed = urlparse(ref)
-        if parsed.netloc != CLAWDHUB_HOST:
-            return None
-        slug = parsed.path.strip("/")
-    elif ref.startswith(f"{CLAWDHUB_HOST}/"):
-        slug = ref[len(f"{CLAWDHUB_HOST}/") :].strip("/")
-    else:
-        return None
-
-    if not slug or "/" in slug:
-        raise typer.BadParameter(
-            f"Invalid format: '{ref}'. Expected: {CLAWDHUB_HOST}/<skill-name>"
-        )
-    return slug
-
-
 def parse_overwrite_flag(value: str) -> bool:
     """Parse overwrite flag values like true/false."""
     normalized = value.strip().lower()
@@ -72,7 +67,8 @@ def add(
         typer.Argument(
             help=(
                 "Skill to update in format: <username>/<skill-name> or "
-                "<host>/<username>/<skill-name> or clawdhub.com/<skill-name>"
+                "<host>/<username>/<skill-name> or clawdhub.com/<skill-name> "
+                "or a local path/archive like ./repo#<skill-name>"
             ),
             metavar="USERNAME/SKILL-NAME",
         ),
@@ -101,17 +97,86 @@ def add(
         ),
     ] = "agent-resources",
     dest: Annotated[
-        str,
+        list[str] | None,
         typer.Option(
             "--dest",
-            help="Custom destination path.",
+            help="Custom destination path (repeat to install to several).",
         ),
-    ] = "",
+    ] = None,
     environment: Annotated[
         str,
         typer.Option(
             "--env",
-            help="Target environment (claude, opencode, codex, amp, clawdbot).",
+            help="Target environment (claude, opencode, codex, amp, clawdbot); comma-separate several or use all.",
+        ),
+    ] = "",
+    backend: Annotated[
+        str,
+        typer.Option(
+            "--backend",
+            help="Fetch backend: archive (download tarball) or git (sparse partial clone).",
+        ),
+    ] = "archive",
+    timings: Annotated[
+        bool,
+        typer.Option(
+            "--timings",
+            help="Print a per-phase timing breakdown to stderr.",
+        ),
+    ] = False,
+    trace_file: Annotated[
+        str,
+        typer.Option(
+            "--trace",
+            help="Append trace spans to FILE (.json: Chrome trace, otherwise JSON lines).",
+            metavar="FILE",
+        ),
+    ] = "",
+    sha256: Annotated[
+        str,
+        typer.Option(
+            "--sha256",
+            help="Expected SHA-256 of the skill; nothing is installed on mismatch.",
+            metavar="DIGEST",
+        ),
+    ] = "",
+    from_bundle: Annotated[
+        str,
+        typer.Option(
+            "--from-bundle",
+            help="Install from a bundle file instead of the network; the ref is the skill name.",
+            metavar="BUNDLE",
+        ),
+    ] = "",
+    refresh: Annotated[
+        bool,
+        typer.Option(
+            "--refresh",
+            help="Forget recently cached not-found results and look again.",
+        ),
+    ] = False,
+    include: Annotated[
+        list[str] | None,
+        typer.Option(
+            "--include",
+            help="Only install skill files matching this glob (repeatable).",
+            metavar="GLOB",
+        ),
+    ] = None,
+    exclude: Annotated[
+        list[str] | None,
+        typer.Option(
+            "--exclude",
+            help="Skip skill files or directories matching this glob (repeatable).",
+            metavar="GLOB",
+        ),
+    ] = None,
+    max_file_size: Annotated[
+        str,
+        typer.Option(
+            "--max-file-size",
+            help="Skip skill files larger than SIZE (e.g. 500K, 2M).",
+            metavar="SIZE",
         ),
     ] = "",
 ) -> None:
@@ -124,12 +189,29 @@ def add(
     Example:
         skill-upd kasperjunge/analyze-paper
         skill-upd kasperjunge/analyze-paper --global
+        skill-upd ./my-resources#analyze-paper
+        skill-upd kasperjunge/analyze-paper --exclude examples --max-file-size 1M
     """
     try:
         overwrite_value = parse_overwrite_flag(overwrite)
+        try:
+            file_filter = parse_file_filter(include, exclude, max_file_size)
+        except SkillUpdError as e:
+            raise typer.BadParameter(str(e)) from e
+        # Configured filters apply either way; pass only what was given here.
+        filter_kwargs = {"file_filter": file_filter} if file_filter else {}
         clawd_envs = {"clawd", "clawdbot", "clawdis"}
-        clawdhub_slug = parse_clawdhub_skill_ref(skill_ref)
-        if clawdhub_slug:
+        local_ref = None if from_bundle else parse_local_ref(skill_ref)
+        clawdhub_slug = (
+            None if local_ref or from_bundle else parse_clawdhub_skill_ref(skill_ref)
+        )
+        if from_bundle:
+            skill_name = skill_ref
+            use_clawdhub = False
+        elif local_ref:
+            local_source, skill_name = local_ref
+            use_clawdhub = False
+        elif clawdhub_slug:
             host = CLAWDHUB_HOST
             username = ""
             skill_name = clawdhub_slug
@@ -147,24 +229,51 @@ def add(
         typer.echo(f"Error: {e}", err=True)
         raise typer.Exit(1)
 
-    dest_path = get_destination(
+    dest_paths = get_destinations(
         "skills",
         global_install,
-        dest if dest else None,
+        dest,
         environment if environment else None,
     )
+    # One destination keeps the single-path API; several fan out from one fetch.
+    dest_path = dest_paths[0] if len(dest_paths) == 1 else dest_paths
     scope = "user" if global_install else "project"
+    if refresh:
+        negative.clear()
 
     try:
-        with fetch_spinner():
+        with observe_run(timings, trace_file), fetch_spinner():
             if use_clawdhub:
-                clawdhub_result = fetch_clawdhub_skill(
+                clawdhub_result = run_install(
+                    fetch_clawdhub_skill,
                     skill_name,
                     dest_path,
                     overwrite_value,
+                    sha256 or None,
+                    **filter_kwargs,
+                )
+            elif from_bundle:
+                skill_path = fetch_bundle_resource(
+                    Path(from_bundle).expanduser(),
+                    skill_name,
+                    dest_path,
+                    ResourceType.SKILL,
+                    overwrite_value,
+                )
+            elif local_ref:
+                skill_path = run_install(
+                    fetch_local_resource,
+                    local_source,
+                    skill_name,
+                    dest_path,
+                    ResourceType.SKILL,
+                    overwrite_value,
+                    sha256 or None,
+                    **filter_kwargs,
                 )
             else:
-                skill_path = fetch_resource(
+                skill_path = run_install(
+                    fetch_resource,
                     username,
                     skill_name,
                     dest_path,
@@ -172,7 +281,12 @@ def add(
                     overwrite_value,
                     host=host,
                     repo=repo,
+                    backend=backend,
+                    expected_sha256=sha256 or None,
+                    **filter_kwargs,
                 )
+        if not use_clawdhub and isinstance(skill_path, list):
+            skill_path = skill_path[0]
         if use_clawdhub:
             if clawdhub_result.was_existing:
                 old_version = clawdhub_result.old_version or "unknown"
@@ -181,11 +295,16 @@ def add(
                 )
             else:
                 typer.echo(f"✅ Installed version {clawdhub_result.new_version}")
+        elif from_bundle:
+            typer.echo(f"✅ Installed skill '{skill_path.name}' from bundle {from_bundle}")
+        elif local_ref:
+            typer.echo(f"✅ Installed skill '{skill_path.name}' from {local_source}")
         else:
             skill_name = skill_path.name
             print_success_message(
                 "skill", host, skill_name, username, share_name=repo
             )
+        print_destinations(dest_paths)
     except RepoNotFoundError as e:
         typer.echo(f"Error: {e}", err=True)
         raise typer.Exit(1)
@@ -200,5 +319,14 @@ def add(
         raise typer.Exit(1)
 
 
+add_cache_command(app)
+add_bundle_command(app, ResourceType.SKILL)
+add_lint_command(app)
+add_prefetch_command(app, ResourceType.SKILL)
+add_registry_commands(app, ResourceType.SKILL)
+add_verify_command(app, ResourceType.SKILL)
+add_watch_command(app, ResourceType.SKILL)
+
+
 if __name__ == "__main__":
     app()
@@ -0,0 +1,51 @@
+"""Shared `verify` subcommand for skill-upd, command-upd, and agent-upd."""
+
+from pathlib import Path
+from typing import Annotated
+
+import typer
+
+from agent_skills_upd.fetcher import ResourceType
+
+
+def add_verify_command(app: typer.Typer, resource_type: ResourceType) -> None:
+    """Register `verify` on a resource CLI, checking that resource type."""
+    kind = resource_type.value
+
+    @app.command(name="verify")
+    def verify_command(
+        all_types: Annotated[
+            bool,
+            typer.Option(
+                "--all",
+                help="Verify skills, commands and agents, not only this kind.",
+            ),
+        ] = False,
+    ) -> None:
+        from agent_skills_upd.installs import load_records
+        from agent_skills_upd.integrity import verify_install
+
+        records = [
+            record
+            for record in sorted(load_records(), key=lambda item: item.path)
+            if record.files and (all_types or record.resource_type == kind)
+        ]
+        failed = 0
+        for record in records:
+            problems = verify_install(Path(record.path), record.files)
+            if problems:
+                failed += 1
+                typer.echo(f"❌ {record.path}", err=True)
+                for problem in problems:
+                    typer.echo(f"   {problem}", err=True)
+        typer.echo(f"✅ Verified {len(records) - failed} of {len(records)} installed resource(s)")
+        if failed:
+            raise typer.Exit(1)
+
+    verify_command.__doc__ = f"""
+    Check installed {kind}s against the SHA-256 digests recorded at install.
+
+    Example:
+        {kind}-upd verify
+        {kind}-upd verify --all
+    """
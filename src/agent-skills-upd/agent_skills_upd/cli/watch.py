@@ -0,0 +1,83 @@
+"""Shared `watch` subcommand for skill-upd, command-upd, and agent-upd."""
+
+from typing import Annotated
+
+import typer
+
+from agent_skills_upd.fetcher import ResourceType
+
+
+def add_watch_command(app: typer.Typer, resource_type: ResourceType) -> None:
+    """Register `watch` on a resource CLI, watching that resource type."""
+    kind = resource_type.value
+
+    @app.command(name="watch")
+    def watch_command(
+        all_types: Annotated[
+            bool,
+            typer.Option(
+                "--all",
+                help="Watch skills, commands and agents, not only this kind.",
+            ),
+        ] = False,
+        once: Annotated[
+            bool,
+            typer.Option(
+                "--once",
+                help="Check every installed resource once and exit.",
+            ),
+        ] = False,
+        interval: Annotated[
+            float,
+            typer.Option(
+                "--interval",
+                help="Shortest polling interval in seconds.",
+            ),
+        ] = 300.0,
+        max_interval: Annotated[
+            float,
+            typer.Option(
+                "--max-interval",
+                help="Longest polling interval for sources that don't change.",
+            ),
+        ] = 6 * 3600.0,
+    ) -> None:
+        from agent_skills_upd.watch import check_once, watch
+
+        resource_filter = None if all_types else resource_type
+
+        def report(event) -> None:
+            record = event.record
+            if event.status == "updated":
+                typer.echo(f"🔄 Updated {record.resource_type} '{record.name}' at {record.path}")
+            elif event.status == "removed":
+                typer.echo(f"🗑  No longer watching {record.path} (removed)")
+            elif event.status == "error":
+                typer.echo(f"Error checking {record.path}: {event.message}", err=True)
+
+        if once:
+            events = check_once(resource_filter, True, interval, max_interval)
+            for event in events:
+                report(event)
+            unchanged = sum(event.status == "unchanged" for event in events)
+            typer.echo(f"✅ Checked {len(events)} installed resource(s), {unchanged} unchanged")
+            if any(event.status == "error" for event in events):
+                raise typer.Exit(1)
+            return
+
+        typer.echo("👀 Watching installed resources (Ctrl+C to stop)")
+        try:
+            watch(resource_filter, interval, max_interval, on_event=report)
+        except KeyboardInterrupt:
+            pass
+
+    watch_command.__doc__ = f"""
+    Keep installed {kind}s in sync with their sources.
+
+    Polls each source with cheap conditional checks and reinstalls only
+    what changed. Rarely changing sources are polled less often.
+
+    Example:
+        {kind}-upd watch
+        {kind}-upd watch --once --all
+    """
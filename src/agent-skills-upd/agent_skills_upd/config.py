@@ -0,0 +1,93 @@
+"""User configuration loading with a compiled, mtime-invalidated cache."""
+
+import json
+from pathlib import Path
+
+from agent_skills_upd import metrics
+from agent_skills_upd.cache import get_cache_dir
+
+CONFIG_FILENAME = ".agent-resources-config.yaml"
+COMPILED_CONFIG_FILENAME = "config.json"
+
+# In-process memo: config path -> ((mtime_ns, size), parsed config)
+_config_memo: dict[str, tuple[tuple[int, int], dict]] = {}
+
+
+def get_config_path() -> Path:
+    """Return the path of the user config file."""
+    return Path.home() / CONFIG_FILENAME
+
+
+def _read_compiled(config_path: Path, stamp: tuple[int, int]) -> dict | None:
+    """Return the compiled config if it was built from the same file version."""
+    compiled_path = get_cache_dir() / COMPILED_CONFIG_FILENAME
+    try:
+        compiled = json.loads(compiled_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(compiled, dict):
+        return None
+    if compiled.get("source") != str(config_path):
+        return None
+    if [compiled.get("mtime_ns"), compiled.get("size")] != list(stamp):
+        return None
+    config = compiled.get("config")
+    return config if isinstance(config, dict) else None
+
+
+def _write_compiled(config_path: Path, stamp: tuple[int, int], config: dict) -> None:
+    """Store the parsed config as JSON so later runs can skip YAML parsing."""
+    compiled_path = get_cache_dir() / COMPILED_CONFIG_FILENAME
+    try:
+        payload = json.dumps(
+            {
+                "source": str(config_path),
+                "mtime_ns": stamp[0],
+                "size": stamp[1],
+                "config": config,
+            }
+        )
+    except (TypeError, ValueError):
+        # Config holds values JSON can't represent; keep parsing YAML instead.
+        return
+    try:
+        compiled_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = compiled_path.with_suffix(".tmp")
+        tmp_path.write_text(payload, encoding="utf-8")
+        tmp_path.replace(compiled_path)
+    except OSError:
+        pass
+
+
+def load_user_config() -> dict:
+    """
+    Load ~/.agent-resources-config.yaml.
+
+    The parsed result is memoized in-process and compiled to JSON in the
+    cache directory, both keyed by the file's mtime and size, so YAML is
+    only parsed again after the file changes.
+    """
+    config_path = get_config_path()
+    try:
+        stat = config_path.stat()
+    except OSError:
+        return {}
+    stamp = (stat.st_mtime_ns, stat.st_size)
+
+    memo = _config_memo.get(str(config_path))
+    if memo is not None and memo[0] == stamp:
+        metrics.CACHE_REQUESTS.inc(cache="config", result="hit")
+        return memo[1]
+
+    config = _read_compiled(config_path, stamp)
+    metrics.CACHE_REQUESTS.inc(cache="config", result="miss" if config is None else "hit")
+    if config is None:
+        import yaml
+
+        with config_path.open("r") as file_handle:
+            loaded = yaml.safe_load(file_handle) or {}
+        config = loaded if isinstance(loaded, dict) else {}
+        _write_compiled(config_path, stamp, config)
+
+    _config_memo[str(config_path)] = (stamp, config)
+    return config
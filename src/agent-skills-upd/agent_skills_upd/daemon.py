@@ -0,0 +1,266 @@
+"""Optional long-lived daemon that serves install requests over a Unix socket.
+
+The daemon keeps one pooled HTTP client and the parsed user config in
+memory, so repeated `skill-upd`/`command-upd`/`agent-upd` calls skip
+interpreter start-up, heavy imports and TLS handshakes. The CLI talks to
+it through `run_install`, which falls back to in-process execution when
+no daemon is listening.
+
+Protocol: one JSON object per line. The client sends
+`{"op": ..., "args": [...], "kwargs": {...}}` and receives either
+`{"ok": true, "result": ...}` or `{"ok": false, "error": ..., "message": ...}`.
+"""
+
+import json
+import os
+import socket
+import socketserver
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Callable
+
+from agent_skills_upd import exceptions, metrics, tracing
+from agent_skills_upd.cache import get_cache_dir
+from agent_skills_upd.exceptions import SkillUpdError
+
+SOCKET_ENV = "AGENT_SKILLS_UPD_SOCKET"
+NO_DAEMON_ENV = "AGENT_SKILLS_UPD_NO_DAEMON"
+SOCKET_FILENAME = "daemon.sock"
+
+# Fetcher functions the daemon is allowed to run on behalf of clients.
+OPERATIONS = ("fetch_resource", "fetch_clawdhub_skill")
+
+CLIENT_TIMEOUT = 600.0
+
+
+def get_socket_path() -> Path:
+    """Return the daemon socket path, honoring AGENT_SKILLS_UPD_SOCKET."""
+    override = os.environ.get(SOCKET_ENV)
+    if override:
+        return Path(override).expanduser()
+    return get_cache_dir() / SOCKET_FILENAME
+
+
+def _encode(value: Any) -> Any:
+    """Encode Paths, enums, file filters and fetch results into tagged JSON values."""
+    from agent_skills_upd.fetcher import ClawdhubFetchResult, ResourceType
+    from agent_skills_upd.filters import FileFilter
+
+    if isinstance(value, Path):
+        return {"__path__": str(value.absolute())}
+    if isinstance(value, ResourceType):
+        return {"__resource_type__": value.value}
+    if isinstance(value, ClawdhubFetchResult):
+        return {"__clawdhub_result__": _encode(asdict(value))}
+    if isinstance(value, FileFilter):
+        return {"__file_filter__": value.to_dict()}
+    if isinstance(value, dict):
+        return {key: _encode(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_encode(item) for item in value]
+    return value
+
+
+def _decode(value: Any) -> Any:
+    """Reverse `_encode`."""
+    from agent_skills_upd.fetcher import ClawdhubFetchResult, ResourceType
+    from agent_skills_upd.filters import FileFilter
+
+    if isinstance(value, list):
+        return [_decode(item) for item in value]
+    if not isinstance(value, dict):
+        return value
+    if "__path__" in value:
+        return Path(value["__path__"])
+    if "__resource_type__" in value:
+        return ResourceType(value["__resource_type__"])
+    if "__clawdhub_result__" in value:
+        return ClawdhubFetchResult(**_decode(value["__clawdhub_result__"]))
+    if "__file_filter__" in value:
+        return FileFilter.from_dict(value["__file_filter__"])
+    return {key: _decode(item) for key, item in value.items()}
+
+
+def _error_from_response(response: dict) -> SkillUpdError:
+    """Rebuild the exception raised inside the daemon."""
+    error_cls = getattr(exceptions, str(response.get("error")), SkillUpdError)
+    if not (isinstance(error_cls, type) and issubclass(error_cls, SkillUpdError)):
+        error_cls = SkillUpdError
+    return error_cls(response.get("message", "Daemon request failed."))
+
+
+def _send(request: dict, socket_path: Path, timeout: float = CLIENT_TIMEOUT) -> dict:
+    """Send one request and return the decoded response line."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(str(socket_path))
+        sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as reader:
+            line = reader.readline()
+    if not line:
+        raise SkillUpdError("Daemon closed the connection without a response.")
+    return json.loads(line)
+
+
+def daemon_available(socket_path: Path | None = None) -> bool:
+    """Return True if a daemon answers on the socket."""
+    socket_path = socket_path or get_socket_path()
+    if not socket_path.exists():
+        return False
+    try:
+        return bool(_send({"op": "ping"}, socket_path, timeout=2.0).get("ok"))
+    except (OSError, ValueError):
+        return False
+
+
+def run_install(func: Callable, *args: Any, **kwargs: Any) -> Any:
+    """
+    Run a fetcher operation through the daemon, or in-process if none is running.
+
+    Tracing runs in-process so spans are collected by the caller.
+
+    Args:
+        func: Fetcher function to run (fetch_resource or fetch_clawdhub_skill)
+        *args: Positional arguments for func
+        **kwargs: Keyword arguments for func
+
+    Returns:
+        Whatever func returns.
+    """
+    op = getattr(func, "__name__", None)
+    socket_path = get_socket_path()
+    if (
+        op not in OPERATIONS
+        or os.environ.get(NO_DAEMON_ENV)
+        or tracing.is_enabled()
+        or not socket_path.exists()
+    ):
+        return func(*args, **kwargs)
+
+    request = {"op": op, "args": _encode(list(args)), "kwargs": _encode(kwargs)}
+    try:
+        response = _send(request, socket_path)
+    except (ConnectionRefusedError, FileNotFoundError):
+        # Stale socket left by a daemon that is gone.
+        return func(*args, **kwargs)
+    except (OSError, ValueError) as exc:
+        raise SkillUpdError(f"Daemon request failed: {exc}") from exc
+
+    if not response.get("ok"):
+        raise _error_from_response(response)
+    return _decode(response.get("result"))
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Handle one JSON request per connection."""
+
+    server: "DaemonServer"
+
+    def handle(self) -> None:
+        line = self.rfile.readline()
+        if not line:
+            return
+        try:
+            request = json.loads(line)
+            response = self.server.dispatch(request)
+        except ValueError:
+            response = {"ok": False, "error": "SkillUpdError", "message": "Malformed request."}
+        self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+
+
+class DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Threaded Unix socket server that runs fetcher operations."""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: Path):
+        self.socket_path = socket_path
+        super().__init__(str(socket_path), _RequestHandler)
+        os.chmod(socket_path, 0o600)
+
+    def server_bind(self) -> None:
+        # Create the socket owner-only: between bind() and a chmod, any local
+        # user could connect and submit installs.
+        previous = os.umask(0o077)
+        try:
+            super().server_bind()
+        finally:
+            os.umask(previous)
+
+    def dispatch(self, request: dict) -> dict:
+        """Run a decoded request and build the response."""
+        from agent_skills_upd import fetcher
+
+        op = request.get("op")
+        if op == "ping":
+            return {"ok": True, "result": {"pid": os.getpid()}}
+        if op == "shutdown":
+            # shutdown() blocks until serve_forever exits, so hand it off.
+            import threading
+
+            threading.Thread(target=self.shutdown, daemon=True).start()
+            return {"ok": True, "result": None}
+        if op not in OPERATIONS:
+            return {"ok": False, "error": "SkillUpdError", "message": f"Unknown op: {op}"}
+
+        args = _decode(request.get("args") or [])
+        kwargs = _decode(request.get("kwargs") or {})
+        try:
+            result = getattr(fetcher, op)(*args, **kwargs)
+        except SkillUpdError as exc:
+            return {"ok": False, "error": type(exc).__name__, "message": str(exc)}
+        except Exception as exc:  # keep the daemon alive on unexpected errors
+            return {"ok": False, "error": "SkillUpdError", "message": f"{type(exc).__name__}: {exc}"}
+        finally:
+            metrics.flush()
+        return {"ok": True, "result": _encode(result)}
+
+
+def _prepare_socket_path(socket_path: Path) -> None:
+    """Create the socket directory and clear a stale socket file."""
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    if not socket_path.exists():
+        return
+    if daemon_available(socket_path):
+        raise SkillUpdError(f"A daemon is already listening on {socket_path}.")
+    socket_path.unlink()
+
+
+def serve(socket_path: Path | None = None, ready: Callable[[], None] | None = None) -> None:
+    """
+    Run the daemon in the foreground until it receives a shutdown request.
+
+    Args:
+        socket_path: Socket to listen on (default: get_socket_path())
+        ready: Optional callback invoked once the socket is accepting connections
+    """
+    from agent_skills_upd.config import load_user_config
+    from agent_skills_upd.fetcher import shared_http_client
+
+    socket_path = socket_path or get_socket_path()
+    _prepare_socket_path(socket_path)
+
+    # Warm the config memo before the first request arrives.
+    load_user_config()
+
+    with shared_http_client():
+        server = DaemonServer(socket_path)
+        try:
+            if ready is not None:
+                ready()
+            server.serve_forever()
+        finally:
+            server.server_close()
+            try:
+                socket_path.unlink()
+            except FileNotFoundError:
+                pass
+
+
+def stop(socket_path: Path | None = None) -> bool:
+    """Ask a running daemon to shut down. Returns False if none was running."""
+    socket_path = socket_path or get_socket_path()
+    if not daemon_available(socket_path):
+        return False
+    _send({"op": "shutdown"}, socket_path, timeout=5.0)
+    return True
@@ -0,0 +1,51 @@
+"""Small SQLite helpers shared by the install registry and the cache index.
+
+Databases live in the cache directory and are shared by concurrent
+processes: WAL mode lets readers run alongside a writer, and writers
+serialize through `transaction`.
+"""
+
+import sqlite3
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+DB_TIMEOUT = 30.0
+# Stored in the database's user_version once its schema is in place.
+SCHEMA_VERSION = 1
+
+
+@contextmanager
+def connect(db_path: Path, schema: str) -> Iterator[sqlite3.Connection]:
+    """
+    Open db_path in autocommit mode, creating it and its schema if needed.
+
+    The schema is set up once per database: later connections only read
+    its user_version, so opening an existing database costs one query.
+    """
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(db_path, timeout=DB_TIMEOUT, isolation_level=None)
+    try:
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA synchronous=NORMAL")
+        if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+            # WAL mode is stored in the file, so it too is set only once.
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(schema)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        yield conn
+    finally:
+        conn.close()
+
+
+@contextmanager
+def transaction(conn: sqlite3.Connection) -> Iterator[None]:
+    """Run the block as one write transaction, rolled back on error."""
+    # IMMEDIATE takes the write lock up front, so read-modify-write is safe.
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
@@ -23,3 +23,9 @@ class ResourceExistsError(SkillUpdError):
     """Raised when the resource already exists locally."""
 
     pass
+
+
+class IntegrityError(SkillUpdError):
+    """Raised when fetched content doesn't match its expected digest."""
+
+    pass
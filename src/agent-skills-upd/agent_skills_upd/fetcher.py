@@ -1,24 +1,56 @@
 """Generic resource fetcher for skills, commands, and agents."""
 
+import filecmp
+import hashlib
 import io
 import json
+import os
 import shutil
 import tarfile
 import tempfile
+import threading
+import time
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from collections.abc import Mapping
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
-
-import frontmatter
-import httpx
-
+from typing import TYPE_CHECKING, Callable, Iterator
+
+from agent_skills_upd import (
+    cache_index,
+    filters,
+    gzip_backend,
+    installs,
+    integrity,
+    locks,
+    metrics,
+    negative,
+    tracing,
+)
+from agent_skills_upd.cache import (
+    ARCHIVE_CACHE_SUBDIR,
+    find_in_layers,
+    get_cache_dir,
+    safe_host,
+)
 from agent_skills_upd.exceptions import (
     SkillUpdError,
+    IntegrityError,
     RepoNotFoundError,
     ResourceExistsError,
     ResourceNotFoundError,
 )
+from agent_skills_upd.header import HeaderError, metadata_from_text, read_metadata
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+    import httpx
+
+    from agent_skills_upd.providers import SourceProvider
 
 
 class ResourceType(Enum):
@@ -89,10 +121,376 @@ RESOURCE_SEARCH_PATTERNS = {
 # Name of the repository to fetch resources from
 REPO_NAME = "agent-resources"
 
+# How fetch_resource obtains the repository contents
+FETCH_BACKENDS = ("archive", "git")
+
+# Threads used to materialize one resource at many destinations
+MAX_FANOUT_WORKERS = 8
+
 CLAWDHUB_HOST = "clawdhub.com"
-CLAWDHUB_DOWNLOAD_URL = "https://auth.clawdhub.com/api/download"
-CLAWDHUB_METADATA_URL = "https://auth.clawdhub.com/api/skill"
+CLAWDHUB_API_URL = "https://auth.clawdhub.com/api"
+CLAWDHUB_DOWNLOAD_URL = f"{CLAWDHUB_API_URL}/download"
+CLAWDHUB_METADATA_URL = f"{CLAWDHUB_API_URL}/skill"
+# Points Clawdhub requests at a mirror or a local stand-in.
+CLAWDHUB_API_ENV = "AGENT_SKILLS_UPD_CLAWDHUB_API"
 CLAWDHUB_METADATA_FILENAME = "SKILL.json"
+CLAWDHUB_SPECULATIVE_ENV = "AGENT_SKILLS_UPD_CLAWDHUB_SPECULATIVE"
+
+
+HTTP_TIMEOUT = 30.0
+
+# Long-lived client installed by the daemon so connections and TLS sessions
+# are reused across installs. None means each fetch opens its own client.
+_shared_client: "httpx.Client | None" = None
+
+
+@contextmanager
+def http_client() -> Iterator["httpx.Client"]:
+    """Yield the shared HTTP client if one is installed, else a fresh one."""
+    if _shared_client is not None:
+        yield _shared_client
+        return
+
+    import httpx
+
+    with httpx.Client(follow_redirects=True, timeout=HTTP_TIMEOUT) as client:
+        yield client
+
+
+@contextmanager
+def shared_http_client() -> Iterator["httpx.Client"]:
+    """Install one pooled HTTP client for every fetch made inside the block."""
+    global _shared_client
+
+    import httpx
+
+    previous = _shared_client
+    with httpx.Client(follow_redirects=True, timeout=HTTP_TIMEOUT) as client:
+        _shared_client = client
+        try:
+            yield client
+        finally:
+            _shared_client = previous
+
+
+class _HttpPhaseTracer:
+    """httpcore trace hook that turns connection events into spans."""
+
+    def __init__(self) -> None:
+        self._started: dict[str, float] = {}
+
+    def __call__(self, event_name: str, info: dict) -> None:
+        # Events look like "connection.connect_tcp.started" or
+        # "http11.receive_response_body.complete". DNS lookup happens
+        # inside connect_tcp, so it is reported as part of that span.
+        phase, _, state = event_name.rpartition(".")
+        operation = phase.rpartition(".")[2]
+        now = time.perf_counter()
+        if state == "started":
+            self._started[operation] = now
+        elif operation in self._started:
+            start = self._started.pop(operation)
+            tracing.record_span(f"http.{operation}", start, now - start)
+
+
+def http_get(client: "httpx.Client", url: str, **kwargs) -> "httpx.Response":
+    """GET a URL, attaching connection-level spans when tracing is enabled."""
+    if tracing.is_enabled():
+        kwargs.setdefault("extensions", {})["trace"] = _HttpPhaseTracer()
+    return client.get(url, **kwargs)
+
+
+def http_stream(client: "httpx.Client", url: str, **kwargs):
+    """Stream a GET response (use as a context manager), with spans as for `http_get`."""
+    if tracing.is_enabled():
+        kwargs.setdefault("extensions", {})["trace"] = _HttpPhaseTracer()
+    return client.stream("GET", url, **kwargs)
+
+
+class _TimedReader:
+    """File wrapper that accumulates the time spent in read() (e.g. gunzip)."""
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.seconds = 0.0
+
+    def read(self, size: int = -1) -> bytes:
+        start = time.perf_counter()
+        try:
+            return self.raw.read(size)
+        finally:
+            self.seconds += time.perf_counter() - start
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        return self.raw.seek(offset, whence)
+
+    def tell(self) -> int:
+        return self.raw.tell()
+
+
+@dataclass(frozen=True)
+class ArchiveSelection:
+    """
+    Files of a branch archive to leave out when extracting it.
+
+    Under each of roots (paths from the repository root, e.g. a skill's
+    candidate directories) members are kept only if file_filter allows
+    them relative to that root; everything else is extracted, so other
+    lookups over the tree still work. Picklable, for the extraction pool.
+    """
+
+    roots: tuple[str, ...]
+    file_filter: "filters.FileFilter"
+
+    def keeps(self, member: tarfile.TarInfo) -> bool:
+        # Branch archives hold everything in one top-level directory.
+        path = member.name.partition("/")[2].rstrip("/")
+        for root in self.roots:
+            if path.startswith(f"{root}/"):
+                relative = path[len(root) + 1 :]
+                if member.isdir():
+                    return self.file_filter.allows_dir(relative)
+                return self.file_filter.allows(relative, member.size)
+        return True
+
+
+def _selected(tar: tarfile.TarFile, selection: ArchiveSelection | None):
+    """Members to extract; None for all. Lazy, so the archive is read in one pass."""
+    if selection is None:
+        return None
+    return (member for member in tar if selection.keeps(member))
+
+
+def extract_tarball(
+    tarball_path: Path, extract_path: Path, selection: ArchiveSelection | None = None
+) -> None:
+    """
+    Extract a .tar.gz file, recording extract and gunzip spans.
+
+    The archive is inflated with the configured gzip backend (see
+    `gzip_backend`) and read to the end, so gzip's own checksum catches a
+    corrupted archive without hashing it again.
+
+    Args:
+        tarball_path: Archive to extract
+        extract_path: Directory to extract into
+        selection: Members to leave out; they are still inflated, but
+            never written
+
+    Raises:
+        IntegrityError: If the archive is corrupted
+    """
+    with tracing.span("extract") as extract_span:
+        reader = _TimedReader(None)
+        try:
+            with tarball_path.open("rb") as raw, gzip_backend.open_gzip(raw) as gz:
+                reader.raw = gz
+                with tarfile.open(fileobj=reader, mode="r:") as tar:
+                    try:
+                        tar.extractall(
+                            extract_path, members=_selected(tar, selection), filter="data"
+                        )
+                    except TypeError:
+                        tar.extractall(extract_path, members=_selected(tar, selection))
+                    if tracing.is_enabled():
+                        members = [
+                            member
+                            for member in tar.getmembers()
+                            if member.isfile() and (selection is None or selection.keeps(member))
+                        ]
+                        extract_span.set(
+                            files=len(members),
+                            bytes=sum(member.size for member in members),
+                            backend=gzip_backend.backend_name(),
+                        )
+                # tarfile stops at the end-of-archive marker; the trailer holds the CRC.
+                while reader.read(gzip_backend.READ_BUFFER_SIZE):
+                    pass
+        except (*gzip_backend.decompress_errors(), tarfile.TarError) as exc:
+            if isinstance(exc, OSError) and exc.errno is not None:
+                raise  # a filesystem error, not a broken archive
+            raise IntegrityError(f"Archive {tarball_path} is corrupted: {exc}") from exc
+        tracing.record_span("extract.gunzip", extract_span.start, reader.seconds)
+
+
+def copy_resource(
+    source: Path,
+    dest: Path,
+    is_directory: bool,
+    ignore: Callable | None = None,
+) -> None:
+    """Copy a resource file or directory, recording a copy span."""
+    with tracing.span("copy") as copy_span:
+
+        def counting_copy(src: str, dst: str) -> str:
+            result = integrity.copy_file(src, dst)
+            copy_span.add("files", 1)
+            copy_span.add("bytes", Path(dst).stat().st_size)
+            return result
+
+        if is_directory:
+            shutil.copytree(
+                str(source), str(dest), ignore=ignore, copy_function=counting_copy
+            )
+        else:
+            counting_copy(str(source), str(dest))
+
+
+# Linux FICLONE ioctl: share extents copy-on-write (btrfs, XFS, ...).
+_FICLONE = 0x40049409
+
+
+def _reflink(src: str, dst: str) -> bool:
+    """Try to reflink src to dst; returns False where unsupported."""
+    try:
+        import fcntl
+    except ImportError:
+        return False
+    try:
+        with open(src, "rb") as source, open(dst, "wb") as target:
+            fcntl.ioctl(target.fileno(), _FICLONE, source.fileno())
+    except OSError:
+        Path(dst).unlink(missing_ok=True)
+        return False
+    shutil.copystat(src, dst)
+    return True
+
+
+def link_resource(source: Path, dest: Path, is_directory: bool) -> None:
+    """
+    Materialize an installed resource at another path without copying data.
+
+    Files are hardlinked, else reflinked, else copied (e.g. across
+    filesystems). Installs always replace files rather than writing into
+    them, so sharing inodes between targets is safe.
+    """
+    with tracing.span("link") as link_span:
+
+        def link_file(src: str, dst: str) -> str:
+            try:
+                os.link(src, dst)
+                link_span.add("linked", 1)
+            except OSError:
+                if _reflink(src, dst):
+                    link_span.add("reflinked", 1)
+                else:
+                    shutil.copy2(src, dst)
+                    link_span.add("copied", 1)
+            return dst
+
+        if is_directory:
+            shutil.copytree(str(source), str(dest), copy_function=link_file)
+        else:
+            link_file(str(source), str(dest))
+
+
+def _remove_existing(path: Path) -> None:
+    if path.is_dir() and not path.is_symlink():
+        shutil.rmtree(path)
+    elif path.exists() or path.is_symlink():
+        path.unlink()
+
+
+def _tree_files(root: Path) -> dict[str, Path]:
+    return {
+        path.relative_to(root).as_posix(): path
+        for path in root.rglob("*")
+        if path.is_file() or path.is_symlink()
+    }
+
+
+def same_content(left: Path, right: Path, is_directory: bool) -> bool:
+    """Return whether two installed copies hold the same files and bytes."""
+    if is_directory:
+        if not (left.is_dir() and right.is_dir()):
+            return False
+        left_files, right_files = _tree_files(left), _tree_files(right)
+        if left_files.keys() != right_files.keys():
+            return False
+        pairs = [(left_files[key], right_files[key]) for key in left_files]
+    else:
+        if not (left.is_file() and right.is_file()):
+            return False
+        pairs = [(left, right)]
+    for left_file, right_file in pairs:
+        left_stat, right_stat = left_file.lstat(), right_file.lstat()
+        if left_stat.st_mode != right_stat.st_mode:
+            return False
+        if not filecmp.cmp(left_file, right_file, shallow=False):
+            return False
+    return True
+
+
+def _swap_in(staged: Path, target: Path) -> None:
+    """Move staged into place with renames, so readers never see a partial copy."""
+    if not (target.exists() or target.is_symlink()):
+        staged.rename(target)
+        return
+    if not staged.is_dir() and not target.is_dir():
+        os.replace(staged, target)
+        return
+    # Directories can't be replaced in one rename: move the old one aside first.
+    retired = target.with_name(f".{target.name}.old-{os.getpid()}-{threading.get_ident()}")
+    target.rename(retired)
+    staged.rename(target)
+    _remove_existing(retired)
+
+
+def replace_if_changed(
+    target: Path, is_directory: bool, write: Callable[[Path], None]
+) -> bool:
+    """
+    Write a new copy of target next to it and swap it in if it differs.
+
+    Args:
+        target: Installed resource path
+        is_directory: Whether the resource is a directory
+        write: Called with the staging path to produce the new copy
+
+    Returns:
+        True if target was replaced, False if the new copy was identical
+    """
+    target.parent.mkdir(parents=True, exist_ok=True)
+    staged = target.with_name(
+        f".{target.name}.staging-{os.getpid()}-{threading.get_ident()}"
+    )
+    _remove_existing(staged)
+    try:
+        write(staged)
+        if same_content(staged, target, is_directory):
+            return False
+        _swap_in(staged, target)
+        return True
+    finally:
+        if staged.exists() or staged.is_symlink():
+            _remove_existing(staged)
+
+
+def fan_out(source: Path, targets: list[Path], is_directory: bool) -> None:
+    """Replace every target with a linked copy of `source`, concurrently."""
+    if not targets:
+        return
+
+    def materialize(target: Path) -> None:
+        _remove_existing(target)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        link_resource(source, target, is_directory)
+
+    with tracing.span("fanout", targets=len(targets)):
+        with ThreadPoolExecutor(max_workers=min(MAX_FANOUT_WORKERS, len(targets))) as pool:
+            list(pool.map(materialize, targets))
+
+
+def _unique_paths(paths: list[Path]) -> list[Path]:
+    """Drop repeated destinations, keeping the first occurrence."""
+    seen: set[Path] = set()
+    unique = []
+    for path in paths:
+        key = path.absolute()
+        if key not in seen:
+            seen.add(key)
+            unique.append(path)
+    return unique
 
 
 @dataclass
@@ -114,14 +512,25 @@ def find_root_skill_file(repo_dir: Path) -> Path | None:
 
 
 def parse_frontmatter_name(skill_file: Path) -> tuple[str | None, str | None]:
-    """Parse the skill name from frontmatter."""
-    content = skill_file.read_text(encoding="utf-8")
+    """Parse the skill name from frontmatter, reading only the header block."""
+    try:
+        metadata = read_metadata(skill_file)
+    except HeaderError:
+        return None, "Root SKILL.md frontmatter is invalid."
+    return _frontmatter_name(metadata)
+
+
+def parse_frontmatter_text(content: str) -> tuple[str | None, str | None]:
+    """Parse the skill name from SKILL.md content."""
     try:
-        post = frontmatter.loads(content)
-    except Exception:
+        metadata = metadata_from_text(content)
+    except HeaderError:
         return None, "Root SKILL.md frontmatter is invalid."
+    return _frontmatter_name(metadata)
 
-    name = post.metadata.get("name") if post.metadata else None
+
+def _frontmatter_name(metadata: dict) -> tuple[str | None, str | None]:
+    name = metadata.get("name")
     name_value = str(name).strip() if name is not None else ""
     if not name_value:
         return None, "Root SKILL.md frontmatter missing name."
@@ -129,6 +538,12 @@ def parse_frontmatter_name(skill_file: Path) -> tuple[str | None, str | None]:
     return name_value, None
 
 
+def clawdhub_api_url(endpoint: str) -> str:
+    """Return the URL of a Clawdhub API endpoint ("skill" or "download")."""
+    base = os.environ.get(CLAWDHUB_API_ENV, "").rstrip("/") or CLAWDHUB_API_URL
+    return f"{base}/{endpoint}"
+
+
 def parse_clawdhub_version(metadata: dict) -> str | None:
     """Extract the latest version string from Clawdhub metadata."""
     latest = metadata.get("latestVersion")
@@ -188,8 +603,15 @@ def extract_archive(archive_bytes: bytes, extract_path: Path) -> None:
         raise SkillUpdError("Unable to extract Clawdhub archive.") from exc
 
 
-def validate_repository_structure(repo_dir: Path) -> dict:
-    """Simple validation that provides useful feedback."""
+def validate_repository_structure(
+    repo_dir: Path | None, exists: Callable[[str], bool] | None = None
+) -> dict:
+    """
+    Simple validation that provides useful feedback.
+
+    exists checks a directory path relative to the repo root; pass it
+    when the repo isn't fully on disk (e.g. a provider's tree listing).
+    """
     patterns_found = []
     for pattern in [
         ".claude/skills",
@@ -202,7 +624,8 @@ def validate_repository_structure(repo_dir: Path) -> dict:
         "agents",
         "agent",
     ]:
-        if (repo_dir / pattern).exists():
+        found = exists(pattern) if exists is not None else (repo_dir / pattern).exists()
+        if found:
             patterns_found.append(pattern)
 
     suggestions = []
@@ -213,6 +636,12 @@ def validate_repository_structure(repo_dir: Path) -> dict:
     return {"patterns_found": patterns_found, "suggestions": suggestions}
 
 
+def build_archive_url(host: str, username: str, repo: str, ref: str = "main") -> str:
+    """Build the tarball URL for a branch; host may carry an explicit scheme."""
+    base = host.rstrip("/") if "://" in host else f"https://{host}"
+    return f"{base}/{username}/{repo}/archive/refs/heads/{ref}.tar.gz"
+
+
 def find_resource_in_repo(
     repo_dir: Path, resource_type: ResourceType, name: str
 ) -> Path | None:
@@ -231,257 +660,800 @@ def find_resource_in_repo(
     return None
 
 
-def fetch_resource(
+# Process pool installed for batch operations by `extraction_pool`. None
+# extracts in the calling thread.
+_extract_pool: "ProcessPoolExecutor | None" = None
+# Smaller archives extract faster in-process than the round trip to a worker.
+POOL_MIN_ARCHIVE_BYTES = 1024 * 1024
+
+
+@contextmanager
+def extraction_pool(workers: int) -> Iterator[None]:
+    """
+    Extract branch archives in worker processes for the rest of the block.
+
+    gzip inflation and tar member writes hold the GIL for much of their
+    time, so installs running in threads extract on one core. Inside the
+    block, archives downloaded by any thread are extracted by a pool of
+    up to `workers` processes (at most one per CPU). Workers read the
+    cached archive and write the caller's extraction directory; their
+    errors are raised in the caller. With fewer than two workers, or
+    inside another pool's block, nothing changes.
+    """
+    global _extract_pool
+
+    workers = min(workers, os.cpu_count() or 1)
+    if workers < 2 or _extract_pool is not None:
+        yield
+        return
+
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    # spawn: forking a process that runs threads can copy held locks.
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        _extract_pool = pool
+        try:
+            yield
+        finally:
+            _extract_pool = None
+
+
+def _extract_cached_archive(
+    tarball_path: Path, extract_path: Path, selection: ArchiveSelection | None = None
+) -> None:
+    """Run `extract_tarball` in the installed process pool, if any, else in-process."""
+    pool = _extract_pool
+    if pool is None or tarball_path.stat().st_size < POOL_MIN_ARCHIVE_BYTES:
+        extract_tarball(tarball_path, extract_path, selection)
+        return
+
+    from concurrent.futures.process import BrokenProcessPool
+
+    with tracing.span("extract", pool=True):
+        try:
+            pool.submit(extract_tarball, tarball_path, extract_path, selection).result()
+            return
+        except BrokenProcessPool:
+            # A worker died (e.g. killed for memory); extract here instead.
+            pass
+    extract_tarball(tarball_path, extract_path, selection)
+
+
+def archive_root_name(repo: str, ref: str) -> str:
+    """Top-level directory of a branch archive (slashes in the branch become dashes)."""
+    return f"{repo}-{ref.replace('/', '-')}"
+
+
+def download_repo_archive(
+    host: str,
     username: str,
-    name: str | None,
-    dest: Path,
-    resource_type: ResourceType,
-    overwrite: bool = True,
-    host: str = "github.com",
-    repo: str = REPO_NAME,
+    repo: str,
+    tmp_path: Path,
+    ref: str = "main",
+    selection: ArchiveSelection | None = None,
 ) -> Path:
     """
-    Fetch a resource from a user's agent-resources repo and copy it to dest.
+    Fetch a repo's branch archive into the cache and extract it into tmp_path.
 
-    Args:
-        username: GitHub (or alternative Git host) username
-        name: Name of the resource to fetch (optional for root-level skills)
-        dest: Destination directory (e.g., .claude/skills/, .claude/commands/)
-        resource_type: Type of resource (SKILL, COMMAND, or AGENT)
-        overwrite: Whether to overwrite existing resource
-        host: Repository host (default: github.com)
+    Members selection leaves out are not extracted.
 
     Returns:
-        Path to the installed resource
+        Path to the extracted repository root
 
     Raises:
-        RepoNotFoundError: If the agent-resources repo doesn't exist
-        ResourceNotFoundError: If the resource doesn't exist in the repo
-        ResourceExistsError: If resource exists locally and overwrite=False
+        RepoNotFoundError: If the repository doesn't exist
     """
-    config = RESOURCE_CONFIGS[resource_type]
+    tarball_path = fetch_repo_archive(host, username, repo, ref)
 
-    resource_dest = None
-    if name is not None:
-        # Determine destination path
-        if config.is_directory:
-            resource_dest = dest / name
-        else:
-            resource_dest = dest / f"{name}{config.file_extension}"
+    extract_path = tmp_path / "extracted"
+    try:
+        _extract_cached_archive(tarball_path, extract_path, selection)
+    except IntegrityError:
+        # Corrupted in the cache: drop it so the next run downloads it again.
+        # (Read-only layers are left alone.)
+        if tarball_path == get_archive_cache_path(host, username, repo, ref):
+            tarball_path.unlink(missing_ok=True)
+            tarball_path.with_name(f"{tarball_path.name}.json").unlink(missing_ok=True)
+        raise
+
+    # Tarball extracts to: <repo>-<branch>/<patterns>
+    archive_root = extract_path / archive_root_name(repo, ref)
+    if not archive_root.is_dir():
+        return select_archive_root(extract_path)
+    return archive_root
+
+
+def fetch_repo_archive(
+    host: str, username: str, repo: str, ref: str = "main", revalidate_layers: bool = False
+) -> Path:
+    """
+    Bring the cached branch archive up to date and return its path.
 
-        # Check if resource already exists locally
-        if resource_dest.exists() and not overwrite:
-            raise ResourceExistsError(
-                f"{resource_type.value.capitalize()} '{name}' already exists at {resource_dest}\n"
-                f"Use --overwrite to replace it."
-            )
+    Runs under a per-archive lock. Processes that waited for the lock
+    while another one fetched the same archive reuse that file. Otherwise
+    a cached archive is revalidated with a conditional request, so an
+    unchanged archive costs a 304 instead of a download.
+
+    An archive found only in a read-only cache layer is used in place
+    without any request, unless revalidate_layers is set; a changed
+    archive is then downloaded into the writable cache, which shadows the
+    layer from then on.
+
+    Raises:
+        RepoNotFoundError: If the repository doesn't exist
+    """
+    tarball_url = build_archive_url(host, username, repo, ref)
+    tarball_path = get_archive_cache_path(host, username, repo, ref)
+    layered = None if tarball_path.exists() else find_in_layers(tarball_path)
+
+    if layered is not None and not revalidate_layers:
+        result = "hit"
+    else:
+        with locks.file_lock(tarball_path.with_name(f"{tarball_path.name}.lock")) as requested_at:
+            if tarball_path.exists() and tarball_path.stat().st_mtime >= requested_at:
+                result = "hit"
+            elif _download_archive(tarball_url, tarball_path, host, username, repo, layered):
+                result = "miss"
+            else:
+                result = "revalidated"
+    if tarball_path.exists():
+        layered = None
+    metrics.CACHE_REQUESTS.inc(cache="archive", result=result)
+    # Outside the lock: a miss may evict other entries, which takes their locks.
+    cache_index.record_use(layered or tarball_path, "archive", result)
+    return layered or tarball_path
+
+
+def find_cached_archive(host: str, username: str, repo: str, ref: str) -> Path:
+    """Return the cached archive to use: the writable cache's, else a layer's."""
+    tarball_path = get_archive_cache_path(host, username, repo, ref)
+    if tarball_path.exists():
+        return tarball_path
+    return find_in_layers(tarball_path) or tarball_path
+
+
+def get_archive_cache_path(host: str, username: str, repo: str, ref: str) -> Path:
+    """Return where a branch archive is kept in the cache directory."""
+    return (
+        get_cache_dir()
+        / ARCHIVE_CACHE_SUBDIR
+        / safe_host(host)
+        / username
+        / repo
+        / f"{ref.replace('/', '-')}.tar.gz"
+    )
 
-    # Download tarball
-    tarball_url = f"https://{host}/{username}/{repo}/archive/refs/heads/main.tar.gz"
 
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        tmp_path = Path(tmp_dir)
-        tarball_path = tmp_path / "repo.tar.gz"
+def read_archive_meta(tarball_path: Path) -> dict:
+    """Return the validators stored next to a cached archive (ETag, sha256, ...)."""
+    try:
+        meta = json.loads(tarball_path.with_name(f"{tarball_path.name}.json").read_text())
+    except (OSError, ValueError):
+        return {}
+    return meta if isinstance(meta, dict) else {}
 
-        # Download
-        try:
-            with httpx.Client(follow_redirects=True, timeout=30.0) as client:
-                response = client.get(tarball_url)
+
+def _write_archive_meta(tarball_path: Path, meta: dict) -> None:
+    meta_path = tarball_path.with_name(f"{tarball_path.name}.json")
+    tmp_path = meta_path.with_name(f".{meta_path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(json.dumps(meta, sort_keys=True), encoding="utf-8")
+    tmp_path.replace(meta_path)
+
+
+def _download_archive(
+    tarball_url: str,
+    tarball_path: Path,
+    host: str,
+    username: str,
+    repo: str,
+    layered: Path | None = None,
+) -> bool:
+    """
+    Download an archive to tarball_path, replacing it atomically.
+
+    Args:
+        layered: Copy in a read-only cache layer to revalidate when
+            tarball_path doesn't exist yet
+
+    Returns:
+        False if the server confirmed the cached copy is current (304).
+    """
+    import httpx
+
+    headers = {}
+    if tarball_path.exists():
+        meta = read_archive_meta(tarball_path)
+    else:
+        meta = read_archive_meta(layered) if layered is not None else {}
+    if meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if meta.get("last_modified"):
+        headers["If-Modified-Since"] = meta["last_modified"]
+
+    tarball_path.parent.mkdir(parents=True, exist_ok=True)
+    partial_path = tarball_path.with_name(f".{tarball_path.name}.{os.getpid()}.part")
+    try:
+        with tracing.span("download", url=tarball_url) as download_span:
+            with http_client() as client, http_stream(
+                client, tarball_url, headers=headers
+            ) as response:
+                if response.status_code == 304:
+                    download_span.set(bytes=0, not_modified=True)
+                    if tarball_path.exists():
+                        # Fresh again: lets waiting processes reuse it.
+                        os.utime(tarball_path)
+                    return False
                 if response.status_code == 404:
+                    metrics.HTTP_ERRORS.inc(host=host, status=404)
+                    metrics.NOT_FOUND.inc(host=host, kind="repo")
                     raise RepoNotFoundError(
                         f"Repository '{username}/{repo}' not found on {host}."
                     )
                 response.raise_for_status()
 
-                tarball_path.write_bytes(response.content)
-        except httpx.HTTPStatusError as e:
-            raise SkillUpdError(f"Failed to download repository: {e}")
-        except httpx.RequestError as e:
-            raise SkillUpdError(f"Network error: {e}")
+                # Hashed as it streams to disk: the digest costs no second pass.
+                digest = hashlib.sha256()
+                size = 0
+                with partial_path.open("wb") as handle:
+                    for chunk in response.iter_bytes(integrity.HASH_CHUNK_SIZE):
+                        digest.update(chunk)
+                        handle.write(chunk)
+                        size += len(chunk)
+                partial_path.replace(tarball_path)
+                response_headers = response.headers if isinstance(response.headers, Mapping) else {}
+                _write_archive_meta(
+                    tarball_path,
+                    {
+                        "url": tarball_url,
+                        "etag": response_headers.get("etag"),
+                        "last_modified": response_headers.get("last-modified"),
+                        "sha256": digest.hexdigest(),
+                    },
+                )
+                download_span.set(bytes=size)
+                metrics.DOWNLOADS.inc(host=host)
+                metrics.DOWNLOAD_BYTES.inc(size, host=host)
+    except httpx.HTTPStatusError as e:
+        metrics.HTTP_ERRORS.inc(host=host, status=e.response.status_code)
+        raise SkillUpdError(f"Failed to download repository: {e}")
+    except httpx.RequestError as e:
+        metrics.HTTP_ERRORS.inc(host=host, status="network")
+        raise SkillUpdError(f"Network error: {e}")
+    finally:
+        partial_path.unlink(missing_ok=True)
+    return True
+
+
+def sparse_cone_paths(resource_type: ResourceType, name: str | None) -> list[str]:
+    """Directories that may hold the resource, used as a sparse-checkout cone."""
+    if name is None:
+        return []
 
-        # Extract
-        extract_path = tmp_path / "extracted"
-        with tarfile.open(tarball_path, "r:gz") as tar:
-            try:
-                tar.extractall(extract_path, filter="data")
-            except TypeError:
-                tar.extractall(extract_path)
+    config = RESOURCE_CONFIGS[resource_type]
+    paths: list[str] = []
+    for pattern in RESOURCE_SEARCH_PATTERNS[resource_type]:
+        path = pattern.format(name=name).rstrip("/")
+        if not config.is_directory:
+            path = path.rpartition("/")[0]
+        if path and path not in paths:
+            paths.append(path)
+    return paths
 
-        # Find the resource in extracted content using pattern-based search
-        # Tarball extracts to: <repo>-main/<patterns>
-        repo_dir = extract_path / f"{repo}-main"
 
-        resource_source = (
-            find_resource_in_repo(repo_dir, resource_type, name) if name else None
+def locate_member(
+    provider: "SourceProvider", resource_type: ResourceType, name: str | None
+) -> tuple[str | None, str | None, str | None]:
+    """
+    Locate a resource through a provider, including root-level SKILL.md repos.
+
+    Returns:
+        Tuple of (member path or None, resolved name, root skill message);
+        the member path is "" when the whole source is the skill.
+    """
+    config = RESOURCE_CONFIGS[resource_type]
+    if name:
+        for pattern in RESOURCE_SEARCH_PATTERNS[resource_type]:
+            search_path = pattern.format(name=name)
+            if config.file_extension and not search_path.endswith(config.file_extension):
+                search_path += config.file_extension
+            search_path = search_path.rstrip("/")
+            if provider.has_dir(search_path) or provider.has_file(search_path):
+                return search_path, name, None
+
+    if resource_type != ResourceType.SKILL or provider.repo == REPO_NAME:
+        return None, name, None
+
+    root_skill_file = next(
+        (
+            member
+            for member in sorted(provider.root_files(), key=str.lower)
+            if member.lower() == "skill.md"
+        ),
+        None,
+    )
+    if root_skill_file is None:
+        return None, name, "Root SKILL.md not found (case-insensitive) in repo root."
+
+    root_skill_name, root_skill_error = parse_frontmatter_text(
+        provider.read_text(root_skill_file)
+    )
+    if root_skill_error:
+        return None, name, root_skill_error
+    if name is not None and root_skill_name != name:
+        return None, name, (
+            "Root SKILL.md frontmatter name "
+            f"'{root_skill_name}' does not match requested '{name}'."
         )
-        root_skill_message = None
-        root_skill_name = None
-        if (
-            resource_source is None
-            and resource_type == ResourceType.SKILL
-            and repo != REPO_NAME
-        ):
-            root_skill_file = find_root_skill_file(repo_dir)
-            if root_skill_file is None:
-                root_skill_message = (
-                    "Root SKILL.md not found (case-insensitive) in repo root."
-                )
-            else:
-                root_skill_name, root_skill_error = parse_frontmatter_name(
-                    root_skill_file
-                )
-                if root_skill_error:
-                    root_skill_message = root_skill_error
-                else:
-                    if name is None:
-                        name = root_skill_name
-                        resource_source = root_skill_file.parent
-                    elif root_skill_name != name:
-                        root_skill_message = (
-                            "Root SKILL.md frontmatter name "
-                            f"'{root_skill_name}' does not match requested '{name}'."
-                        )
-                    else:
-                        resource_source = root_skill_file.parent
-
-        if resource_source is None or not resource_source.exists():
-            display_name = name or "<unspecified>"
-            patterns_name = name or "<skill-name>"
-            patterns_tried = [
-                p.format(name=patterns_name)
-                for p in RESOURCE_SEARCH_PATTERNS[resource_type]
-            ]
-            patterns_list = "\n".join([f"- {pattern}" for pattern in patterns_tried])
-
-            validation = validate_repository_structure(repo_dir)
-
-            error_msg = (
-                f"{resource_type.value.capitalize()} '{display_name}' not found in {username}/{repo}.\n"
-                f"Tried these locations:\n{patterns_list}\n"
+    return "", root_skill_name, None
+
+
+def _resource_not_found(
+    provider: "SourceProvider",
+    searched: "SourceProvider",
+    resource_type: ResourceType,
+    name: str | None,
+    root_skill_message: str | None,
+) -> ResourceNotFoundError:
+    """
+    Build the not-found error with the locations tried and quick fixes.
+
+    `searched` is the provider the lookup ran against: `provider` itself,
+    or a directory provider over its materialized tree.
+    """
+    display_name = name or "<unspecified>"
+    patterns_name = name or "<skill-name>"
+    patterns_tried = [
+        p.format(name=patterns_name)
+        for p in RESOURCE_SEARCH_PATTERNS[resource_type]
+    ]
+    patterns_list = "\n".join([f"- {pattern}" for pattern in patterns_tried])
+
+    validation = validate_repository_structure(None, exists=searched.has_dir)
+
+    error_msg = (
+        f"{resource_type.value.capitalize()} '{display_name}' not found in {provider.label}.\n"
+        f"Tried these locations:\n{patterns_list}\n"
+    )
+
+    if validation["suggestions"]:
+        error_msg += "\nRepository structure issues:\n"
+        error_msg += "\n".join([f"- {msg}" for msg in validation["suggestions"]])
+        error_msg += "\n"
+    elif validation["patterns_found"]:
+        error_msg += (
+            f"\nFound directories: {', '.join(validation['patterns_found'])}\n"
+        )
+
+    if root_skill_message:
+        error_msg += "\nManual repo override check:\n"
+        error_msg += f"- {root_skill_message}\n"
+
+    error_msg += (
+        "\nQuick fixes:\n"
+        "- Double-check the resource name\n"
+        "- Try --repo REPO_NAME if using a different repository\n"
+        "- Try --dest PATH for custom installation location"
+    )
+    if provider.web_url:
+        error_msg += f"\n- Visit {provider.web_url} to verify the resource exists"
+
+    metrics.NOT_FOUND.inc(host=provider.host, kind="resource")
+    return ResourceNotFoundError(error_msg)
+
+
+def _resource_path(dest: Path, resource_type: ResourceType, name: str) -> Path:
+    """Return where a resource installs inside dest."""
+    config = RESOURCE_CONFIGS[resource_type]
+    if config.is_directory:
+        return dest / name
+    return dest / f"{name}{config.file_extension}"
+
+
+def _check_overwrite(
+    resource_dest: Path, resource_type: ResourceType, name: str, overwrite: bool
+) -> None:
+    """Refuse to replace an installed resource unless overwrite is set."""
+    if resource_dest.exists() and not overwrite:
+        raise ResourceExistsError(
+            f"{resource_type.value.capitalize()} '{name}' already exists at {resource_dest}\n"
+            f"Use --overwrite to replace it."
+        )
+
+
+def _delta_base(
+    provider: "SourceProvider",
+    resource_dest: Path,
+    resource_type: ResourceType,
+    file_filter: filters.FileFilter,
+) -> installs.InstallRecord | None:
+    """
+    Return the record of an install at resource_dest that a delta update can start from.
+
+    That is an intact directory install from the same source, made with
+    the same filter; locally modified installs are fetched in full.
+    """
+    if not (
+        provider.capabilities.delta_updates and RESOURCE_CONFIGS[resource_type].is_directory
+    ):
+        return None
+    record = installs.load_record(resource_dest)
+    if (
+        record is None
+        or record.resource_type != resource_type.value
+        or record.source != provider.spec()
+        or record.filters != file_filter.to_dict()
+        or not record.files
+        or integrity.verify_install(resource_dest, record.files)
+    ):
+        return None
+    return record
+
+
+def _delta_update(
+    provider: "SourceProvider",
+    member: str,
+    base: installs.InstallRecord,
+    staged: Path,
+    file_filter: filters.FileFilter,
+    files: dict[str, str],
+) -> bool:
+    """
+    Stage a copy of base's install updated with just the source's changes.
+
+    Unchanged files are linked from the install and keep their recorded
+    digests; files holds the digests of the rest, as written.
+
+    Returns:
+        False, with nothing staged, if the source can't list its changes
+    """
+    link_resource(Path(base.path), staged, True)
+    if provider.update_members(member, staged, base.validators, file_filter):
+        installed = _tree_files(staged)
+        if all(path in files or path in base.files for path in installed):
+            for path in installed:
+                files.setdefault(path, base.files.get(path))
+            return True
+    _remove_existing(staged)
+    files.clear()
+    return False
+
+
+def install_from_provider(
+    provider: "SourceProvider",
+    name: str | None,
+    dest: Path | list[Path],
+    resource_type: ResourceType,
+    overwrite: bool = True,
+    expected_sha256: str | None = None,
+    record: bool = True,
+    file_filter: filters.FileFilter | None = None,
+) -> Path | list[Path]:
+    """
+    Locate a resource through a source provider and install it to dest.
+
+    See `sync_from_provider`, which also reports whether anything changed.
+
+    Returns:
+        Path to the installed resource, or one path per destination when
+        dest is a list
+    """
+    resource_dests, _ = sync_from_provider(
+        provider, name, dest, resource_type, overwrite, expected_sha256, record, file_filter
+    )
+    return resource_dests[0] if isinstance(dest, Path) else resource_dests
+
+
+def sync_from_provider(
+    provider: "SourceProvider",
+    name: str | None,
+    dest: Path | list[Path],
+    resource_type: ResourceType,
+    overwrite: bool = True,
+    expected_sha256: str | None = None,
+    record: bool = True,
+    file_filter: filters.FileFilter | None = None,
+) -> tuple[list[Path], bool]:
+    """
+    Locate a resource through a source provider and install it to dest.
+
+    Providers that can list their tree are searched by listing and only
+    the resource's own members are written. Others are materialized into
+    a temporary directory (limited to the candidate paths where the
+    provider supports it) and searched there.
+
+    With a list of destinations the resource is fetched once, written to
+    the first destination and linked into the others (see `fan_out`).
+
+    The first destination is replaced atomically, and left untouched when
+    the fetched copy is identical (see `replace_if_changed`). Files are
+    hashed as they are written; the resource digest is checked against
+    expected_sha256 before anything is replaced, and successful installs
+    are recorded with their digests for `watch` and `verify` (unless
+    record is False, e.g. for scratch copies).
+
+    Files of directory resources are filtered by file_filter combined
+    with the source's configured filter (see `filters`); filtered files
+    are never written, and the combined filter is recorded.
+
+    Where the provider supports delta updates, an intact directory install
+    from the same source is updated with only the files changed since the
+    recorded version (see `SourceProvider.update_members`), falling back to
+    a full fetch when the source can't tell what changed.
+
+    Returns:
+        The installed resource paths (one per destination) and whether the
+        first one changed
+
+    Raises:
+        ResourceNotFoundError: If the resource doesn't exist in the source
+        ResourceExistsError: If resource exists locally and overwrite=False
+        IntegrityError: If the resource doesn't match expected_sha256
+    """
+    from agent_skills_upd.providers import LocalDirProvider
+
+    config = RESOURCE_CONFIGS[resource_type]
+    dests = [dest] if isinstance(dest, Path) else _unique_paths(list(dest))
+    if not dests:
+        raise SkillUpdError("No destination given.")
+    file_filter = filters.source_filter(provider.spec()).merged(file_filter)
+
+    if name is not None:
+        # Fail before downloading anything.
+        for target in dests:
+            _check_overwrite(
+                _resource_path(target, resource_type, name), resource_type, name, overwrite
             )
 
-            if validation["suggestions"]:
-                error_msg += "\nRepository structure issues:\n"
-                error_msg += "\n".join([f"- {msg}" for msg in validation["suggestions"]])
-                error_msg += "\n"
-            elif validation["patterns_found"]:
-                error_msg += (
-                    f"\nFound directories: {', '.join(validation['patterns_found'])}\n"
+    with tempfile.TemporaryDirectory() as tmp_dir, ExitStack() as stack:
+        stack.callback(provider.close)
+        stack.enter_context(negative.guard(provider.spec(), resource_type.value, name))
+        source = provider
+        if not provider.capabilities.tree_listing:
+            cone_paths = sparse_cone_paths(resource_type, name)
+            # Cone paths of directory resources are the resource itself.
+            tree_filter = file_filter if config.is_directory and file_filter else None
+            repo_dir = stack.enter_context(
+                provider.open_tree(cone_paths, Path(tmp_dir), tree_filter)
+            )
+            source = LocalDirProvider(repo_dir, repo=provider.repo)
+
+        # Find the resource using pattern-based search
+        with tracing.span("find"):
+            member, name, root_skill_message = locate_member(source, resource_type, name)
+        if member is None:
+            raise _resource_not_found(
+                provider, source, resource_type, name, root_skill_message
+            )
+        if name is None:
+            raise SkillUpdError("Skill name could not be determined.")
+
+        resource_dests = [_resource_path(target, resource_type, name) for target in dests]
+
+        # Concurrent installs of the same resource take turns replacing it.
+        with locks.locked_all(resource_dests):
+            for resource_dest in resource_dests:
+                _check_overwrite(resource_dest, resource_type, name, overwrite)
+            base = _delta_base(provider, resource_dests[0], resource_type, file_filter)
+
+            def write(staged: Path) -> None:
+                with integrity.hashing(staged) as files:
+                    if base is None or not _delta_update(
+                        source, member, base, staged, file_filter, files
+                    ):
+                        source.fetch_members(member, staged, config.is_directory, file_filter)
+                digests.update(files)
+                integrity.check_digest(
+                    integrity.resource_digest(files),
+                    expected_sha256,
+                    f"{resource_type.value} '{name}'",
                 )
 
-            if root_skill_message:
-                error_msg += "\nManual repo override check:\n"
-                error_msg += f"- {root_skill_message}\n"
-
-            error_msg += (
-                "\nQuick fixes:\n"
-                "- Double-check the resource name\n"
-                "- Try --repo REPO_NAME if using a different repository\n"
-                "- Try --dest PATH for custom installation location\n"
-                f"- Visit https://{host}/{username}/{repo} to verify the resource exists"
+            digests: dict[str, str] = {}
+            changed = replace_if_changed(resource_dests[0], config.is_directory, write)
+            fan_out(resource_dests[0], resource_dests[1:], config.is_directory)
+
+        if record:
+            installs.record_install(
+                resource_dests,
+                resource_type.value,
+                name,
+                provider.spec(),
+                provider.validators(),
+                digests,
+                file_filter.to_dict(),
             )
 
-            raise ResourceNotFoundError(error_msg)
+    return resource_dests, changed
 
-        if resource_dest is None:
-            if name is None:
-                raise SkillUpdError("Skill name could not be determined.")
-            if config.is_directory:
-                resource_dest = dest / name
-            else:
-                resource_dest = dest / f"{name}{config.file_extension}"
 
-            if resource_dest.exists() and not overwrite:
-                raise ResourceExistsError(
-                    f"{resource_type.value.capitalize()} '{name}' already exists at {resource_dest}\n"
-                    f"Use --overwrite to replace it."
-                )
+def remove_resource(name: str, dests: list[Path], resource_type: ResourceType) -> list[Path]:
+    """
+    Remove an installed resource from each destination and the registry.
 
-        # Remove existing if overwriting
-        if resource_dest.exists():
-            if config.is_directory:
-                shutil.rmtree(resource_dest)
-            else:
-                resource_dest.unlink()
+    Args:
+        name: Resource name
+        dests: Destination directories, as for installs
+        resource_type: Type of resource
 
-        # Ensure destination parent exists
-        dest.mkdir(parents=True, exist_ok=True)
+    Returns:
+        The removed resource paths
 
-        # Copy resource to destination
-        if config.is_directory:
-            shutil.copytree(str(resource_source), str(resource_dest))
-        else:
-            shutil.copy2(str(resource_source), str(resource_dest))
+    Raises:
+        ResourceNotFoundError: If no destination holds the resource
+    """
+    resource_dests = [
+        _resource_path(target, resource_type, name) for target in _unique_paths(dests)
+    ]
+    removed: list[Path] = []
+    with locks.locked_all(resource_dests):
+        for resource_dest in resource_dests:
+            if resource_dest.exists() or resource_dest.is_symlink():
+                _remove_existing(resource_dest)
+                removed.append(resource_dest)
+        installs.forget(resource_dests)
+    if not removed:
+        locations = ", ".join(str(path) for path in resource_dests)
+        raise ResourceNotFoundError(
+            f"{resource_type.value.capitalize()} '{name}' is not installed at {locations}"
+        )
+    return removed
+
+
+@metrics.instrument_install("archive")
+def fetch_resource(
+    username: str,
+    name: str | None,
+    dest: Path | list[Path],
+    resource_type: ResourceType,
+    overwrite: bool = True,
+    host: str = "github.com",
+    repo: str = REPO_NAME,
+    backend: str = "archive",
+    expected_sha256: str | None = None,
+    file_filter: filters.FileFilter | None = None,
+) -> Path | list[Path]:
+    """
+    Fetch a resource from a user's agent-resources repo and copy it to dest.
+
+    Args:
+        username: GitHub (or alternative Git host) username
+        name: Name of the resource to fetch (optional for root-level skills)
+        dest: Destination directory (e.g., .claude/skills/, .claude/commands/),
+            or a list of them to install the same fetch into each
+        resource_type: Type of resource (SKILL, COMMAND, or AGENT)
+        overwrite: Whether to overwrite existing resource
+        host: Repository host (default: github.com)
+        repo: Repository name (default: agent-resources)
+        backend: "archive" downloads the branch tarball; "git" uses a cached
+            blobless clone and checks out only the resource path
+        expected_sha256: Resource digest to verify before installing
+        file_filter: Which files of a skill to install (see `filters`)
+
+    Returns:
+        Path to the installed resource (a list when dest is a list)
+
+    Raises:
+        RepoNotFoundError: If the agent-resources repo doesn't exist
+        ResourceNotFoundError: If the resource doesn't exist in the repo
+        ResourceExistsError: If resource exists locally and overwrite=False
+    """
+    from agent_skills_upd.providers import get_repo_provider
 
-    return resource_dest
+    provider = get_repo_provider(host, username, repo, backend)
+    return install_from_provider(
+        provider, name, dest, resource_type, overwrite, expected_sha256, file_filter=file_filter
+    )
 
 
+@metrics.instrument_install("local")
+def fetch_local_resource(
+    source: Path,
+    name: str | None,
+    dest: Path | list[Path],
+    resource_type: ResourceType,
+    overwrite: bool = True,
+    expected_sha256: str | None = None,
+    file_filter: filters.FileFilter | None = None,
+) -> Path | list[Path]:
+    """
+    Install a resource from a local working tree or .tar.gz/.zip archive.
+
+    Files are read in place; nothing is copied to a temporary directory.
+
+    Args:
+        source: Directory or archive laid out like an agent-resources repo
+        name: Name of the resource (optional for root-level skills)
+        dest: Destination directory, or a list of them
+        resource_type: Type of resource (SKILL, COMMAND, or AGENT)
+        overwrite: Whether to overwrite existing resource
+        expected_sha256: Resource digest to verify before installing
+        file_filter: Which files of a skill to install (see `filters`)
+
+    Returns:
+        Path to the installed resource (a list when dest is a list)
+
+    Raises:
+        RepoNotFoundError: If the source path doesn't exist
+        ResourceNotFoundError: If the resource doesn't exist in the source
+        ResourceExistsError: If resource exists locally and overwrite=False
+    """
+    from agent_skills_upd.providers import get_local_provider
+
+    provider = get_local_provider(source)
+    return install_from_provider(
+        provider, name, dest, resource_type, overwrite, expected_sha256, file_filter=file_filter
+    )
+
+
+@metrics.instrument_install("clawdhub")
 def fetch_clawdhub_skill(
     name: str,
-    dest: Path,
+    dest: Path | list[Path],
     overwrite: bool = True,
+    expected_sha256: str | None = None,
+    record: bool = True,
+    speculative: bool | None = None,
+    file_filter: filters.FileFilter | None = None,
 ) -> ClawdhubFetchResult:
     """
     Fetch a skill from Clawdhub via the API and copy it to dest.
 
     Args:
         name: Clawdhub skill slug (no username)
-        dest: Destination directory (e.g., .claude/skills/)
+        dest: Destination directory (e.g., .claude/skills/), or several;
+            the skill is downloaded once and linked into the others
         overwrite: Whether to overwrite existing resource
+        expected_sha256: Skill digest to verify before installing (the
+            digest covers the published files, not the SKILL.json we add)
+        record: Whether to record the install for `watch` and `verify`
+        speculative: Whether a first install requests the metadata and the
+            package at once (see `ClawdhubProvider.fetch_package`); None
+            reads AGENT_SKILLS_UPD_CLAWDHUB_SPECULATIVE
+        file_filter: Which files of the skill to install, on top of the
+            configured filter (see `filters`)
 
     Returns:
-        ClawdhubFetchResult with install path and version info.
+        ClawdhubFetchResult with the (first) install path and version info.
     """
-    resource_dest = dest / name
+    import httpx
+
+    from agent_skills_upd.providers import ClawdhubProvider
+
+    dests = [dest] if isinstance(dest, Path) else _unique_paths(list(dest))
+    resource_dests = [target / name for target in dests]
+    resource_dest = resource_dests[0]
     was_existing = resource_dest.exists()
     old_version = read_clawdhub_version(resource_dest) if was_existing else None
 
-    if was_existing and not overwrite:
-        raise ResourceExistsError(
-            f"Skill '{name}' already exists at {resource_dest}\n"
-            f"Use --overwrite to replace it."
-        )
+    if not overwrite:
+        for target in resource_dests:
+            _check_overwrite(target, ResourceType.SKILL, name, overwrite)
 
-    try:
-        with httpx.Client(follow_redirects=True, timeout=30.0) as client:
-            metadata_response = client.get(CLAWDHUB_METADATA_URL, params={"slug": name})
-            if metadata_response.status_code == 404:
-                raise ResourceNotFoundError(
-                    f"Skill '{name}' not found on {CLAWDHUB_HOST}."
-                )
-            metadata_response.raise_for_status()
-            try:
-                metadata = metadata_response.json()
-            except ValueError as exc:
-                raise SkillUpdError("Clawdhub metadata response was not valid JSON.") from exc
-
-            new_version = parse_clawdhub_version(metadata)
-            if not new_version:
-                raise SkillUpdError(
-                    "Clawdhub metadata missing latestVersion.version."
-                )
+    if speculative is None:
+        speculative = os.environ.get(CLAWDHUB_SPECULATIVE_ENV, "") not in ("", "0")
 
-            download_response = client.get(
-                CLAWDHUB_DOWNLOAD_URL, params={"slug": name, "tag": "latest"}
+    provider = ClawdhubProvider(name)
+    file_filter = filters.source_filter(provider.spec()).merged(file_filter)
+    known_misses = negative.guard(provider.spec(), ResourceType.SKILL.value, name)
+    try:
+        with known_misses, http_client() as client:
+            # Only first installs speculate: an install that is still current finds its
+            # package cached, which is what cancels a speculative download.
+            metadata, new_version, archive_bytes = provider.fetch_package(
+                client, speculative and not was_existing
             )
-            if download_response.status_code == 404:
-                raise ResourceNotFoundError(
-                    f"Skill '{name}' not found on {CLAWDHUB_HOST}."
-                )
-            download_response.raise_for_status()
-            archive_bytes = download_response.content
     except httpx.HTTPStatusError as exc:
+        metrics.HTTP_ERRORS.inc(host=CLAWDHUB_HOST, status=exc.response.status_code)
         raise SkillUpdError(f"Failed to download Clawdhub skill: {exc}") from exc
     except httpx.RequestError as exc:
+        metrics.HTTP_ERRORS.inc(host=CLAWDHUB_HOST, status="network")
         raise SkillUpdError(f"Network error: {exc}") from exc
 
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        tmp_path = Path(tmp_dir)
-        extract_path = tmp_path / "extracted"
-        extract_path.mkdir(parents=True, exist_ok=True)
-        extract_archive(archive_bytes, extract_path)
-
-        archive_root = select_archive_root(extract_path)
+    with tempfile.TemporaryDirectory() as tmp_dir, ClawdhubProvider.extract(
+        archive_bytes, Path(tmp_dir)
+    ) as archive_root:
         root_skill_file = find_root_skill_file(archive_root)
         if root_skill_file is None:
             raise SkillUpdError("Root SKILL.md not found in Clawdhub archive.")
@@ -495,15 +1467,39 @@ def fetch_clawdhub_skill(
                 f"'{root_skill_name}' does not match requested '{name}'."
             )
 
-        if resource_dest.exists():
-            if resource_dest.is_dir():
-                shutil.rmtree(resource_dest)
-            else:
-                resource_dest.unlink()
+        def write(staged: Path) -> None:
+            with integrity.hashing(staged) as files:
+                copy_resource(
+                    archive_root,
+                    staged,
+                    is_directory=True,
+                    ignore=file_filter.ignore(archive_root) if file_filter else None,
+                )
+            digests.update(files)
+            integrity.check_digest(
+                integrity.resource_digest(files), expected_sha256, f"skill '{name}'"
+            )
+            write_clawdhub_metadata(staged, metadata)
+            digests[CLAWDHUB_METADATA_FILENAME] = integrity.hash_file(
+                staged / CLAWDHUB_METADATA_FILENAME
+            )
 
-        dest.mkdir(parents=True, exist_ok=True)
-        shutil.copytree(str(archive_root), str(resource_dest))
-        write_clawdhub_metadata(resource_dest, metadata)
+        digests: dict[str, str] = {}
+
+        with locks.locked_all(resource_dests):
+            replace_if_changed(resource_dest, True, write)
+            fan_out(resource_dest, resource_dests[1:], is_directory=True)
+
+    if record:
+        installs.record_install(
+            resource_dests,
+            ResourceType.SKILL.value,
+            name,
+            provider.spec(),
+            {"version": new_version},
+            digests,
+            file_filter.to_dict(),
+        )
 
     return ClawdhubFetchResult(
         path=resource_dest,
@@ -0,0 +1,190 @@
+"""Include/exclude and size filters for the files of an installed skill.
+
+Filters come from the command line (`add --include/--exclude/--max-file-size`)
+and from the `sources` section of the user config, keyed by source ref
+(glob patterns allowed):
+
+    sources:
+      github.com/acme/agent-resources:
+        exclude: ["examples", "*.mp4"]
+        max_file_size: 1M
+
+Patterns work like .gitignore entries: a pattern without a slash matches a
+file or directory name at any depth, one with a slash matches a path from
+the skill's root, and a matched directory covers everything inside it.
+With include patterns, only matching files are kept; include patterns
+given on the command line replace the configured ones. The skill's own
+SKILL.md is always kept. Filters are applied as the source is read: the
+git backend never fetches the blobs of excluded paths (a size cap needs
+the blob), and branch archives, which are downloaded whole, skip filtered
+files when extracted. The filters used are recorded with the install so
+`watch` reapplies them.
+"""
+
+import os
+from dataclasses import dataclass
+from fnmatch import fnmatchcase
+from pathlib import Path
+from typing import Callable
+
+from agent_skills_upd.exceptions import SkillUpdError
+
+# Kept whatever the filters say: a skill isn't a skill without it.
+ALWAYS_KEPT = "SKILL.md"
+
+
+def _matches(path: str, patterns: tuple[str, ...]) -> bool:
+    parts = path.split("/")
+    prefixes = ["/".join(parts[: index + 1]) for index in range(len(parts))]
+    for pattern in patterns:
+        pattern = pattern.strip("/")
+        candidates = prefixes if "/" in pattern else parts
+        if any(fnmatchcase(candidate, pattern) for candidate in candidates):
+            return True
+    return False
+
+
+@dataclass(frozen=True)
+class FileFilter:
+    """Which files of a skill to install."""
+
+    include: tuple[str, ...] = ()
+    exclude: tuple[str, ...] = ()
+    max_file_size: int | None = None
+
+    def __bool__(self) -> bool:
+        return bool(self.include or self.exclude or self.max_file_size is not None)
+
+    def allows(self, path: str, size: int) -> bool:
+        """Return whether the file at path (relative to the skill root) is installed."""
+        if path == ALWAYS_KEPT:
+            return True
+        if self.max_file_size is not None and size > self.max_file_size:
+            return False
+        if _matches(path, self.exclude):
+            return False
+        return not self.include or _matches(path, self.include)
+
+    def allows_dir(self, path: str) -> bool:
+        """Return whether files under the directory at path can be installed."""
+        return not _matches(path, self.exclude)
+
+    def ignore(self, root: Path) -> Callable[[str, list[str]], set[str]]:
+        """Return a `shutil.copytree` ignore function applying the filter under root."""
+
+        def ignored(directory: str, names: list[str]) -> set[str]:
+            relative = Path(directory).relative_to(root).as_posix()
+            prefix = "" if relative == "." else f"{relative}/"
+            skipped = set()
+            for name in names:
+                full_path = os.path.join(directory, name)
+                if os.path.isdir(full_path):
+                    keep = self.allows_dir(prefix + name)
+                else:
+                    keep = self.allows(prefix + name, os.path.getsize(full_path))
+                if not keep:
+                    skipped.add(name)
+            return skipped
+
+        return ignored
+
+    def merged(self, other: "FileFilter | None") -> "FileFilter":
+        """
+        Combine with other, which is more specific (e.g. given on the command line).
+
+        Both sets of exclude patterns apply, with the smaller size cap, so
+        merging never widens the files installed. Include patterns are not
+        combined: other's, if it has any, replace these.
+        """
+        if not other:
+            return self
+        sizes = [size for size in (self.max_file_size, other.max_file_size) if size is not None]
+        return FileFilter(
+            include=other.include or self.include,
+            exclude=tuple(dict.fromkeys(self.exclude + other.exclude)),
+            max_file_size=min(sizes) if sizes else None,
+        )
+
+    def to_dict(self) -> dict:
+        """Return a JSON-able form (empty for no filtering) for `from_dict`."""
+        data: dict = {}
+        if self.include:
+            data["include"] = list(self.include)
+        if self.exclude:
+            data["exclude"] = list(self.exclude)
+        if self.max_file_size is not None:
+            data["max_file_size"] = self.max_file_size
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "FileFilter":
+        """
+        Build a filter from recorded or configured settings.
+
+        max_file_size may be a byte count or a size such as 500K.
+
+        Raises:
+            SkillUpdError: If the settings are malformed
+        """
+        if not isinstance(data, dict):
+            raise SkillUpdError(f"Invalid file filter: {data!r}")
+        return parse_file_filter(
+            _patterns(data.get("include")),
+            _patterns(data.get("exclude")),
+            data.get("max_file_size"),
+        )
+
+
+def _patterns(value) -> list[str]:
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, list) and all(isinstance(item, str) for item in value):
+        return value
+    raise SkillUpdError(f"Invalid filter patterns: {value!r}. Expected a list of globs.")
+
+
+def parse_file_filter(
+    include: list[str] | None = None,
+    exclude: list[str] | None = None,
+    max_file_size: str | int | None = None,
+) -> FileFilter:
+    """
+    Build a filter from command-line style values.
+
+    Raises:
+        SkillUpdError: If max_file_size can't be parsed
+    """
+    from agent_skills_upd.cache_index import parse_size
+
+    if isinstance(max_file_size, str):
+        max_file_size = parse_size(max_file_size) if max_file_size.strip() else None
+    elif max_file_size is not None and not isinstance(max_file_size, int):
+        raise SkillUpdError(f"Invalid max_file_size: {max_file_size!r}")
+    return FileFilter(
+        include=tuple(pattern for pattern in include or () if pattern.strip()),
+        exclude=tuple(pattern for pattern in exclude or () if pattern.strip()),
+        max_file_size=max_file_size,
+    )
+
+
+def source_filter(source: dict) -> FileFilter:
+    """
+    Return the configured filter for a source spec, merging every matching entry.
+
+    Raises:
+        SkillUpdError: If a matching config entry is malformed
+    """
+    from agent_skills_upd.config import load_user_config
+    from agent_skills_upd.installs import describe_source
+
+    sources = load_user_config().get("sources")
+    if not isinstance(sources, dict):
+        return FileFilter()
+    ref = describe_source(source)
+    result = FileFilter()
+    for pattern, settings in sources.items():
+        if ref and fnmatchcase(ref, str(pattern)):
+            result = result.merged(FileFilter.from_dict(settings or {}))
+    return result
@@ -0,0 +1,379 @@
+"""Git partial-clone + sparse-checkout fetch backend.
+
+Instead of downloading the whole repository archive, the backend keeps a
+persistent bare, blobless (`--filter=blob:none`), shallow clone per repo
+in the cache directory. Installing a resource adds a temporary worktree
+whose sparse-checkout cone covers only the candidate resource paths, so
+git fetches just the blobs under those paths. Later installs from the
+same repo run an incremental `git fetch` instead of a fresh clone.
+The tree listing is available without any blobs, so resources are
+located before anything is checked out, and the files changed between an
+installed commit and the new head are listed the same way, so updates
+fetch only those blobs.
+"""
+
+import os
+import shutil
+import subprocess
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Iterator
+
+from agent_skills_upd import cache_index, locks, tracing
+from agent_skills_upd.cache import GIT_CACHE_SUBDIR, get_cache_dir, safe_host
+from agent_skills_upd.exceptions import RepoNotFoundError, SkillUpdError
+
+
+# stderr fragments git prints when the remote repository does not exist.
+_NOT_FOUND_MARKERS = (
+    "not found",
+    "does not exist",
+    "does not appear to be a git repository",
+    # GitHub asks for credentials instead of answering 404 for missing repos.
+    "could not read username",
+)
+
+
+# Tree entry modes of regular files; anything else (symlinks, submodules)
+# is left to a full checkout.
+REGULAR_FILE_MODES = ("100644", "100755")
+
+
+class _GitCommandError(SkillUpdError):
+    """A git invocation exited non-zero."""
+
+    def __init__(self, args: list[str], stderr: str):
+        super().__init__(f"git {' '.join(args[:2])} failed: {stderr}")
+        self.stderr = stderr
+
+
+def build_clone_url(host: str, username: str, repo: str) -> str:
+    """Build the clone URL; host may carry an explicit scheme (e.g. file://)."""
+    base = host.rstrip("/") if "://" in host else f"https://{host}"
+    return f"{base}/{username}/{repo}.git"
+
+
+def get_bare_repo_path(host: str, username: str, repo: str) -> Path:
+    """Return the persistent bare clone location for a repo."""
+    return get_cache_dir() / GIT_CACHE_SUBDIR / safe_host(host) / username / f"{repo}.git"
+
+
+def run_git(args: list[str], cwd: Path | None = None, input: str | None = None) -> str:
+    """Run git and return stdout, raising SkillUpdError on failure."""
+    try:
+        result = subprocess.run(
+            ["git", *args],
+            cwd=cwd,
+            input=input,
+            capture_output=True,
+            text=True,
+            # Never block on credential prompts inside a CLI/daemon run.
+            env={**os.environ, "GIT_TERMINAL_PROMPT": "0"},
+        )
+    except FileNotFoundError as exc:
+        raise SkillUpdError("git executable not found; install git or use --backend archive.") from exc
+    if result.returncode != 0:
+        raise _GitCommandError(args, result.stderr.strip())
+    return result.stdout
+
+
+def _fetched_since(bare_path: Path, timestamp: float) -> bool:
+    """Return True if the bare repo was cloned or fetched at or after `timestamp`."""
+    marker = bare_path / "FETCH_HEAD"
+    if not marker.exists():
+        marker = bare_path / "HEAD"
+    return marker.stat().st_mtime >= timestamp
+
+
+def sync_bare_repo(host: str, username: str, repo: str) -> tuple[Path, str]:
+    """
+    Clone or incrementally update the bare repo and return (path, head commit).
+
+    Runs under a per-repo lock; a process that waited while another one
+    cloned or fetched the same repo reuses that result instead of fetching.
+
+    Raises:
+        RepoNotFoundError: If the remote repository doesn't exist
+    """
+    bare_path = get_bare_repo_path(host, username, repo)
+    url = build_clone_url(host, username, repo)
+    lock_path = bare_path.with_name(f"{bare_path.name}.lock")
+    with locks.file_lock(lock_path) as requested_at:
+        try:
+            result = "hit"
+            if not (bare_path / "HEAD").exists():
+                result = "miss"
+                with tracing.span("git.clone", url=url):
+                    bare_path.parent.mkdir(parents=True, exist_ok=True)
+                    run_git(
+                        [
+                            "clone",
+                            "--bare",
+                            "--filter=blob:none",
+                            "--depth",
+                            "1",
+                            "--quiet",
+                            url,
+                            str(bare_path),
+                        ]
+                    )
+            elif not _fetched_since(bare_path, requested_at):
+                result = "revalidated"
+                with tracing.span("git.fetch", url=url):
+                    run_git(
+                        [
+                            "--git-dir",
+                            str(bare_path),
+                            "fetch",
+                            "--quiet",
+                            "--depth",
+                            "1",
+                            "--filter=blob:none",
+                            "origin",
+                            "HEAD",
+                        ]
+                    )
+            head = "FETCH_HEAD" if (bare_path / "FETCH_HEAD").exists() else "HEAD"
+            commit = run_git(["--git-dir", str(bare_path), "rev-parse", head])
+        except _GitCommandError as exc:
+            if any(marker in exc.stderr.lower() for marker in _NOT_FOUND_MARKERS):
+                shutil.rmtree(bare_path, ignore_errors=True)
+                raise RepoNotFoundError(
+                    f"Repository '{username}/{repo}' not found on {host}."
+                ) from exc
+            raise
+    cache_index.record_use(bare_path, "git", result)
+    return bare_path, commit.strip()
+
+
+def remote_head(host: str, username: str, repo: str) -> str:
+    """
+    Return the remote's HEAD commit without fetching anything else.
+
+    Raises:
+        RepoNotFoundError: If the remote repository doesn't exist
+    """
+    try:
+        output = run_git(["ls-remote", build_clone_url(host, username, repo), "HEAD"])
+    except _GitCommandError as exc:
+        if any(marker in exc.stderr.lower() for marker in _NOT_FOUND_MARKERS):
+            raise RepoNotFoundError(
+                f"Repository '{username}/{repo}' not found on {host}."
+            ) from exc
+        raise
+    return output.split()[0] if output.strip() else ""
+
+
+def sparse_checkout(
+    bare_path: Path, commit: str, worktree: Path, cone_paths: list[str] | None
+) -> None:
+    """
+    Check out `commit` into `worktree`, limited to `cone_paths`.
+
+    Cone mode always includes files at the repository root, which is what
+    root-level SKILL.md detection needs; an empty list checks out only
+    those. None checks out the whole tree.
+    """
+    git_dir = ["--git-dir", str(bare_path)]
+    run_git([*git_dir, "worktree", "add", "--detach", "--no-checkout", str(worktree), commit])
+    with tracing.span("git.checkout") as checkout_span:
+        if cone_paths is not None:
+            run_git(["sparse-checkout", "set", "--cone", *cone_paths], cwd=worktree)
+        # Populating the index in one step lets git batch-fetch missing blobs.
+        run_git(["read-tree", "-mu", "HEAD"], cwd=worktree)
+        checkout_span.set(files=_count_files(worktree))
+
+
+def remove_worktree(bare_path: Path, worktree: Path) -> None:
+    """Drop a temporary worktree and its administrative files."""
+    try:
+        run_git(["--git-dir", str(bare_path), "worktree", "remove", "--force", str(worktree)])
+    except SkillUpdError:
+        shutil.rmtree(worktree, ignore_errors=True)
+        run_git(["--git-dir", str(bare_path), "worktree", "prune"])
+
+
+def list_files(bare_path: Path, commit: str) -> list[str]:
+    """List every file path in `commit`; needs only trees, not blobs."""
+    output = run_git(
+        ["--git-dir", str(bare_path), "ls-tree", "-r", "--name-only", "-z", commit]
+    )
+    return [path for path in output.split("\0") if path]
+
+
+def read_blob(bare_path: Path, commit: str, path: str) -> str:
+    """Read one file from `commit`, fetching just that blob if needed."""
+    return run_git(["--git-dir", str(bare_path), "cat-file", "blob", f"{commit}:{path}"])
+
+
+@dataclass(frozen=True)
+class FileChange:
+    """One file that differs between two commits."""
+
+    path: str
+    status: str  # "A", "M", "D" or "T" (type change)
+    mode: str  # mode in the new commit ("000000" once deleted)
+    blob: str  # blob in the new commit
+
+
+def ensure_commit(bare_path: Path, commit: str) -> bool:
+    """
+    Make sure `commit` and its trees are in the bare repo.
+
+    Shallow fetches usually leave earlier commits in place; if it's gone,
+    just that commit is fetched again, without history or blobs.
+
+    Returns:
+        False if the remote no longer has the commit (e.g. after a force push)
+    """
+    git_dir = ["--git-dir", str(bare_path)]
+    try:
+        # Unlike most commands, rev-list doesn't fetch missing objects on its own.
+        run_git([*git_dir, "rev-list", "--no-walk", "--missing=print", commit])
+        return True
+    except _GitCommandError:
+        pass
+    with locks.file_lock(bare_path.with_name(f"{bare_path.name}.lock")):
+        try:
+            with tracing.span("git.fetch", commit=commit):
+                run_git(
+                    [
+                        *git_dir,
+                        "fetch",
+                        "--quiet",
+                        "--no-tags",
+                        "--no-write-fetch-head",
+                        "--depth",
+                        "1",
+                        "--filter=blob:none",
+                        "origin",
+                        commit,
+                    ]
+                )
+        except _GitCommandError:
+            return False
+    return True
+
+
+def changed_files(bare_path: Path, old: str, new: str, path: str = "") -> list[FileChange]:
+    """
+    List the files under `path` that differ between two commits.
+
+    Only trees are compared, so no blobs are fetched. Renames are listed
+    as a deletion and an addition.
+    """
+    args = ["--git-dir", str(bare_path), "diff-tree", "-r", "-z", "--no-renames", old, new]
+    output = run_git([*args, "--", path] if path else args)
+    fields = output.split("\0")
+    changes = []
+    # Each change is ":<old mode> <new mode> <old blob> <new blob> <status>" then the path.
+    for header, changed_path in zip(fields[::2], fields[1::2]):
+        _, mode, _, blob, status = header.lstrip(":").split(" ")
+        changes.append(FileChange(changed_path, status, mode, blob))
+    return changes
+
+
+def tree_files(bare_path: Path, commit: str, path: str = "") -> list[FileChange]:
+    """
+    List the files under `path` in `commit`, as additions to an empty tree.
+
+    Only trees are read, so no blobs are fetched.
+    """
+    args = ["--git-dir", str(bare_path), "ls-tree", "-r", "-z", "--full-tree", commit]
+    output = run_git([*args, "--", path] if path else args)
+    files = []
+    # Each entry is "<mode> <type> <object>\t<path>".
+    for entry in output.split("\0"):
+        if entry:
+            header, _, file_path = entry.partition("\t")
+            mode, _, blob = header.split(" ")
+            files.append(FileChange(file_path, "A", mode, blob))
+    return files
+
+
+def fetch_blobs(bare_path: Path, blobs: list[str]) -> None:
+    """
+    Fetch missing blobs in one request.
+
+    Reading a missing blob would otherwise fetch it on its own, one round
+    trip per file. If the remote refuses to serve blobs by id, they are
+    still fetched that way when read.
+    """
+    if not blobs:
+        return
+    with tracing.span("git.fetch_blobs", blobs=len(blobs)):
+        try:
+            run_git(
+                [
+                    "--git-dir",
+                    str(bare_path),
+                    "-c",
+                    "fetch.negotiationAlgorithm=noop",
+                    "fetch",
+                    "--quiet",
+                    "--no-tags",
+                    "--no-write-fetch-head",
+                    "--recurse-submodules=no",
+                    "--filter=blob:none",
+                    "--stdin",
+                    "origin",
+                ],
+                input="".join(f"{blob}\n" for blob in blobs),
+            )
+        except _GitCommandError:
+            pass
+
+
+def blob_sizes(bare_path: Path, blobs: list[str]) -> dict[str, int]:
+    """Return the size of each blob (fetching any that are missing)."""
+    if not blobs:
+        return {}
+    output = run_git(
+        ["--git-dir", str(bare_path), "cat-file", "--batch-check=%(objectname) %(objectsize)"],
+        input="".join(f"{blob}\n" for blob in blobs),
+    )
+    sizes = {}
+    for line in output.splitlines():
+        blob, size = line.split(" ")
+        sizes[blob] = int(size)
+    return sizes
+
+
+@contextmanager
+def open_blob(bare_path: Path, blob: str) -> Iterator[IO[bytes]]:
+    """Yield a stream of one blob's content."""
+    process = subprocess.Popen(
+        ["git", "--git-dir", str(bare_path), "cat-file", "blob", blob],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        env={**os.environ, "GIT_TERMINAL_PROMPT": "0"},
+    )
+    try:
+        yield process.stdout
+    finally:
+        process.stdout.close()
+        stderr = process.stderr.read().decode("utf-8", "replace")
+        process.stderr.close()
+        returncode = process.wait()
+    if returncode != 0:
+        raise _GitCommandError(["cat-file", "blob"], stderr.strip())
+
+
+def _count_files(worktree: Path) -> int:
+    return sum(1 for path in worktree.rglob("*") if path.is_file() and path.name != ".git")
+
+
+@contextmanager
+def worktree(
+    bare_path: Path,
+    commit: str,
+    path: Path,
+    cone_paths: list[str] | None,
+) -> Iterator[Path]:
+    """Yield a temporary sparse worktree of `commit` at `path`."""
+    try:
+        sparse_checkout(bare_path, commit, path, cone_paths)
+        yield path
+    finally:
+        remove_worktree(bare_path, path)
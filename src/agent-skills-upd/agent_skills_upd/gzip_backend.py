@@ -0,0 +1,72 @@
+"""Pluggable gzip decompression for branch archives.
+
+Inflating large archives with the stdlib's zlib binding becomes the
+bottleneck once the download is done. When python-isal (ISA-L) or
+zlib-ng bindings are installed (`pip install agent-skills-upd[fast]`),
+archives are inflated with them instead; otherwise the stdlib is used.
+AGENT_SKILLS_UPD_GZIP_BACKEND picks one (isal, zlib-ng, stdlib or
+auto); a backend that isn't installed falls back to the stdlib.
+
+Decompressed data is read through a large buffer, so tarfile's small
+header and block reads don't each cross into the decompressor.
+"""
+
+import gzip
+import importlib
+import io
+import os
+import zlib
+from typing import IO
+
+GZIP_BACKEND_ENV = "AGENT_SKILLS_UPD_GZIP_BACKEND"
+# In order of preference for auto.
+BACKENDS = ("isal", "zlib-ng", "stdlib")
+READ_BUFFER_SIZE = 1024 * 1024
+
+# backend -> (module holding the gzip file class, class name, module with its error)
+_MODULES = {
+    "isal": ("isal.igzip", "IGzipFile", "isal.isal_zlib"),
+    "zlib-ng": ("zlib_ng.gzip_ng", "GzipNGFile", "zlib_ng.zlib_ng"),
+}
+
+# Resolved (backend, gzip file class, decompression errors), once per process.
+_resolved: dict[str, tuple[str, type, tuple[type[BaseException], ...]]] = {}
+
+_STDLIB_ERRORS: tuple[type[BaseException], ...] = (OSError, EOFError, zlib.error)
+
+
+def _load(name: str) -> tuple[str, type, tuple[type[BaseException], ...]] | None:
+    if name == "stdlib":
+        return "stdlib", gzip.GzipFile, _STDLIB_ERRORS
+    module_name, class_name, errors_module = _MODULES[name]
+    try:
+        gzip_class = getattr(importlib.import_module(module_name), class_name)
+        error = importlib.import_module(errors_module).error
+    except (ImportError, AttributeError):
+        return None
+    return name, gzip_class, (*_STDLIB_ERRORS, error)
+
+
+def _resolve() -> tuple[str, type, tuple[type[BaseException], ...]]:
+    requested = os.environ.get(GZIP_BACKEND_ENV, "auto").strip().lower() or "auto"
+    if requested not in _resolved:
+        candidates = BACKENDS if requested not in BACKENDS else (requested, "stdlib")
+        _resolved[requested] = next(
+            loaded for loaded in map(_load, candidates) if loaded is not None
+        )
+    return _resolved[requested]
+
+
+def backend_name() -> str:
+    """Return the backend archives are inflated with."""
+    return _resolve()[0]
+
+
+def decompress_errors() -> tuple[type[BaseException], ...]:
+    """Return the exceptions the active backend raises for corrupted data."""
+    return _resolve()[2]
+
+
+def open_gzip(fileobj: IO[bytes]) -> IO[bytes]:
+    """Return a buffered reader of the data decompressed from fileobj."""
+    return io.BufferedReader(_resolve()[1](fileobj=fileobj), buffer_size=READ_BUFFER_SIZE)
@@ -0,0 +1,123 @@
+"""Header-only frontmatter parsing.
+
+Resource files start with a YAML block between `---` lines. Only that
+block is read from disk, and simple `key: value` headers (the common
+case) are parsed without YAML. Anything fancier (nesting, lists, block
+or flow values, YAML keywords, escapes, ...) falls back to
+`yaml.safe_load`, so results match a full YAML parse.
+"""
+
+import re
+from pathlib import Path
+
+_FENCE = re.compile(r"^-{3,}\s*$")
+# Stop looking for the closing fence after this many bytes.
+MAX_HEADER_BYTES = 64 * 1024
+
+_KEY = re.compile(r"^([A-Za-z_][\w-]*)\s*:(?:\s+(.*))?$")
+_PLAIN = re.compile(r"^[A-Za-z_/][^#:]*$")
+# Plain scalars that YAML turns into booleans or null.
+_KEYWORDS = {"true", "false", "yes", "no", "on", "off", "y", "n", "null", "~"}
+
+
+class HeaderError(ValueError):
+    """Raised when a frontmatter block isn't valid YAML."""
+
+
+def split_header(content: str) -> str | None:
+    """
+    Return the frontmatter block of `content`, or None if there is none.
+
+    Raises:
+        HeaderError: If the opening fence is never closed
+    """
+    lines = content.lstrip("\ufeff").splitlines()
+    if not lines or not _FENCE.match(lines[0]):
+        return None
+    for index, line in enumerate(lines[1:], start=1):
+        if _FENCE.match(line):
+            return "\n".join(lines[1:index])
+    raise HeaderError("Frontmatter is not closed with '---'.")
+
+
+def read_header(path: Path) -> str | None:
+    """
+    Read just the frontmatter block of a file.
+
+    Raises:
+        HeaderError: If the block isn't closed within MAX_HEADER_BYTES
+        OSError: If the file can't be read
+    """
+    lines: list[str] = []
+    size = 0
+    with path.open(encoding="utf-8") as handle:
+        first = handle.readline()
+        if not _FENCE.match(first.lstrip("\ufeff")):
+            return None
+        for line in handle:
+            if _FENCE.match(line):
+                return "".join(lines)
+            lines.append(line)
+            size += len(line)
+            if size > MAX_HEADER_BYTES:
+                break
+    raise HeaderError("Frontmatter is not closed with '---'.")
+
+
+def _plain_value(raw: str) -> str | None:
+    """Return the string value of a simple scalar, or None if YAML is needed."""
+    value = raw.strip()
+    inner = value[1:-1]
+    if len(value) >= 2 and value[0] == value[-1] == "'" and "'" not in inner.replace("''", ""):
+        return inner.replace("''", "'")
+    if len(value) >= 2 and value[0] == value[-1] == '"' and not re.search(r'["\\]', inner):
+        return inner
+    if _PLAIN.match(value) and value.lower() not in _KEYWORDS:
+        return value.rstrip()
+    return None
+
+
+def parse_header(header: str) -> dict:
+    """
+    Parse a frontmatter block into a dict.
+
+    Raises:
+        HeaderError: If the block isn't valid YAML or isn't a mapping
+    """
+    metadata: dict = {}
+    for line in header.splitlines():
+        stripped = line.strip()
+        if not stripped or stripped.startswith("#"):
+            continue
+        match = _KEY.match(line)
+        value = _plain_value(match.group(2) or "") if match and match.group(2) else None
+        if value is None or match.group(1) in metadata or match.group(1).lower() in _KEYWORDS:
+            return _parse_yaml(header)
+        metadata[match.group(1)] = value
+    return metadata
+
+
+def _parse_yaml(header: str) -> dict:
+    import yaml
+
+    try:
+        metadata = yaml.safe_load(header)
+    except yaml.YAMLError as exc:
+        raise HeaderError(f"Invalid YAML in frontmatter: {exc}") from exc
+    if metadata is None:
+        return {}
+    if not isinstance(metadata, dict):
+        raise HeaderError("Frontmatter is not a mapping.")
+    return metadata
+
+
+def read_metadata(path: Path) -> dict:
+    """Return a file's frontmatter as a dict ({} if it has none)."""
+    header = read_header(path)
+    return parse_header(header) if header is not None else {}
+
+
+def metadata_from_text(content: str) -> dict:
+    """Return the frontmatter of file content as a dict ({} if it has none)."""
+    header = split_header(content)
+    return parse_header(header) if header is not None else {}
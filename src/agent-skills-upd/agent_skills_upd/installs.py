@@ -0,0 +1,252 @@
+"""Registry of installed resources and where they came from.
+
+Every successful install stores the source spec (enough to rebuild its
+provider), a readable source ref and version, the source validators
+(ETag/content hash, commit, version, ...) and the SHA-256 of every
+installed file, keyed by install path. `list`, `which` and `remove` query
+it instead of walking environment directories; `watch` uses it to
+revalidate installed resources and `verify` to check installed files.
+
+Records live in one SQLite database per user, in the cache directory, and
+cover project and user-scope installs alike. Every write is a
+transaction, so concurrent installs never lose each other's records.
+"""
+
+import json
+import sqlite3
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+
+from agent_skills_upd import db
+from agent_skills_upd.cache import get_cache_dir
+from agent_skills_upd.integrity import resource_digest
+
+INSTALLS_DB = "installs.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS installs (
+    path TEXT PRIMARY KEY,
+    resource_type TEXT NOT NULL,
+    name TEXT NOT NULL,
+    source TEXT NOT NULL,
+    ref TEXT NOT NULL DEFAULT '',
+    version TEXT NOT NULL DEFAULT '',
+    validators TEXT NOT NULL DEFAULT '{}',
+    sha256 TEXT NOT NULL DEFAULT '',
+    files TEXT NOT NULL DEFAULT '{}',
+    filters TEXT NOT NULL DEFAULT '{}',
+    installed_at REAL NOT NULL DEFAULT 0,
+    checked_at REAL NOT NULL DEFAULT 0,
+    next_check REAL NOT NULL DEFAULT 0,
+    interval REAL NOT NULL DEFAULT 0,
+    failures INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS installs_by_name ON installs (name, resource_type);
+"""
+_JSON_COLUMNS = ("source", "validators", "files", "filters")
+
+
+@dataclass
+class InstallRecord:
+    """One installed resource."""
+
+    path: str
+    resource_type: str
+    name: str
+    source: dict
+    # Readable source and version, for list and which
+    ref: str = ""
+    version: str = ""
+    validators: dict = field(default_factory=dict)
+    # Resource digest and relative path -> sha256 ("" for a single file)
+    sha256: str = ""
+    files: dict = field(default_factory=dict)
+    # File filter the resource was installed with (see `filters.FileFilter`)
+    filters: dict = field(default_factory=dict)
+    installed_at: float = 0.0
+    # Polling state maintained by watch
+    checked_at: float = 0.0
+    next_check: float = 0.0
+    interval: float = 0.0
+    failures: int = 0
+
+
+_COLUMNS = [item.name for item in fields(InstallRecord)]
+
+
+def describe_source(source: dict) -> str:
+    """Return a readable ref for a source spec."""
+    provider = source.get("provider")
+    if provider == "clawdhub":
+        return f"clawdhub.com/{source.get('slug', '')}"
+    if provider == "local":
+        return source.get("path", "")
+    if "host" in source:
+        return f"{source['host']}/{source.get('username', '')}/{source.get('repo', '')}"
+    return ""
+
+
+def describe_version(validators: dict) -> str:
+    """Return a short version label for source validators."""
+    if validators.get("version"):
+        return str(validators["version"])
+    if validators.get("commit"):
+        return validators["commit"][:12]
+    if validators.get("branch"):
+        sha256 = validators.get("sha256") or ""
+        return f"{validators['branch']}@{sha256[:12]}" if sha256 else validators["branch"]
+    return ""
+
+
+def _to_row(record: InstallRecord) -> tuple:
+    return tuple(
+        json.dumps(getattr(record, name), sort_keys=True)
+        if name in _JSON_COLUMNS
+        else getattr(record, name)
+        for name in _COLUMNS
+    )
+
+
+def _from_row(row: sqlite3.Row) -> InstallRecord:
+    # Columns left out of the query keep their defaults.
+    values = {name: row[name] for name in row.keys()}
+    for name in _JSON_COLUMNS:
+        if name in values:
+            values[name] = json.loads(values[name])
+    return InstallRecord(**values)
+
+
+def _put(conn: sqlite3.Connection, record: InstallRecord) -> None:
+    conn.execute(
+        f"INSERT OR REPLACE INTO installs ({', '.join(_COLUMNS)}) "
+        f"VALUES ({', '.join('?' for _ in _COLUMNS)})",
+        _to_row(record),
+    )
+
+
+@contextmanager
+def _connect() -> Iterator[sqlite3.Connection]:
+    with db.connect(get_cache_dir() / INSTALLS_DB, _SCHEMA) as conn:
+        yield conn
+
+
+def load_records(
+    resource_type: str | None = None,
+    name: str | None = None,
+    with_files: bool = True,
+) -> list[InstallRecord]:
+    """
+    Return install records, optionally filtered.
+
+    Args:
+        resource_type: Only this kind of resource ("skill", "command", "agent")
+        name: Only resources with this name
+        with_files: Also read each record's file digests, the bulk of a
+            record; without them, `files` is left empty
+
+    Returns:
+        Matching records, ordered by install path
+    """
+    clauses, params = [], []
+    for column, value in (("resource_type", resource_type), ("name", name)):
+        if value is not None:
+            clauses.append(f"{column} = ?")
+            params.append(value)
+    where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+    columns = "*" if with_files else ", ".join(name for name in _COLUMNS if name != "files")
+    with _connect() as conn:
+        rows = conn.execute(
+            f"SELECT {columns} FROM installs{where} ORDER BY path", params
+        ).fetchall()
+    return [_from_row(row) for row in rows]
+
+
+def load_record(path: Path) -> InstallRecord | None:
+    """Return the record of the install at path, if there is one."""
+    with _connect() as conn:
+        row = conn.execute(
+            "SELECT * FROM installs WHERE path = ?", (str(path.absolute()),)
+        ).fetchone()
+    return _from_row(row) if row is not None else None
+
+
+def record_install(
+    paths: list[Path],
+    resource_type: str,
+    name: str,
+    source: dict,
+    validators: dict,
+    files: dict[str, str] | None = None,
+    filters: dict | None = None,
+) -> None:
+    """Create or refresh the records of freshly installed paths."""
+    files = files or {}
+    sha256 = resource_digest(files) if files else ""
+    now = time.time()
+    try:
+        with _connect() as conn, db.transaction(conn):
+            for path in paths:
+                key = str(path.absolute())
+                record = InstallRecord(
+                    path=key,
+                    resource_type=resource_type,
+                    name=name,
+                    source=source,
+                    ref=describe_source(source),
+                    version=describe_version(validators),
+                    validators=validators,
+                    sha256=sha256,
+                    files=files,
+                    filters=filters or {},
+                    installed_at=now,
+                    checked_at=now,
+                )
+                previous = conn.execute(
+                    "SELECT source, interval FROM installs WHERE path = ?", (key,)
+                ).fetchone()
+                if previous is not None and json.loads(previous["source"]) == source:
+                    # Keep the learned polling interval across reinstalls.
+                    record.interval = previous["interval"]
+                _put(conn, record)
+    except (OSError, sqlite3.Error):
+        # Bookkeeping must never fail an install.
+        pass
+
+
+def update_records(updated: list[InstallRecord], removed: list[str] = ()) -> None:
+    """
+    Persist polling state, keeping records reinstalled meanwhile.
+
+    Only the polling columns are written, so records loaded without their
+    files can be passed.
+    """
+    with _connect() as conn, db.transaction(conn):
+        conn.executemany(
+            "UPDATE installs SET checked_at = ?, next_check = ?, interval = ?, failures = ? "
+            # Reinstalled since this record was read: keep the newer one.
+            "WHERE path = ? AND installed_at <= ?",
+            [
+                (
+                    record.checked_at,
+                    record.next_check,
+                    record.interval,
+                    record.failures,
+                    record.path,
+                    record.installed_at,
+                )
+                for record in updated
+            ],
+        )
+        conn.executemany("DELETE FROM installs WHERE path = ?", [(key,) for key in removed])
+
+
+def forget(paths: list[Path]) -> None:
+    """Drop the records of removed install paths."""
+    with _connect() as conn, db.transaction(conn):
+        conn.executemany(
+            "DELETE FROM installs WHERE path = ?",
+            [(str(path.absolute()),) for path in paths],
+        )
@@ -0,0 +1,158 @@
+"""SHA-256 digests of installed resources.
+
+While a `hashing()` block is active, `copy_file` and `copy_stream` hash
+each file as its bytes are written, so digests cost no extra pass over
+the data. A resource's digest is the SHA-256 of a single file, or for a
+directory the SHA-256 of its sorted `<sha256>  <path>` manifest lines
+(the format `sha256sum` prints), so it is independent of file order and
+timestamps.
+"""
+
+import hashlib
+import shutil
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import IO, Iterator
+
+from agent_skills_upd.exceptions import IntegrityError
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# (root being written, relative path -> sha256) for the current install
+_active: ContextVar[tuple[Path, dict[str, str]] | None] = ContextVar(
+    "integrity_active", default=None
+)
+
+
+@contextmanager
+def hashing(root: Path) -> Iterator[dict[str, str]]:
+    """
+    Record the digest of every file written below `root` inside the block.
+
+    Yields:
+        Mapping of path relative to root ("" when root is a file) to sha256
+    """
+    files: dict[str, str] = {}
+    token = _active.set((root, files))
+    try:
+        yield files
+    finally:
+        _active.reset(token)
+
+
+def _relative_key(target: Path) -> str | None:
+    active = _active.get()
+    if active is None:
+        return None
+    root, _ = active
+    if target == root:
+        return ""
+    try:
+        return target.relative_to(root).as_posix()
+    except ValueError:
+        return None
+
+
+def copy_stream(source: IO[bytes], target: Path) -> int:
+    """Write a stream to target, hashing it on the way when recording."""
+    key = _relative_key(target)
+    if key is None:
+        with target.open("wb") as handle:
+            shutil.copyfileobj(source, handle, HASH_CHUNK_SIZE)
+            return handle.tell()
+
+    digest = hashlib.sha256()
+    size = 0
+    with target.open("wb") as handle:
+        while chunk := source.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+            handle.write(chunk)
+            size += len(chunk)
+    _active.get()[1][key] = digest.hexdigest()
+    return size
+
+
+def copy_file(src: str, dst: str) -> str:
+    """Drop-in for shutil.copy2 that hashes while copying when recording."""
+    if _relative_key(Path(dst)) is None:
+        return shutil.copy2(src, dst)
+    with open(src, "rb") as source:
+        copy_stream(source, Path(dst))
+    shutil.copystat(src, dst)
+    return dst
+
+
+def hash_file(path: Path) -> str:
+    """Return the sha256 of a file on disk."""
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        while chunk := handle.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_resource(path: Path, is_directory: bool) -> dict[str, str]:
+    """Hash an installed resource from disk (used to verify it later)."""
+    if not is_directory:
+        return {"": hash_file(path)}
+    return {
+        item.relative_to(path).as_posix(): hash_file(item)
+        for item in sorted(path.rglob("*"))
+        if item.is_file()
+    }
+
+
+def resource_digest(files: dict[str, str]) -> str:
+    """Combine per-file digests into the resource digest."""
+    if set(files) == {""}:
+        return files[""]
+    manifest = "".join(f"{files[name]}  {name}\n" for name in sorted(files))
+    return hashlib.sha256(manifest.encode("utf-8")).hexdigest()
+
+
+def check_digest(digest: str, expected: str | None, label: str) -> None:
+    """
+    Compare a resource digest with an expected one, if there is one.
+
+    Raises:
+        IntegrityError: If they differ
+    """
+    if expected is None:
+        return
+    expected = expected.lower().removeprefix("sha256:")
+    if digest != expected:
+        raise IntegrityError(
+            f"Integrity check failed for {label}: expected sha256 {expected}, got {digest}."
+        )
+
+
+def diff_files(expected: dict[str, str], actual: dict[str, str]) -> list[str]:
+    """Describe how an installed resource differs from its recorded digests."""
+    problems = []
+    for name in sorted(expected.keys() | actual.keys()):
+        label = name or "(file)"
+        if name not in actual:
+            problems.append(f"missing: {label}")
+        elif name not in expected:
+            problems.append(f"unexpected: {label}")
+        elif expected[name] != actual[name]:
+            problems.append(f"modified: {label}")
+    return problems
+
+
+def verify_install(path: Path, files: dict[str, str]) -> list[str]:
+    """
+    Re-hash an installed resource and compare it with its recorded digests.
+
+    Args:
+        path: Installed resource path
+        files: Digests recorded at install time (see `hashing`)
+
+    Returns:
+        Problems found; empty if the resource is intact
+    """
+    is_directory = set(files) != {""}
+    if not (path.is_dir() if is_directory else path.is_file()):
+        return ["missing"]
+    return diff_files(files, hash_resource(path, is_directory))
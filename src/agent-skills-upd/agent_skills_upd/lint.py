@@ -0,0 +1,142 @@
+"""Validate every skill, command and agent under a directory.
+
+Works on a resource repository as well as on install directories such as
+`.claude/`. Skills are directories holding a SKILL.md; commands and
+agents are .md files inside `commands`/`command` and `agents`/`agent`
+directories. Files are checked in parallel and only their frontmatter
+header is read.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from agent_skills_upd.fetcher import ResourceType
+from agent_skills_upd.header import HeaderError, read_metadata
+
+SKIP_DIRS = {".git", "node_modules", "__pycache__"}
+COMMAND_DIRS = {"commands", "command"}
+AGENT_DIRS = {"agents", "agent"}
+MAX_LINT_WORKERS = 16
+
+
+@dataclass
+class LintIssue:
+    """A problem found in one resource file."""
+
+    path: Path
+    resource_type: ResourceType
+    message: str
+
+
+@dataclass
+class LintedResource:
+    """A resource found under the linted directory."""
+
+    path: Path
+    resource_type: ResourceType
+    # Name the file's location implies; None for a skill at the root
+    expected_name: str | None
+    name: str | None = None
+
+
+def find_resources(root: Path) -> list[LintedResource]:
+    """Find resource files under root, in a stable order."""
+    resources: list[LintedResource] = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(name for name in dirnames if name not in SKIP_DIRS)
+        directory = Path(dirpath)
+        skill_file = next((name for name in sorted(filenames) if name.lower() == "skill.md"), None)
+        if skill_file is not None:
+            expected = None if directory == root else directory.name
+            resources.append(LintedResource(directory / skill_file, ResourceType.SKILL, expected))
+            # Files inside a skill belong to it.
+            dirnames[:] = []
+            continue
+
+        if directory.name in COMMAND_DIRS:
+            resource_type = ResourceType.COMMAND
+        elif directory.name in AGENT_DIRS:
+            resource_type = ResourceType.AGENT
+        else:
+            continue
+        for name in sorted(filenames):
+            if name.endswith(".md"):
+                resources.append(LintedResource(directory / name, resource_type, name[:-3]))
+    return resources
+
+
+def _check(resource: LintedResource) -> list[str]:
+    """Check one resource file; fills in resource.name."""
+    try:
+        metadata = read_metadata(resource.path)
+    except HeaderError as exc:
+        return [str(exc)]
+    except (OSError, UnicodeDecodeError) as exc:
+        return [f"Unreadable: {exc}"]
+
+    name = metadata.get("name")
+    resource.name = str(name).strip() if name is not None and str(name).strip() else None
+    if resource.name is None:
+        # Slash commands are named by their file; a name is optional there.
+        if resource.resource_type == ResourceType.COMMAND:
+            resource.name = resource.expected_name
+            return []
+        return ["Frontmatter missing name."]
+    if resource.expected_name is not None and resource.name != resource.expected_name:
+        return [
+            f"Frontmatter name '{resource.name}' does not match "
+            f"'{resource.expected_name}' from its path."
+        ]
+    return []
+
+
+def lint_tree(
+    root: Path, workers: int = MAX_LINT_WORKERS
+) -> tuple[list[LintedResource], list[LintIssue]]:
+    """
+    Validate every resource under root.
+
+    Reports missing or mismatched names, invalid frontmatter YAML and
+    names used by more than one resource of the same type (an install
+    would silently pick one of them).
+
+    Args:
+        root: Repository or install directory
+        workers: Number of files checked concurrently
+
+    Returns:
+        Tuple of (resources found, issues)
+    """
+    resources = find_resources(root)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(_check, resources))
+
+    issues = [
+        LintIssue(resource.path, resource.resource_type, message)
+        for resource, messages in zip(resources, results)
+        for message in messages
+    ]
+
+    by_name: dict[tuple[ResourceType, str], list[LintedResource]] = {}
+    for resource in resources:
+        if resource.name is not None:
+            by_name.setdefault((resource.resource_type, resource.name), []).append(resource)
+    for (resource_type, name), dupes in by_name.items():
+        if len(dupes) < 2:
+            continue
+        for resource in dupes:
+            others = ", ".join(
+                str(other.path.relative_to(root)) for other in dupes if other is not resource
+            )
+            issues.append(
+                LintIssue(
+                    resource.path,
+                    resource_type,
+                    f"Duplicate {resource_type.value} name '{name}' (also in {others}).",
+                )
+            )
+
+    issues.sort(key=lambda issue: str(issue.path))
+    return resources, issues
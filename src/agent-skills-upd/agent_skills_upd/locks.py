@@ -0,0 +1,65 @@
+"""Advisory cross-process file locks.
+
+Locks use `flock` on a separate lock file, so they also serialize
+threads of one process (the daemon) that open the lock independently.
+On platforms without fcntl they are no-ops.
+"""
+
+import hashlib
+import time
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+from typing import Iterator
+
+from agent_skills_upd import tracing
+from agent_skills_upd.cache import get_cache_dir
+
+LOCKS_SUBDIR = "locks"
+
+
+def lock_path_for(target: Path) -> Path:
+    """Return the lock file guarding `target`, kept out of the target's directory."""
+    digest = hashlib.sha256(str(target.absolute()).encode("utf-8")).hexdigest()[:32]
+    return get_cache_dir() / LOCKS_SUBDIR / f"{digest}.lock"
+
+
+@contextmanager
+def file_lock(lock_path: Path) -> Iterator[float]:
+    """
+    Hold an exclusive lock on `lock_path` for the duration of the block.
+
+    Yields:
+        The time.time() at which the lock was requested, so callers can
+        tell whether another process produced something while they waited.
+    """
+    requested_at = time.time()
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with lock_path.open("a") as lock_handle:
+        try:
+            import fcntl
+        except ImportError:
+            yield requested_at
+            return
+
+        with tracing.span("lock.wait", path=lock_path.name):
+            fcntl.flock(lock_handle, fcntl.LOCK_EX)
+        try:
+            yield requested_at
+        finally:
+            fcntl.flock(lock_handle, fcntl.LOCK_UN)
+
+
+@contextmanager
+def locked(target: Path) -> Iterator[float]:
+    """Lock an install destination or other path via `lock_path_for`."""
+    with file_lock(lock_path_for(target)) as requested_at:
+        yield requested_at
+
+
+@contextmanager
+def locked_all(targets: list[Path]) -> Iterator[None]:
+    """Lock several targets, always in the same order so processes can't deadlock."""
+    with ExitStack() as stack:
+        for lock_path in sorted({lock_path_for(target) for target in targets}):
+            stack.enter_context(file_lock(lock_path))
+        yield
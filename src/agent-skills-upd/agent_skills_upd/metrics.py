@@ -0,0 +1,339 @@
+"""In-process metrics registry with OpenMetrics/Prometheus textfile export.
+
+Counters and histograms are updated by the fetcher. A run exports them
+with `flush()`, which writes to the file named by
+AGENT_SKILLS_UPD_METRICS_FILE. By default the file is merged with the
+values already in it, so a host accumulates totals across many short
+runs for node-exporter's textfile collector. Set
+AGENT_SKILLS_UPD_METRICS_MODE=replace to write only the current run.
+"""
+
+import functools
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+METRICS_FILE_ENV = "AGENT_SKILLS_UPD_METRICS_FILE"
+METRICS_MODE_ENV = "AGENT_SKILLS_UPD_METRICS_MODE"
+
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_SAMPLE_RE = re.compile(r"^([a-zA-Z_:][a-zA-Z0-9_:]*)(\{.*\})?\s+(\S+)$")
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_str(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    body = ",".join(f'{key}="{_escape(str(value))}"' for key, value in labels.items())
+    return "{" + body + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+
+class _Metric:
+    """Base class for labelled metric families."""
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, Any]) -> tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key: tuple[str, ...]) -> dict[str, str]:
+        return dict(zip(self.labelnames, key))
+
+    def samples(self) -> list[tuple[str, str, float]]:
+        """Return (sample name, label string, value) triples."""
+        raise NotImplementedError
+
+    def reset(self) -> None:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: Any) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> list[tuple[str, str, float]]:
+        with self._lock:
+            return [
+                (f"{self.name}_total", _label_str(self._labels(key)), value)
+                for key, value in sorted(self._values.items())
+            ]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Histogram(_Metric):
+    """Cumulative histogram with fixed buckets."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = (*sorted(buckets), float("inf"))
+        self._counts: dict[tuple[str, ...], list[int]] = {}
+        self._sums: dict[tuple[str, ...], float] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            counts = self._counts.setdefault(key, [0] * len(self.buckets))
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+            self._sums[key] = self._sums.get(key, 0.0) + value
+
+    def count(self, **labels: Any) -> int:
+        counts = self._counts.get(self._key(labels))
+        return counts[-1] if counts else 0
+
+    def samples(self) -> list[tuple[str, str, float]]:
+        result = []
+        with self._lock:
+            for key in sorted(self._counts):
+                labels = self._labels(key)
+                for bound, count in zip(self.buckets, self._counts[key]):
+                    bucket_labels = {**labels, "le": _format_value(bound)}
+                    result.append((f"{self.name}_bucket", _label_str(bucket_labels), count))
+                result.append((f"{self.name}_sum", _label_str(labels), self._sums[key]))
+                result.append((f"{self.name}_count", _label_str(labels), self._counts[key][-1]))
+        return result
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts.clear()
+            self._sums.clear()
+
+
+class Registry:
+    """Ordered collection of metric families."""
+
+    def __init__(self) -> None:
+        self.metrics: list[_Metric] = []
+
+    def register(self, metric: _Metric) -> Any:
+        self.metrics.append(metric)
+        return metric
+
+    def reset(self) -> None:
+        for metric in self.metrics:
+            metric.reset()
+
+
+REGISTRY = Registry()
+
+INSTALLS = REGISTRY.register(
+    Counter(
+        "agent_skills_upd_installs",
+        "Install attempts by source and result.",
+        ("source", "result"),
+    )
+)
+INSTALL_SECONDS = REGISTRY.register(
+    Histogram(
+        "agent_skills_upd_install_duration_seconds",
+        "Wall time of install attempts.",
+        ("source",),
+    )
+)
+DOWNLOADS = REGISTRY.register(
+    Counter(
+        "agent_skills_upd_downloads",
+        "Archive downloads by host.",
+        ("host",),
+    )
+)
+DOWNLOAD_BYTES = REGISTRY.register(
+    Counter(
+        "agent_skills_upd_download_bytes",
+        "Bytes downloaded by host.",
+        ("host",),
+    )
+)
+HTTP_ERRORS = REGISTRY.register(
+    Counter(
+        "agent_skills_upd_http_errors",
+        "HTTP error responses and network failures by host and status.",
+        ("host", "status"),
+    )
+)
+NOT_FOUND = REGISTRY.register(
+    Counter(
+        "agent_skills_upd_not_found",
+        "Missing repositories or resources by host.",
+        ("host", "kind"),
+    )
+)
+CACHE_REQUESTS = REGISTRY.register(
+    Counter(
+        "agent_skills_upd_cache_requests",
+        "Cache lookups by cache and result (hit/miss).",
+        ("cache", "result"),
+    )
+)
+
+
+def instrument_install(source: str) -> Callable:
+    """Decorate a fetch function to count attempts and observe their duration."""
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            result = "ok"
+            try:
+                return func(*args, **kwargs)
+            except Exception as exc:
+                result = type(exc).__name__
+                raise
+            finally:
+                INSTALLS.inc(source=source, result=result)
+                INSTALL_SECONDS.observe(time.perf_counter() - start, source=source)
+
+        return wrapper
+
+    return decorator
+
+
+def collect(registry: Registry = REGISTRY) -> dict[tuple[str, str], float]:
+    """Return current samples keyed by (sample name, label string)."""
+    return {
+        (name, labels): value
+        for metric in registry.metrics
+        for name, labels, value in metric.samples()
+    }
+
+
+def parse_textfile(text: str) -> dict[tuple[str, str], float]:
+    """Parse samples from a textfile written by `render`."""
+    samples = {}
+    for line in text.splitlines():
+        if not line or line.startswith("#"):
+            continue
+        match = _SAMPLE_RE.match(line)
+        if not match:
+            continue
+        name, labels, value = match.groups()
+        try:
+            samples[(name, labels or "")] = float(value)
+        except ValueError:
+            continue
+    return samples
+
+
+def render(
+    samples: dict[tuple[str, str], float],
+    registry: Registry = REGISTRY,
+    openmetrics: bool = True,
+) -> str:
+    """
+    Render samples grouped under their metric families.
+
+    OpenMetrics names counter families without the `_total` suffix and
+    ends with `# EOF`; the Prometheus text format used by node-exporter
+    repeats the full sample name in HELP/TYPE.
+    """
+    lines = []
+    for metric in registry.metrics:
+        if metric.kind == "counter":
+            sample_names = {f"{metric.name}_total"}
+            family = metric.name if openmetrics else f"{metric.name}_total"
+        else:
+            sample_names = {f"{metric.name}_{suffix}" for suffix in ("bucket", "sum", "count")}
+            family = metric.name
+        series = sorted(key for key in samples if key[0] in sample_names)
+        if not series:
+            continue
+        lines.append(f"# HELP {family} {metric.documentation}")
+        lines.append(f"# TYPE {family} {metric.kind}")
+        for name, labels in series:
+            lines.append(f"{name}{labels} {_format_value(samples[(name, labels)])}")
+    if openmetrics:
+        lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+
+def write_textfile(path: Path, merge: bool = True, registry: Registry = REGISTRY) -> None:
+    """
+    Write the registry to `path` atomically.
+
+    `.prom` files use the Prometheus text format (node-exporter textfile
+    collector); other suffixes use OpenMetrics. With merge=True the values
+    already in the file are added to this run's values under a file lock,
+    so concurrent runs on one host accumulate correctly.
+    """
+    from agent_skills_upd.locks import file_lock
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with file_lock(path.with_name(path.name + ".lock")):
+        samples = collect(registry)
+        if merge and path.exists():
+            for key, value in parse_textfile(path.read_text(encoding="utf-8")).items():
+                samples[key] = samples.get(key, 0) + value
+
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(
+            render(samples, registry, openmetrics=path.suffix != ".prom"),
+            encoding="utf-8",
+        )
+        tmp_path.replace(path)
+
+
+def flush(registry: Registry = REGISTRY) -> None:
+    """
+    Export and reset the registry if AGENT_SKILLS_UPD_METRICS_FILE is set.
+
+    Resetting after a merged write keeps long-lived processes (the daemon)
+    from adding the same increments twice.
+    """
+    target = os.environ.get(METRICS_FILE_ENV)
+    if not target:
+        return
+    merge = os.environ.get(METRICS_MODE_ENV, "merge").lower() != "replace"
+    try:
+        write_textfile(Path(target).expanduser(), merge=merge, registry=registry)
+    except OSError:
+        # Metrics must never fail an install.
+        return
+    if merge:
+        registry.reset()
@@ -0,0 +1,159 @@
+"""Short-lived cache of "not found" results.
+
+Probing for repositories or resources that don't exist otherwise costs a
+round trip per attempt, and a whole archive download to learn that a
+resource is absent. Misses from remote sources are remembered in the
+cache directory for AGENT_SKILLS_UPD_NEGATIVE_TTL seconds (default: one
+minute; 0 disables the cache), keyed by repository and by resource type
+and name, so a repeated miss fails without touching the network. `add
+--refresh` clears them first; any successful fetch of a key drops it.
+"""
+
+import json
+import os
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+from agent_skills_upd import metrics
+from agent_skills_upd.cache import get_cache_dir
+from agent_skills_upd.exceptions import RepoNotFoundError, ResourceNotFoundError
+from agent_skills_upd.locks import file_lock
+
+NEGATIVE_TTL_ENV = "AGENT_SKILLS_UPD_NEGATIVE_TTL"
+DEFAULT_NEGATIVE_TTL = 60.0
+NEGATIVE_CACHE_FILENAME = "negative.json"
+
+_ERRORS = {"repo": RepoNotFoundError, "resource": ResourceNotFoundError}
+
+
+def _ttl() -> float:
+    try:
+        return float(os.environ.get(NEGATIVE_TTL_ENV, DEFAULT_NEGATIVE_TTL))
+    except ValueError:
+        return DEFAULT_NEGATIVE_TTL
+
+
+def _cache_path() -> Path:
+    return get_cache_dir() / NEGATIVE_CACHE_FILENAME
+
+
+def _load() -> dict:
+    try:
+        data = json.loads(_cache_path().read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _update(change) -> None:
+    """Apply change(entries) under the cache lock, dropping expired entries."""
+    cache_path = _cache_path()
+    try:
+        with file_lock(cache_path.with_name(f"{cache_path.name}.lock")):
+            data = _load()
+            now = time.time()
+            entries = {
+                key: entry
+                for key, entry in data.items()
+                if isinstance(entry, dict) and entry.get("expires_at", 0) > now
+            }
+            change(entries)
+            if entries == data:
+                return
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_name(f".{cache_path.name}.{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps(entries, sort_keys=True), encoding="utf-8")
+            tmp_path.replace(cache_path)
+    except OSError:
+        pass
+
+
+def repo_key(source: dict) -> str | None:
+    """Key for a missing repository, from a provider spec (None if not a repo)."""
+    if "host" not in source:
+        return None
+    return f"repo:{source['host']}/{source['username']}/{source['repo']}"
+
+
+def resource_key(source: dict, resource_type: str, name: str) -> str:
+    """Key for a missing resource, from a provider spec."""
+    if "slug" in source:
+        origin = f"clawdhub/{source['slug']}"
+    else:
+        origin = f"{source['host']}/{source['username']}/{source['repo']}"
+    return f"resource:{origin}:{resource_type}/{name}"
+
+
+def check(*keys: str | None) -> None:
+    """
+    Raise the remembered error of the first key that recently missed.
+
+    Raises:
+        RepoNotFoundError: If a repository key is cached
+        ResourceNotFoundError: If a resource key is cached
+    """
+    if _ttl() <= 0 or not any(keys):
+        return
+    data = _load()
+    now = time.time()
+    for key in keys:
+        entry = data.get(key) if key else None
+        if isinstance(entry, dict) and entry.get("expires_at", 0) > now:
+            metrics.CACHE_REQUESTS.inc(cache="negative", result="hit")
+            error = _ERRORS.get(entry.get("kind"), ResourceNotFoundError)
+            raise error(entry.get("message") or "Not found (cached).")
+
+
+def remember(key: str | None, error: RepoNotFoundError | ResourceNotFoundError) -> None:
+    """Remember that key missed with error, for the negative TTL."""
+    ttl = _ttl()
+    if key is None or ttl <= 0:
+        return
+    kind = "repo" if isinstance(error, RepoNotFoundError) else "resource"
+    entry = {"kind": kind, "message": str(error), "expires_at": time.time() + ttl}
+    metrics.CACHE_REQUESTS.inc(cache="negative", result="miss")
+    _update(lambda entries: entries.__setitem__(key, entry))
+
+
+def forget(*keys: str | None) -> None:
+    """Drop keys that were found after all."""
+    data = _load()
+    if not any(key in data for key in keys if key):
+        return
+    _update(lambda entries: [entries.pop(key, None) for key in keys if key])
+
+
+def clear() -> None:
+    """Drop every remembered miss."""
+    _update(lambda entries: entries.clear())
+
+
+@contextmanager
+def guard(source: dict, resource_type: str, name: str | None) -> Iterator[None]:
+    """
+    Fail fast on a recent miss of source (a provider spec) or the resource.
+
+    Misses raised inside the block are remembered; a block that completes
+    drops any earlier miss of the same keys. Local sources are not cached.
+
+    Raises:
+        RepoNotFoundError: If the repository recently missed
+        ResourceNotFoundError: If the resource recently missed
+    """
+    if source.get("provider") == "local":
+        yield
+        return
+    repo = repo_key(source)
+    resource = resource_key(source, resource_type, name) if name else None
+    check(repo, resource)
+    try:
+        yield
+    except RepoNotFoundError as exc:
+        remember(repo, exc)
+        raise
+    except ResourceNotFoundError as exc:
+        remember(resource, exc)
+        raise
+    forget(repo, resource)
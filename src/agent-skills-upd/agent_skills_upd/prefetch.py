@@ -0,0 +1,76 @@
+"""Warm the cache for a list of refs without installing anything.
+
+Each ref is resolved and fetched exactly as `add` would (default branch,
+repo archive or git mirror, Clawdhub package), so the cache ends up
+holding everything a later install needs. Resources are written only to
+scratch directories, never to a project or environment directory, and
+refs are fetched concurrently (with archives extracted in worker
+processes, see `fetcher.extraction_pool`); refs sharing a repository
+share one download through the per-archive lock.
+"""
+
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from agent_skills_upd import tracing
+from agent_skills_upd.bundle import BundleItem, fetch_item
+from agent_skills_upd.exceptions import SkillUpdError
+from agent_skills_upd.fetcher import extraction_pool
+
+MAX_PREFETCH_WORKERS = 8
+
+
+@dataclass
+class PrefetchResult:
+    """Outcome of prefetching one ref."""
+
+    item: BundleItem
+    # Resolved resource name, or the error that kept the ref from resolving
+    name: str | None = None
+    error: str | None = None
+
+
+def read_ref_list(manifest: Path) -> list[str]:
+    """
+    Read the refs listed in a manifest file, one per line.
+
+    Blank lines and lines starting with `#` are skipped; a `#` inside a
+    ref (as in `./repo#name`) is part of the ref.
+
+    Raises:
+        SkillUpdError: If the manifest can't be read
+    """
+    try:
+        lines = manifest.read_text(encoding="utf-8").splitlines()
+    except OSError as exc:
+        raise SkillUpdError(f"Cannot read manifest {manifest}: {exc}") from exc
+    return [line.strip() for line in lines if line.strip() and not line.strip().startswith("#")]
+
+
+def _prefetch_item(item: BundleItem) -> PrefetchResult:
+    try:
+        with tracing.span("prefetch", ref=item.ref), tempfile.TemporaryDirectory() as tmp_dir:
+            path = fetch_item(item, Path(tmp_dir))
+    except SkillUpdError as exc:
+        return PrefetchResult(item, error=str(exc))
+    return PrefetchResult(item, name=path.stem if path.is_file() else path.name)
+
+
+def prefetch(items: list[BundleItem], workers: int = MAX_PREFETCH_WORKERS) -> list[PrefetchResult]:
+    """
+    Fetch every item into the cache, concurrently.
+
+    Args:
+        items: Resources to prefetch (see `cli.bundle.parse_bundle_ref`)
+        workers: Number of refs fetched at once
+
+    Returns:
+        One result per item, in order; failed refs carry an error
+    """
+    if not items:
+        return []
+    workers = min(workers, len(items))
+    with extraction_pool(workers), ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_prefetch_item, items))
@@ -0,0 +1,989 @@
+"""Source providers: where resources are installed from.
+
+A provider hides how a source is reached (archive download, git clone,
+Clawdhub API, a local working tree or archive) behind one interface:
+
+- `resolve()` names the exact thing that will be read (URL, commit, path)
+- `version()` returns a version identifier when the source has one
+- `list_members()` lists file paths relative to the source root
+- `fetch_members()` writes one file or directory subtree to a destination
+- `open_tree()` materializes the whole source as a directory
+- `spec()` describes the source so `provider_from_spec()` can rebuild it
+- `validators()` identify the content last fetched; `poll()` returns the
+  source's current validators as cheaply as the source allows
+- `update_members()` brings a copy fetched earlier up to date by writing
+  only the files changed since, where the source can list its changes
+
+Each provider declares `ProviderCapabilities`. The fetcher locates and
+copies resources through the listing methods when `tree_listing` is
+available, so only the resource's own files are read; otherwise it
+falls back to `open_tree()` and searches the materialized directory.
+"""
+
+import os
+import shutil
+import socket
+import stat
+import tarfile
+import tempfile
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+from typing import IO, TYPE_CHECKING, Iterator
+
+from agent_skills_upd import cache_index, git_backend, integrity, metrics, refs, tracing
+from agent_skills_upd.cache import CLAWDHUB_CACHE_SUBDIR, find_in_layers, get_cache_dir
+from agent_skills_upd.exceptions import (
+    RepoNotFoundError,
+    ResourceNotFoundError,
+    SkillUpdError,
+)
+from agent_skills_upd.fetcher import (
+    CLAWDHUB_HOST,
+    FETCH_BACKENDS,
+    ArchiveSelection,
+    build_archive_url,
+    clawdhub_api_url,
+    copy_resource,
+    download_repo_archive,
+    extract_archive,
+    fetch_repo_archive,
+    find_cached_archive,
+    http_client,
+    http_get,
+    http_stream,
+    parse_clawdhub_version,
+    read_archive_meta,
+    select_archive_root,
+)
+from agent_skills_upd.header import HeaderError, metadata_from_text
+
+if TYPE_CHECKING:
+    from agent_skills_upd.filters import FileFilter
+
+LOCAL_HOST = "local"
+
+# Archive suffixes the local provider accepts.
+LOCAL_ARCHIVE_SUFFIXES = (".tar.gz", ".tgz", ".tar", ".zip")
+
+
+@dataclass(frozen=True)
+class ProviderCapabilities:
+    """What a provider can do cheaply."""
+
+    # Individual members can be read without reading the whole source.
+    ranged_reads: bool = False
+    # The member list is available without materializing the source.
+    tree_listing: bool = False
+    # The source can answer "unchanged since version X" without a download.
+    conditional_requests: bool = False
+    # The files changed since version X can be listed and fetched on their own.
+    delta_updates: bool = False
+
+
+def _ignore_git(directory: str, names: list[str]) -> set[str]:
+    return {".git"} if ".git" in names else set()
+
+
+def _copy_ignore(root: Path, file_filter: "FileFilter | None"):
+    """Return a copytree ignore function skipping .git and filtered files under root."""
+    if not file_filter:
+        return _ignore_git
+    filtered = file_filter.ignore(root)
+    return lambda directory, names: _ignore_git(directory, names) | filtered(directory, names)
+
+
+def _member_dirs(members: set[str]) -> set[str]:
+    """Every directory implied by a set of file paths."""
+    dirs = set()
+    for member in members:
+        parent = member.rpartition("/")[0]
+        while parent and parent not in dirs:
+            dirs.add(parent)
+            parent = parent.rpartition("/")[0]
+    return dirs
+
+
+def _prune_empty_dirs(directory: Path, root: Path) -> None:
+    """Remove directory and its parents up to (not including) root while they are empty."""
+    while directory != root and directory.is_dir() and not any(directory.iterdir()):
+        directory.rmdir()
+        directory = directory.parent
+
+
+class SourceProvider:
+    """Base class for resource sources."""
+
+    capabilities = ProviderCapabilities()
+    # Host label used for metrics and success messages.
+    host = ""
+
+    def __init__(self) -> None:
+        self._members: set[str] | None = None
+        self._dirs: set[str] | None = None
+
+    @property
+    def label(self) -> str:
+        """Human-readable source name for messages."""
+        raise NotImplementedError
+
+    @property
+    def repo(self) -> str:
+        """Repository name, used to decide whether root SKILL.md repos apply."""
+        return ""
+
+    @property
+    def web_url(self) -> str | None:
+        """URL where users can browse the source, if any."""
+        return None
+
+    def resolve(self) -> str:
+        """Return the concrete location this provider reads from."""
+        raise NotImplementedError
+
+    def version(self) -> str | None:
+        """Return a version identifier for the source, if it has one."""
+        return None
+
+    def list_members(self) -> set[str]:
+        """Return all file paths relative to the source root."""
+        raise NotImplementedError
+
+    def read_text(self, path: str) -> str:
+        """Read one member as UTF-8 text."""
+        raise NotImplementedError
+
+    def fetch_members(
+        self, path: str, dest: Path, is_directory: bool, file_filter: "FileFilter | None" = None
+    ) -> None:
+        """Write the member at `path` ('' for the root) to `dest`, skipping filtered files."""
+        raise NotImplementedError
+
+    def update_members(
+        self,
+        path: str,
+        dest: Path,
+        previous: dict,
+        file_filter: "FileFilter | None" = None,
+    ) -> bool:
+        """
+        Update `dest`, the directory member at `path` as fetched earlier, in place.
+
+        Only files changed since the content `previous` (validators) names
+        are written or deleted; the rest of dest is left alone, so changed
+        files are replaced rather than written into.
+
+        Returns:
+            False, with dest untouched, if the changes can't be determined
+            and the member has to be fetched in full
+        """
+        return False
+
+    @contextmanager
+    def open_tree(
+        self, cone_paths: list[str], tmp_path: Path, file_filter: "FileFilter | None" = None
+    ) -> Iterator[Path]:
+        """
+        Yield a directory holding at least `cone_paths` and root-level files.
+
+        Files under a cone path that file_filter (applied relative to that
+        path) rejects may be left out.
+        """
+        raise NotImplementedError
+        yield  # pragma: no cover
+
+    def close(self) -> None:
+        """Release open handles."""
+
+    def spec(self) -> dict:
+        """Return a JSON-able description for `provider_from_spec`."""
+        raise NotImplementedError
+
+    def validators(self) -> dict:
+        """Identify the content this provider fetched (call after fetching)."""
+        return {}
+
+    def poll(self) -> dict:
+        """Return the source's current validators; compared to `validators()`."""
+        return self.validators()
+
+    def has_file(self, path: str) -> bool:
+        return path in self._listing()[0]
+
+    def has_dir(self, path: str) -> bool:
+        return path in self._listing()[1]
+
+    def root_files(self) -> list[str]:
+        """Names of files at the source root."""
+        return sorted(member for member in self._listing()[0] if "/" not in member)
+
+    def _listing(self) -> tuple[set[str], set[str]]:
+        if self._members is None:
+            with tracing.span("list") as list_span:
+                self._members = self.list_members()
+                self._dirs = _member_dirs(self._members)
+                list_span.set(files=len(self._members))
+        return self._members, self._dirs
+
+
+class LocalDirProvider(SourceProvider):
+    """A directory on disk: a working tree or an already extracted archive."""
+
+    capabilities = ProviderCapabilities(ranged_reads=True, tree_listing=True)
+    host = LOCAL_HOST
+
+    def __init__(self, root: Path, repo: str = ""):
+        super().__init__()
+        self.root = root
+        self._repo = repo
+
+    @property
+    def label(self) -> str:
+        return str(self.root)
+
+    @property
+    def repo(self) -> str:
+        return self._repo
+
+    def resolve(self) -> str:
+        return str(self.root.resolve())
+
+    def spec(self) -> dict:
+        return {"provider": "local", "path": self.resolve()}
+
+    def validators(self) -> dict:
+        # stat() only: cheap enough to poll a working tree.
+        latest = count = size = 0
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = [name for name in dirnames if name != ".git"]
+            for name in filenames:
+                info = os.stat(os.path.join(dirpath, name))
+                latest = max(latest, info.st_mtime_ns)
+                count += 1
+                size += info.st_size
+        return {"signature": f"{latest}:{count}:{size}"}
+
+    def list_members(self) -> set[str]:
+        members = set()
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = [name for name in dirnames if name != ".git"]
+            rel = Path(dirpath).relative_to(self.root).as_posix()
+            prefix = "" if rel == "." else f"{rel}/"
+            members.update(f"{prefix}{name}" for name in filenames)
+        return members
+
+    # The filesystem answers lookups directly; walking the tree is not needed.
+    def has_file(self, path: str) -> bool:
+        return (self.root / path).is_file()
+
+    def has_dir(self, path: str) -> bool:
+        return (self.root / path).is_dir()
+
+    def root_files(self) -> list[str]:
+        return sorted(entry.name for entry in self.root.iterdir() if entry.is_file())
+
+    def read_text(self, path: str) -> str:
+        return (self.root / path).read_text(encoding="utf-8")
+
+    def fetch_members(
+        self, path: str, dest: Path, is_directory: bool, file_filter: "FileFilter | None" = None
+    ) -> None:
+        source = self.root / path if path else self.root
+        copy_resource(source, dest, is_directory, ignore=_copy_ignore(source, file_filter))
+
+    @contextmanager
+    def open_tree(
+        self, cone_paths: list[str], tmp_path: Path, file_filter: "FileFilter | None" = None
+    ) -> Iterator[Path]:
+        yield self.root
+
+
+class LocalArchiveProvider(SourceProvider):
+    """A local .tar.gz/.tgz/.tar/.zip read in place, without extracting to a temp dir.
+
+    A single top-level directory (as in GitHub archives) is treated as the root.
+    """
+
+    host = LOCAL_HOST
+
+    def __init__(self, archive: Path):
+        super().__init__()
+        self.archive = archive
+        self._zip: zipfile.ZipFile | None = None
+        self._tar: tarfile.TarFile | None = None
+        # member path -> ZipInfo/TarInfo for regular files
+        self._entries: dict[str, object] | None = None
+        if zipfile.is_zipfile(archive):
+            self._zip = zipfile.ZipFile(archive)
+            # Zip has a central directory, so members are read individually.
+            self.capabilities = ProviderCapabilities(ranged_reads=True, tree_listing=True)
+        else:
+            try:
+                self._tar = tarfile.open(archive, mode="r:*")
+            except tarfile.TarError as exc:
+                raise SkillUpdError(f"Unable to read archive: {archive}") from exc
+            self.capabilities = ProviderCapabilities(tree_listing=True)
+
+    @property
+    def label(self) -> str:
+        return str(self.archive)
+
+    def resolve(self) -> str:
+        return str(self.archive.resolve())
+
+    def spec(self) -> dict:
+        return {"provider": "local", "path": self.resolve()}
+
+    def validators(self) -> dict:
+        info = self.archive.stat()
+        return {"signature": f"{info.st_mtime_ns}:{info.st_size}"}
+
+    def _load_entries(self) -> dict[str, object]:
+        if self._entries is not None:
+            return self._entries
+        raw: dict[str, object] = {}
+        if self._zip is not None:
+            for info in self._zip.infolist():
+                if not info.is_dir():
+                    raw[info.filename] = info
+        else:
+            for info in self._tar.getmembers():
+                if info.isfile():
+                    raw[info.name] = info
+
+        entries: dict[str, object] = {}
+        for name, info in raw.items():
+            parts = PurePosixPath(name).parts
+            if not parts or name.startswith("/") or ".." in parts:
+                continue
+            entries["/".join(parts)] = info
+
+        tops = {name.split("/", 1)[0] for name in entries}
+        if len(tops) == 1 and all("/" in name for name in entries):
+            strip = len(tops.pop()) + 1
+            entries = {name[strip:]: info for name, info in entries.items()}
+        self._entries = entries
+        return entries
+
+    def list_members(self) -> set[str]:
+        return set(self._load_entries())
+
+    def _open_member(self, path: str) -> IO[bytes]:
+        info = self._load_entries()[path]
+        if self._zip is not None:
+            return self._zip.open(info)
+        handle = self._tar.extractfile(info)
+        if handle is None:
+            raise SkillUpdError(f"Unable to read '{path}' from {self.archive}")
+        return handle
+
+    def _member_mode(self, path: str) -> int:
+        info = self._load_entries()[path]
+        if self._zip is not None:
+            return (info.external_attr >> 16) & 0o777
+        return info.mode & 0o777
+
+    def read_text(self, path: str) -> str:
+        with self._open_member(path) as handle:
+            return handle.read().decode("utf-8")
+
+    def _write_member(self, path: str, target: Path) -> int:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with self._open_member(path) as source:
+            integrity.copy_stream(source, target)
+        if self._member_mode(path) & stat.S_IXUSR:
+            target.chmod(0o755)
+        return target.stat().st_size
+
+    def _member_offset(self, path: str) -> int:
+        info = self._load_entries()[path]
+        return info.header_offset if self._zip is not None else info.offset_data
+
+    def _member_size(self, path: str) -> int:
+        info = self._load_entries()[path]
+        return info.file_size if self._zip is not None else info.size
+
+    def fetch_members(
+        self, path: str, dest: Path, is_directory: bool, file_filter: "FileFilter | None" = None
+    ) -> None:
+        with tracing.span("copy") as copy_span:
+            if not is_directory:
+                copy_span.add("files", 1)
+                copy_span.add("bytes", self._write_member(path, dest))
+                return
+
+            prefix = f"{path}/" if path else ""
+            dest.mkdir(parents=True, exist_ok=True)
+            # In archive order: a compressed tar seeking back inflates again from the start.
+            for member in sorted(self._load_entries(), key=self._member_offset):
+                if not member.startswith(prefix):
+                    continue
+                relative = member[len(prefix) :]
+                if file_filter and not file_filter.allows(relative, self._member_size(member)):
+                    continue
+                copy_span.add("files", 1)
+                copy_span.add("bytes", self._write_member(member, dest / relative))
+
+    def close(self) -> None:
+        if self._zip is not None:
+            self._zip.close()
+        if self._tar is not None:
+            self._tar.close()
+
+
+class ArchiveProvider(SourceProvider):
+    """A repository's default-branch tarball downloaded over HTTP."""
+
+    def __init__(self, host: str, username: str, repo: str):
+        super().__init__()
+        self.host = host
+        self.username = username
+        self._repo = repo
+        self._branch: tuple[str, bool] | None = None
+
+    @property
+    def label(self) -> str:
+        return f"{self.username}/{self._repo}"
+
+    @property
+    def repo(self) -> str:
+        return self._repo
+
+    @property
+    def web_url(self) -> str:
+        return f"https://{self.host}/{self.username}/{self._repo}"
+
+    def branch(self) -> str:
+        """Return the repo's default branch (resolved once, then cached)."""
+        if self._branch is None:
+            self._branch = refs.resolve_default_branch(self.host, self.username, self._repo)
+        return self._branch[0]
+
+    def resolve(self) -> str:
+        return build_archive_url(self.host, self.username, self._repo, self.branch())
+
+    def spec(self) -> dict:
+        return {
+            "provider": "archive",
+            "host": self.host,
+            "username": self.username,
+            "repo": self._repo,
+        }
+
+    def validators(self) -> dict:
+        branch = self.branch()
+        tarball_path = find_cached_archive(self.host, self.username, self._repo, branch)
+        return {"branch": branch, "sha256": read_archive_meta(tarball_path).get("sha256")}
+
+    def poll(self) -> dict:
+        # A conditional request: unchanged archives cost a 304.
+        fetch_repo_archive(
+            self.host, self.username, self._repo, self.branch(), revalidate_layers=True
+        )
+        return self.validators()
+
+    @contextmanager
+    def open_tree(
+        self, cone_paths: list[str], tmp_path: Path, file_filter: "FileFilter | None" = None
+    ) -> Iterator[Path]:
+        branch = self.branch()
+        selection = ArchiveSelection(tuple(cone_paths), file_filter) if file_filter else None
+        try:
+            root = download_repo_archive(
+                self.host, self.username, self._repo, tmp_path, branch, selection
+            )
+        except RepoNotFoundError:
+            if not self._branch[1]:
+                raise
+            # The cached branch may have been renamed since; ask the host again.
+            refs.invalidate(self.host, self.username, self._repo)
+            self._branch = None
+            if self.branch() == branch:
+                raise
+            root = download_repo_archive(
+                self.host, self.username, self._repo, tmp_path, self.branch(), selection
+            )
+        yield root
+
+
+class GitProvider(ArchiveProvider):
+    """A cached blobless clone; listing is free and blobs are fetched on demand."""
+
+    capabilities = ProviderCapabilities(ranged_reads=True, tree_listing=True, delta_updates=True)
+
+    def __init__(self, host: str, username: str, repo: str):
+        super().__init__(host, username, repo)
+        self._synced: tuple[Path, str] | None = None
+
+    def _sync(self) -> tuple[Path, str]:
+        if self._synced is None:
+            self._synced = git_backend.sync_bare_repo(self.host, self.username, self._repo)
+        return self._synced
+
+    def resolve(self) -> str:
+        return self.version()
+
+    def version(self) -> str:
+        return self._sync()[1]
+
+    def spec(self) -> dict:
+        return {**super().spec(), "provider": "git"}
+
+    def validators(self) -> dict:
+        return {"commit": self.version()}
+
+    def poll(self) -> dict:
+        # ls-remote reads only the ref advertisement.
+        return {"commit": git_backend.remote_head(self.host, self.username, self._repo)}
+
+    def list_members(self) -> set[str]:
+        return set(git_backend.list_files(*self._sync()))
+
+    def read_text(self, path: str) -> str:
+        return git_backend.read_blob(*self._sync(), path)
+
+    def fetch_members(
+        self, path: str, dest: Path, is_directory: bool, file_filter: "FileFilter | None" = None
+    ) -> None:
+        bare_path, commit = self._sync()
+        if is_directory and file_filter:
+            files = git_backend.tree_files(bare_path, commit, path)
+            if all(change.mode in git_backend.REGULAR_FILE_MODES for change in files):
+                dest.mkdir(parents=True, exist_ok=True)
+                with tracing.span("copy") as copy_span:
+                    self._write_blobs(files, path, dest, file_filter, copy_span)
+                return
+        if not path:
+            cone_paths = None
+        elif is_directory:
+            cone_paths = [path]
+        else:
+            # Cone mode always includes root files, so a root file needs no cone.
+            cone_paths = [path.rpartition("/")[0]] if "/" in path else []
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with git_backend.worktree(
+                bare_path, commit, Path(tmp_dir) / "worktree", cone_paths
+            ) as tree:
+                source = tree / path if path else tree
+                copy_resource(source, dest, is_directory, ignore=_copy_ignore(source, file_filter))
+
+    def update_members(
+        self,
+        path: str,
+        dest: Path,
+        previous: dict,
+        file_filter: "FileFilter | None" = None,
+    ) -> bool:
+        # The trees of both commits tell what changed; only those blobs are fetched.
+        bare_path, commit = self._sync()
+        installed = previous.get("commit")
+        if not installed or not git_backend.ensure_commit(bare_path, installed):
+            return False
+        prefix = f"{path}/" if path else ""
+        changes = git_backend.changed_files(bare_path, installed, commit, path)
+        if any(
+            change.status != "D" and change.mode not in git_backend.REGULAR_FILE_MODES
+            for change in changes
+        ):
+            return False
+        with tracing.span("delta", changed=len(changes)) as delta_span:
+            for change in changes:
+                target = dest / change.path[len(prefix) :]
+                if target.is_dir() and not target.is_symlink():
+                    shutil.rmtree(target)
+                else:
+                    target.unlink(missing_ok=True)
+            self._write_blobs(changes, path, dest, file_filter, delta_span)
+        return True
+
+    def _write_blobs(
+        self,
+        changes: list["git_backend.FileChange"],
+        path: str,
+        dest: Path,
+        file_filter: "FileFilter | None",
+        span: "tracing.Span",
+    ) -> None:
+        """
+        Write the files of changes (under path) that file_filter allows into dest.
+
+        Blobs of paths the filter excludes are never fetched; the size cap
+        needs the blob. Directories left empty by a skipped file are pruned.
+        """
+        bare_path, _ = self._sync()
+        prefix = f"{path}/" if path else ""
+        written = [
+            change
+            for change in changes
+            if change.status != "D"
+            and (not file_filter or file_filter.allows(change.path[len(prefix) :], 0))
+        ]
+        git_backend.fetch_blobs(bare_path, [change.blob for change in written])
+        sizes = git_backend.blob_sizes(bare_path, [change.blob for change in written])
+        for change in changes:
+            relative = change.path[len(prefix) :]
+            target = dest / relative
+            if change not in written or (
+                file_filter and not file_filter.allows(relative, sizes[change.blob])
+            ):
+                _prune_empty_dirs(target.parent, dest)
+                continue
+            target.parent.mkdir(parents=True, exist_ok=True)
+            with git_backend.open_blob(bare_path, change.blob) as blob:
+                span.add("bytes", integrity.copy_stream(blob, target))
+            if change.mode == "100755":
+                target.chmod(0o755)
+            span.add("files", 1)
+
+    @contextmanager
+    def open_tree(
+        self, cone_paths: list[str], tmp_path: Path, file_filter: "FileFilter | None" = None
+    ) -> Iterator[Path]:
+        bare_path, commit = self._sync()
+        with git_backend.worktree(bare_path, commit, tmp_path / "worktree", cone_paths) as tree:
+            yield tree
+
+
+class ClawdhubProvider(SourceProvider):
+    """A skill published on Clawdhub.
+
+    Methods take an HTTP client so the metadata and download requests of
+    one install share a connection.
+    """
+
+    capabilities = ProviderCapabilities(conditional_requests=True)
+    host = CLAWDHUB_HOST
+
+    def __init__(self, slug: str):
+        super().__init__()
+        self.slug = slug
+
+    @property
+    def label(self) -> str:
+        return f"{CLAWDHUB_HOST}/{self.slug}"
+
+    @property
+    def web_url(self) -> str:
+        return f"https://{CLAWDHUB_HOST}/{self.slug}"
+
+    def resolve(self) -> str:
+        return f"{clawdhub_api_url('download')}?slug={self.slug}&tag=latest"
+
+    def version(self) -> str | None:
+        with http_client() as client:
+            return parse_clawdhub_version(self.fetch_metadata(client))
+
+    def spec(self) -> dict:
+        return {"provider": "clawdhub", "slug": self.slug}
+
+    def poll(self) -> dict:
+        # The metadata document is tiny compared to the archive.
+        return {"version": self.version()}
+
+    def _not_found(self) -> ResourceNotFoundError:
+        metrics.HTTP_ERRORS.inc(host=CLAWDHUB_HOST, status=404)
+        metrics.NOT_FOUND.inc(host=CLAWDHUB_HOST, kind="resource")
+        return ResourceNotFoundError(f"Skill '{self.slug}' not found on {CLAWDHUB_HOST}.")
+
+    def fetch_metadata(self, client) -> dict:
+        """
+        Fetch the skill's metadata document.
+
+        Raises:
+            ResourceNotFoundError: If the skill doesn't exist
+            httpx.HTTPStatusError: On other HTTP errors
+        """
+        with tracing.span("clawdhub.metadata"):
+            response = http_get(client, clawdhub_api_url("skill"), params={"slug": self.slug})
+        if response.status_code == 404:
+            raise self._not_found()
+        response.raise_for_status()
+        try:
+            return response.json()
+        except ValueError as exc:
+            raise SkillUpdError("Clawdhub metadata response was not valid JSON.") from exc
+
+    def package_cache_path(self, version: str) -> Path:
+        """Return where the package of one version is kept in the cache directory."""
+        filename = f"{version.replace('/', '-')}.pkg"
+        return get_cache_dir() / CLAWDHUB_CACHE_SUBDIR / self.slug / filename
+
+    def download(self, client, version: str | None = None) -> bytes:
+        """
+        Download the latest skill archive.
+
+        With the version from the metadata, packages are cached per
+        version, so a known version is read from the cache (or a
+        read-only cache layer) instead of downloaded again.
+        """
+        if version is None:
+            return self._download(client)
+
+        cached = self._cached_package(version)
+        if cached is not None:
+            metrics.CACHE_REQUESTS.inc(cache="clawdhub", result="hit")
+            cache_index.record_use(cached, "clawdhub", "hit")
+            return cached.read_bytes()
+
+        archive_bytes = self._download(client, version)
+        self._store_package(version, archive_bytes)
+        return archive_bytes
+
+    def fetch_package(self, client, speculative: bool = False) -> tuple[dict, str, bytes]:
+        """
+        Fetch the skill's metadata and the package of its latest version.
+
+        Speculatively, the download is sent alongside the metadata request
+        instead of after it, saving a round trip. The download is cancelled,
+        and its connection shut down, as soon as the metadata request fails
+        or names a version that is already cached. An installed version
+        that is still current was cached when it was installed, so this is
+        also how the metadata shows the install is up to date.
+
+        The download is sent only once the metadata request has been, so
+        it can't return a version older than the one the metadata names.
+        A newer one, published between the two requests, is caught by the
+        version the download response is served for, or else the version
+        the package's SKILL.md states; a package that states neither is
+        used as is. A mismatched package is discarded and the named version
+        downloaded the regular way, as after a failed download, so errors
+        are reported as without speculation.
+
+        Returns:
+            The metadata, the version it names, and the package bytes
+
+        Raises:
+            ResourceNotFoundError: If the skill doesn't exist
+            SkillUpdError: If the metadata doesn't name a version
+            httpx.HTTPError: On other HTTP or network errors
+        """
+        if not speculative:
+            metadata = self.fetch_metadata(client)
+            version = self._metadata_version(metadata)
+            return metadata, version, self.download(client, version)
+
+        import httpx
+
+        metadata_sent = threading.Event()
+        cancelled = threading.Event()
+        # The speculative response, once its headers have arrived.
+        opened: list = []
+
+        def cancel() -> None:
+            cancelled.set()
+            for response in opened:
+                _shut_down(response)
+
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            pending = pool.submit(
+                self._download_unless, client, metadata_sent, cancelled, opened
+            )
+            try:
+                metadata_sent.set()
+                metadata = self.fetch_metadata(client)
+                version = self._metadata_version(metadata)
+            except BaseException:
+                cancel()
+                raise
+            if self._cached_package(version) is not None:
+                cancel()
+            try:
+                downloaded = pending.result()
+            except (httpx.HTTPError, OSError):
+                downloaded = None
+        if downloaded is None:
+            return metadata, version, self.download(client, version)
+        archive_bytes, served_version = downloaded
+        if (served_version or _package_version(archive_bytes) or version) != version:
+            return metadata, version, self.download(client, version)
+        self._store_package(version, archive_bytes)
+        return metadata, version, archive_bytes
+
+    @staticmethod
+    def _metadata_version(metadata: dict) -> str:
+        version = parse_clawdhub_version(metadata)
+        if not version:
+            raise SkillUpdError("Clawdhub metadata missing latestVersion.version.")
+        return version
+
+    def _cached_package(self, version: str) -> Path | None:
+        package_path = self.package_cache_path(version)
+        return package_path if package_path.exists() else find_in_layers(package_path)
+
+    def _store_package(self, version: str, archive_bytes: bytes) -> None:
+        package_path = self.package_cache_path(version)
+        try:
+            package_path.parent.mkdir(parents=True, exist_ok=True)
+            partial_path = package_path.with_name(f".{package_path.name}.{os.getpid()}.part")
+            partial_path.write_bytes(archive_bytes)
+            partial_path.replace(package_path)
+        except OSError:
+            return
+        metrics.CACHE_REQUESTS.inc(cache="clawdhub", result="miss")
+        cache_index.record_use(package_path, "clawdhub", "miss")
+
+    def _download(self, client, version: str | None = None) -> bytes:
+        # A known version is requested by name, so it is what gets cached under it.
+        url = clawdhub_api_url("download")
+        params = {"slug": self.slug}
+        params.update({"version": version} if version else {"tag": "latest"})
+        with tracing.span("download", url=url) as download_span:
+            response = http_get(client, url, params=params)
+            if response.status_code == 404:
+                raise self._not_found()
+            response.raise_for_status()
+            archive_bytes = response.content
+            download_span.set(bytes=len(archive_bytes))
+            metrics.DOWNLOADS.inc(host=CLAWDHUB_HOST)
+            metrics.DOWNLOAD_BYTES.inc(len(archive_bytes), host=CLAWDHUB_HOST)
+        return archive_bytes
+
+    def _download_unless(
+        self,
+        client,
+        metadata_sent: threading.Event,
+        cancelled: threading.Event,
+        opened: list,
+    ) -> tuple[bytes, str | None] | None:
+        """
+        Stream the latest archive once the metadata request has been sent.
+
+        The response is added to opened once its headers arrive.
+
+        Returns:
+            The package and the version its response was served for, if the
+            final URL names one; None once cancelled, whether the cancel was
+            seen between chunks or broke the connection under a blocked read
+        """
+        import httpx
+
+        chunks = []
+        url = clawdhub_api_url("download")
+        params = {"slug": self.slug, "tag": "latest"}
+        metadata_sent.wait()
+        with tracing.span("download", url=url, speculative=True) as span:
+            try:
+                with http_stream(client, url, params=params) as response:
+                    opened.append(response)
+                    served_version = response.url.params.get("version")
+                    response.raise_for_status()
+                    # A cancel made before the append couldn't shut this response down.
+                    chunk_iter = () if cancelled.is_set() else response.iter_bytes()
+                    for chunk in chunk_iter:
+                        if cancelled.is_set():
+                            break
+                        chunks.append(chunk)
+            except (httpx.HTTPError, OSError):
+                if not cancelled.is_set():
+                    raise
+            if cancelled.is_set():
+                span.set(cancelled=True)
+                return None
+            archive_bytes = b"".join(chunks)
+            span.set(bytes=len(archive_bytes))
+            metrics.DOWNLOADS.inc(host=CLAWDHUB_HOST)
+            metrics.DOWNLOAD_BYTES.inc(len(archive_bytes), host=CLAWDHUB_HOST)
+        return archive_bytes, served_version
+
+    @staticmethod
+    @contextmanager
+    def extract(archive_bytes: bytes, tmp_path: Path) -> Iterator[Path]:
+        """Extract a downloaded archive and yield its root directory."""
+        extract_path = tmp_path / "extracted"
+        extract_path.mkdir(parents=True, exist_ok=True)
+        with tracing.span("extract", bytes=len(archive_bytes)):
+            extract_archive(archive_bytes, extract_path)
+        yield select_archive_root(extract_path)
+
+    @contextmanager
+    def open_tree(
+        self, cone_paths: list[str], tmp_path: Path, file_filter: "FileFilter | None" = None
+    ) -> Iterator[Path]:
+        with http_client() as client:
+            archive_bytes = self.download(client)
+        with self.extract(archive_bytes, tmp_path) as root:
+            yield root
+
+
+def _shut_down(response) -> None:
+    """Shut down a streaming response's socket, waking a read blocked on it in another thread."""
+    network_stream = response.extensions.get("network_stream")
+    sock = network_stream.get_extra_info("socket") if network_stream is not None else None
+    if sock is None:
+        return
+    try:
+        sock.shutdown(socket.SHUT_RDWR)
+    except OSError:
+        pass
+
+
+def _package_version(archive_bytes: bytes) -> str | None:
+    """Return the version a Clawdhub package's SKILL.md frontmatter states, if any."""
+    import io
+
+    try:
+        with zipfile.ZipFile(io.BytesIO(archive_bytes)) as archive:
+            # The root SKILL.md, at the top or in the package's single folder.
+            candidates = sorted(
+                (info.filename.count("/"), info.filename)
+                for info in archive.infolist()
+                if PurePosixPath(info.filename).name.lower() == "skill.md"
+                and info.filename.count("/") <= 1
+            )
+            if not candidates:
+                return None
+            content = archive.read(candidates[0][1]).decode("utf-8")
+        version = metadata_from_text(content).get("version")
+    except (zipfile.BadZipFile, UnicodeDecodeError, HeaderError):
+        return None
+    if version is None:
+        return None
+    return str(version).strip() or None
+
+
+def get_repo_provider(host: str, username: str, repo: str, backend: str = "archive") -> SourceProvider:
+    """Return the provider for a hosted repository and fetch backend."""
+    if backend == "git":
+        return GitProvider(host, username, repo)
+    if backend == "archive":
+        return ArchiveProvider(host, username, repo)
+    raise SkillUpdError(f"Unknown backend '{backend}'. Available: {', '.join(FETCH_BACKENDS)}")
+
+
+def get_local_provider(path: Path) -> SourceProvider:
+    """
+    Return the provider for a local directory or archive.
+
+    Raises:
+        RepoNotFoundError: If the path doesn't exist or isn't a supported archive
+    """
+    if path.is_dir():
+        return LocalDirProvider(path, repo=path.resolve().name)
+    if path.is_file() and path.name.lower().endswith(LOCAL_ARCHIVE_SUFFIXES):
+        return LocalArchiveProvider(path)
+    if path.is_file():
+        raise SkillUpdError(
+            f"Unsupported local source: {path}. "
+            f"Expected a directory or {', '.join(LOCAL_ARCHIVE_SUFFIXES)} archive."
+        )
+    raise RepoNotFoundError(f"Local source '{path}' does not exist.")
+
+
+def provider_from_spec(spec: dict) -> SourceProvider:
+    """
+    Rebuild a provider from `SourceProvider.spec()`.
+
+    Raises:
+        SkillUpdError: If the spec names an unknown provider
+    """
+    kind = spec.get("provider")
+    if kind in FETCH_BACKENDS:
+        return get_repo_provider(spec["host"], spec["username"], spec["repo"], kind)
+    if kind == "local":
+        return get_local_provider(Path(spec["path"]))
+    if kind == "clawdhub":
+        return ClawdhubProvider(spec["slug"])
+    raise SkillUpdError(f"Unknown source provider '{kind}'.")
@@ -0,0 +1,183 @@
+"""Default-branch resolution for archive downloads.
+
+The branch is read from the `symref=HEAD:refs/heads/<branch>` capability
+in the smart-HTTP ref advertisement (`info/refs`), falling back to the
+dumb-HTTP `HEAD` file. Results are cached per repo in the cache
+directory for AGENT_SKILLS_UPD_REF_TTL seconds (default: one day);
+refs baked into read-only cache layers are used regardless of age, so
+installs from a layer need no network. Anything that can't be resolved
+falls back to "main", so resolution never fails an install on its own.
+"""
+
+import json
+import os
+import re
+import time
+from pathlib import Path
+
+from agent_skills_upd import metrics, tracing
+from agent_skills_upd.cache import get_cache_dir, get_cache_layers
+from agent_skills_upd.locks import file_lock
+
+REF_TTL_ENV = "AGENT_SKILLS_UPD_REF_TTL"
+DEFAULT_REF_TTL = 24 * 60 * 60
+REFS_CACHE_FILENAME = "refs.json"
+FALLBACK_BRANCH = "main"
+
+_SYMREF_RE = re.compile(rb"symref=HEAD:refs/heads/([^\s\x00]+)")
+_HEAD_RE = re.compile(rb"^ref:\s*refs/heads/(\S+)\s*$")
+
+
+def _ttl() -> float:
+    try:
+        return float(os.environ.get(REF_TTL_ENV, DEFAULT_REF_TTL))
+    except ValueError:
+        return DEFAULT_REF_TTL
+
+
+def _cache_path() -> Path:
+    return get_cache_dir() / REFS_CACHE_FILENAME
+
+
+def _cache_key(host: str, username: str, repo: str) -> str:
+    return f"{host}/{username}/{repo}"
+
+
+def _load_cache(cache_path: Path | None = None) -> dict:
+    try:
+        data = json.loads((cache_path or _cache_path()).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _entry_branch(entry: object) -> tuple[str, float] | None:
+    if not isinstance(entry, dict):
+        return None
+    branch = entry.get("branch")
+    resolved_at = entry.get("resolved_at")
+    if not isinstance(branch, str) or not isinstance(resolved_at, (int, float)):
+        return None
+    return branch, resolved_at
+
+
+def _store_cache(data: dict) -> None:
+    cache_path = _cache_path()
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_name(f".{cache_path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(data, indent=2, sort_keys=True), encoding="utf-8")
+        tmp_path.replace(cache_path)
+    except OSError:
+        pass
+
+
+def get_cached_branch(host: str, username: str, repo: str) -> str | None:
+    """
+    Return the cached default branch if it is younger than the TTL.
+
+    Without an entry in the writable cache, read-only cache layers are
+    consulted in order (their entries don't expire).
+    """
+    key = _cache_key(host, username, repo)
+    entry = _load_cache().get(key)
+    if entry is not None:
+        # Includes invalidated entries, which shadow the layers.
+        cached = _entry_branch(entry)
+        if cached is None or time.time() - cached[1] > _ttl():
+            return None
+        return cached[0]
+
+    for layer in get_cache_layers():
+        cached = _entry_branch(_load_cache(layer / REFS_CACHE_FILENAME).get(key))
+        if cached is not None:
+            return cached[0]
+    return None
+
+
+def _update_cache(key: str, entry: dict | None) -> None:
+    """Set or drop one entry; the read-modify-write runs under a file lock."""
+    cache_path = _cache_path()
+    try:
+        with file_lock(cache_path.with_name(f"{cache_path.name}.lock")):
+            data = _load_cache()
+            if entry is None:
+                if data.pop(key, None) is None:
+                    return
+            else:
+                data[key] = entry
+            _store_cache(data)
+    except OSError:
+        pass
+
+
+def invalidate(host: str, username: str, repo: str) -> None:
+    """Forget the cached default branch of a repo."""
+    key = _cache_key(host, username, repo)
+    # A tombstone keeps layers from supplying the forgotten branch again.
+    _update_cache(key, {"invalidated_at": time.time()} if get_cache_layers() else None)
+
+
+def parse_symref(advertisement: bytes) -> str | None:
+    """Extract the default branch from an info/refs advertisement."""
+    match = _SYMREF_RE.search(advertisement)
+    return match.group(1).decode("utf-8", "replace") if match else None
+
+
+def parse_head_file(content: bytes) -> str | None:
+    """Extract the default branch from a repository HEAD file."""
+    match = _HEAD_RE.match(content.strip())
+    return match.group(1).decode("utf-8", "replace") if match else None
+
+
+def _fetch_default_branch(host: str, username: str, repo: str) -> str | None:
+    """Ask the host for the default branch; None if it can't be determined."""
+    import httpx
+
+    from agent_skills_upd.fetcher import http_client, http_get
+    from agent_skills_upd.git_backend import build_clone_url
+
+    base_url = build_clone_url(host, username, repo)
+    try:
+        with http_client() as client:
+            response = http_get(
+                client,
+                f"{base_url}/info/refs",
+                params={"service": "git-upload-pack"},
+            )
+            if response.status_code == 200:
+                branch = parse_symref(response.content)
+                if branch:
+                    return branch
+            elif response.status_code == 404:
+                return None
+
+            response = http_get(client, f"{base_url}/HEAD")
+            if response.status_code == 200:
+                return parse_head_file(response.content)
+    except httpx.HTTPError:
+        return None
+    return None
+
+
+def resolve_default_branch(host: str, username: str, repo: str) -> tuple[str, bool]:
+    """
+    Return (default branch, whether it came from the cache).
+
+    Falls back to "main" (uncached) when the host doesn't say.
+    """
+    cached = get_cached_branch(host, username, repo)
+    metrics.CACHE_REQUESTS.inc(cache="refs", result="hit" if cached else "miss")
+    if cached:
+        return cached, True
+
+    with tracing.span("resolve") as resolve_span:
+        branch = _fetch_default_branch(host, username, repo)
+        resolve_span.set(branch=branch or FALLBACK_BRANCH)
+    if branch is None:
+        return FALLBACK_BRANCH, False
+
+    _update_cache(
+        _cache_key(host, username, repo), {"branch": branch, "resolved_at": time.time()}
+    )
+    return branch, False
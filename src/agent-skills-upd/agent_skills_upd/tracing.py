@@ -0,0 +1,167 @@
+"""Lightweight tracing spans for the fetch/install pipeline.
+
+Spans are only recorded while a Tracer is active (see `tracing()`);
+otherwise `span()` hands out a shared no-op span, so instrumented code
+costs next to nothing in normal runs.
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterator
+
+
+@dataclass
+class Span:
+    """A timed phase with optional counters (bytes, files, ...)."""
+
+    name: str
+    start: float
+    duration: float = 0.0
+    attrs: dict[str, Any] = field(default_factory=dict)
+    thread_id: int = 0
+
+    def set(self, **attrs: Any) -> None:
+        """Attach or update attributes on the span."""
+        self.attrs.update(attrs)
+
+    def add(self, key: str, amount: int | float) -> None:
+        """Increment a numeric attribute."""
+        self.attrs[key] = self.attrs.get(key, 0) + amount
+
+
+class _NoopSpan(Span):
+    """Span handed out when tracing is disabled; discards everything."""
+
+    def set(self, **attrs: Any) -> None:
+        pass
+
+    def add(self, key: str, amount: int | float) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan(name="", start=0.0)
+
+
+class Tracer:
+    """Collects finished spans from any thread."""
+
+    def __init__(self) -> None:
+        self.spans: list[Span] = []
+        self.origin = time.perf_counter()
+        # Wall-clock time matching `origin`, so traces from separate runs line up.
+        self.origin_wall = time.time()
+        self._lock = threading.Lock()
+
+    def record(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+
+_active: Tracer | None = None
+
+
+def is_enabled() -> bool:
+    """Return True if a tracer is collecting spans."""
+    return _active is not None
+
+
+@contextmanager
+def tracing() -> Iterator[Tracer]:
+    """Collect spans for everything run inside the block."""
+    global _active
+
+    previous = _active
+    tracer = Tracer()
+    _active = tracer
+    try:
+        yield tracer
+    finally:
+        _active = previous
+
+
+@contextmanager
+def span(name: str, **attrs: Any) -> Iterator[Span]:
+    """Time the enclosed block as a span named `name`."""
+    tracer = _active
+    if tracer is None:
+        yield _NOOP_SPAN
+        return
+
+    current = Span(name=name, start=time.perf_counter(), attrs=dict(attrs), thread_id=threading.get_ident())
+    try:
+        yield current
+    finally:
+        current.duration = time.perf_counter() - current.start
+        tracer.record(current)
+
+
+def record_span(name: str, start: float, duration: float, **attrs: Any) -> None:
+    """Record a span measured elsewhere (e.g. accumulated read time)."""
+    tracer = _active
+    if tracer is None:
+        return
+    tracer.record(
+        Span(name=name, start=start, duration=duration, attrs=attrs, thread_id=threading.get_ident())
+    )
+
+
+def format_timings(tracer: Tracer) -> str:
+    """Render a per-phase breakdown aggregated by span name."""
+    totals: dict[str, dict[str, Any]] = {}
+    for item in sorted(tracer.spans, key=lambda entry: entry.start):
+        entry = totals.setdefault(item.name, {"count": 0, "seconds": 0.0, "attrs": {}})
+        entry["count"] += 1
+        entry["seconds"] += item.duration
+        for key, value in item.attrs.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                entry["attrs"][key] = entry["attrs"].get(key, 0) + value
+
+    lines = ["Timings:"]
+    width = max((len(name) for name in totals), default=0)
+    for name, entry in totals.items():
+        line = f"  {name:<{width}}  {entry['seconds'] * 1000:>9.1f} ms"
+        if entry["count"] > 1:
+            line += f"  x{entry['count']}"
+        details = ", ".join(f"{key}={value}" for key, value in entry["attrs"].items())
+        if details:
+            line += f"  ({details})"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def _event(tracer: Tracer, item: Span) -> dict:
+    """Convert a span to a Chrome trace 'complete' event (microseconds)."""
+    return {
+        "name": item.name,
+        "ph": "X",
+        "ts": round((tracer.origin_wall + item.start - tracer.origin) * 1_000_000),
+        "dur": round(item.duration * 1_000_000),
+        "pid": os.getpid(),
+        "tid": item.thread_id,
+        "args": item.attrs,
+    }
+
+
+def write_trace(tracer: Tracer, path: Path) -> None:
+    """
+    Append spans to a trace file.
+
+    `.json` files use the Chrome trace array format, left unterminated
+    so later runs can append (the viewer accepts a missing `]`); any other
+    suffix gets one JSON object per line.
+    """
+    events = [_event(tracer, item) for item in sorted(tracer.spans, key=lambda entry: entry.start)]
+    path.parent.mkdir(parents=True, exist_ok=True)
+    chrome = path.suffix == ".json"
+    is_new = not path.exists() or path.stat().st_size == 0
+    with path.open("a", encoding="utf-8") as handle:
+        if chrome and is_new:
+            handle.write("[\n")
+        for event in events:
+            line = json.dumps(event, sort_keys=True, default=str)
+            handle.write(f"{line},\n" if chrome else f"{line}\n")
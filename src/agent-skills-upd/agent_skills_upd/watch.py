@@ -0,0 +1,238 @@
+"""Keep installed resources in sync with their sources.
+
+Each pass polls the sources of due install records with the cheapest
+check each provider has (a conditional archive request, `git ls-remote`,
+the Clawdhub metadata document, a stat walk) and compares the result with
+the validators stored at install time. Only sources that changed are
+fetched, and installs only replace files whose content differs.
+
+Sources that keep not changing are polled less often, up to the maximum
+interval; a change resets the interval and errors back off. Every delay is
+jittered so that a fleet of watchers doesn't poll in lockstep.
+"""
+
+import json
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+from agent_skills_upd import installs
+from agent_skills_upd.exceptions import SkillUpdError
+from agent_skills_upd.fetcher import (
+    ResourceType,
+    extraction_pool,
+    fetch_clawdhub_skill,
+    sync_from_provider,
+)
+from agent_skills_upd.filters import FileFilter
+from agent_skills_upd.installs import InstallRecord
+
+DEFAULT_MIN_INTERVAL = 300.0
+DEFAULT_MAX_INTERVAL = 6 * 3600.0
+# Delays are spread over +/- this fraction.
+JITTER = 0.2
+POLL_WORKERS = 8
+
+
+@dataclass
+class WatchEvent:
+    """Outcome of checking one install record."""
+
+    record: InstallRecord
+    status: str  # "unchanged", "updated", "removed" or "error"
+    message: str = ""
+
+
+def next_interval(
+    record: InstallRecord,
+    changed: bool,
+    failed: bool,
+    min_interval: float = DEFAULT_MIN_INTERVAL,
+    max_interval: float = DEFAULT_MAX_INTERVAL,
+) -> float:
+    """
+    Return the polling interval to use after a check.
+
+    Args:
+        record: The record as it was before the check
+        changed: Whether the source had changed
+        failed: Whether the check failed
+        min_interval: Shortest interval, used after a change
+        max_interval: Longest interval
+
+    Returns:
+        Seconds until the next check, before jitter
+    """
+    if failed:
+        return min(max_interval, min_interval * 2 ** (record.failures + 1))
+    if changed:
+        return min_interval
+    return min(max_interval, max(record.interval, min_interval / 2) * 2)
+
+
+def _source_key(record: InstallRecord) -> str:
+    return json.dumps(record.source, sort_keys=True)
+
+
+def _poll_source(source: dict) -> dict:
+    from agent_skills_upd.providers import provider_from_spec
+
+    provider = provider_from_spec(source)
+    try:
+        return provider.poll()
+    finally:
+        provider.close()
+
+
+def _apply(record: InstallRecord) -> tuple[bool, InstallRecord]:
+    """Reinstall a record from its source; return (changed, refreshed record)."""
+    from agent_skills_upd.providers import provider_from_spec
+
+    path = Path(record.path)
+    # Reinstall with the filter the resource was installed with.
+    file_filter = FileFilter.from_dict(record.filters)
+    if record.source.get("provider") == "clawdhub":
+        result = fetch_clawdhub_skill(
+            record.source["slug"], path.parent, file_filter=file_filter
+        )
+        changed = result.old_version != result.new_version
+    else:
+        provider = provider_from_spec(record.source)
+        _, changed = sync_from_provider(
+            provider,
+            record.name,
+            path.parent,
+            ResourceType(record.resource_type),
+            file_filter=file_filter,
+        )
+
+    # The install rewrote the record (validators, digests); continue from it.
+    refreshed = installs.load_record(Path(record.path)) or record
+    refreshed.interval, refreshed.failures = record.interval, record.failures
+    return changed, refreshed
+
+
+def check_once(
+    resource_type: ResourceType | None = None,
+    force: bool = False,
+    min_interval: float = DEFAULT_MIN_INTERVAL,
+    max_interval: float = DEFAULT_MAX_INTERVAL,
+    now: float | None = None,
+) -> list[WatchEvent]:
+    """
+    Check every due install record once and apply source changes.
+
+    Each distinct source is polled once per pass, however many install
+    records share it.
+
+    Args:
+        resource_type: Only check this kind of resource (None for all)
+        force: Check every record, not only those that are due
+        min_interval: Shortest polling interval in seconds
+        max_interval: Longest polling interval in seconds
+        now: Current time (defaults to time.time())
+
+    Returns:
+        One event per checked record
+    """
+    now = time.time() if now is None else now
+    due = [
+        record
+        for record in installs.load_records(with_files=False)
+        if (resource_type is None or record.resource_type == resource_type.value)
+        and (force or record.next_check <= now)
+    ]
+    if not due:
+        return []
+
+    events: list[WatchEvent] = []
+    removed = [record for record in due if not Path(record.path).exists()]
+    events.extend(WatchEvent(record, "removed") for record in removed)
+    due = [record for record in due if record not in removed]
+
+    sources = {_source_key(record): record.source for record in due}
+    polled: dict[str, dict | Exception] = {}
+
+    def poll(key: str) -> None:
+        try:
+            polled[key] = _poll_source(sources[key])
+        except (SkillUpdError, OSError) as exc:
+            polled[key] = exc
+
+    with ThreadPoolExecutor(max_workers=POLL_WORKERS) as pool:
+        list(pool.map(poll, sources))
+
+    stale = [
+        record
+        for record in due
+        if not isinstance(polled[_source_key(record)], Exception)
+        and polled[_source_key(record)] != record.validators
+    ]
+    applied: dict[str, tuple[bool, InstallRecord] | Exception] = {}
+
+    def apply(record: InstallRecord) -> None:
+        try:
+            applied[record.path] = _apply(record)
+        except (SkillUpdError, OSError) as exc:
+            applied[record.path] = exc
+
+    # Reinstalls run concurrently, extracting archives in worker processes.
+    workers = min(POLL_WORKERS, len(stale))
+    if stale:
+        with extraction_pool(workers), ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(apply, stale))
+
+    updated: list[InstallRecord] = []
+    for record in due:
+        result = polled[_source_key(record)]
+        outcome = applied.get(record.path)
+        changed = failed = False
+        message = ""
+        if isinstance(result, Exception):
+            failed, message = True, str(result)
+        elif isinstance(outcome, Exception):
+            failed, message = True, str(outcome)
+        elif outcome is not None:
+            changed, record = outcome
+
+        record.interval = next_interval(record, changed, failed, min_interval, max_interval)
+        record.failures = record.failures + 1 if failed else 0
+        record.checked_at = now
+        record.next_check = now + record.interval * random.uniform(1 - JITTER, 1 + JITTER)
+        updated.append(record)
+        status = "error" if failed else "updated" if changed else "unchanged"
+        events.append(WatchEvent(record, status, message))
+
+    installs.update_records(updated, [record.path for record in removed])
+    return events
+
+
+def watch(
+    resource_type: ResourceType | None = None,
+    min_interval: float = DEFAULT_MIN_INTERVAL,
+    max_interval: float = DEFAULT_MAX_INTERVAL,
+    on_event: Callable[[WatchEvent], None] | None = None,
+    sleep: Callable[[float], None] = time.sleep,
+) -> None:
+    """
+    Check install records forever, sleeping until the next one is due.
+
+    The first pass checks every record regardless of its schedule.
+    """
+    force = True
+    while True:
+        for event in check_once(resource_type, force, min_interval, max_interval):
+            if on_event is not None:
+                on_event(event)
+        force = False
+
+        pending = [
+            record.next_check
+            for record in installs.load_records(with_files=False)
+            if resource_type is None or record.resource_type == resource_type.value
+        ]
+        delay = (min(pending) - time.time()) if pending else min_interval
+        sleep(min(max(delay, 1.0), max_interval))
@@ -0,0 +1,153 @@
+"""Benchmark archive decompression throughput per gzip backend.
+
+Usage:
+    python benchmarks/bench_gzip.py --size 100MB --files 1000
+    python benchmarks/bench_gzip.py --preset medium --output gzip.json
+
+For each installed backend (see agent_skills_upd.gzip_backend) this
+measures inflating a synthetic branch archive (`inflate`) and extracting
+it with `fetcher.extract_tarball` (`extract`), plus the plain
+`tarfile.open(mode="r:gz")` baseline the fetcher used before. Throughput
+is reported in decompressed MB per second (median of --repeat runs).
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tarfile
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from bench_pipeline import PRESETS, git_revision, parse_size
+from synthetic import RepoSpec, generate_repo
+
+SCHEMA_VERSION = 1
+SUITE = "gzip-backends"
+
+
+def _median_seconds(run, repeat: int) -> float:
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations)
+
+
+def measure_backend(backend: str, archive: Path, workdir: Path, repeat: int) -> dict | None:
+    """Return inflate/extract timings for one backend, or None if it isn't installed."""
+    from agent_skills_upd import gzip_backend
+    from agent_skills_upd.fetcher import extract_tarball
+
+    os.environ[gzip_backend.GZIP_BACKEND_ENV] = backend
+    if gzip_backend.backend_name() != backend:
+        return None
+
+    def inflate() -> int:
+        total = 0
+        with archive.open("rb") as raw, gzip_backend.open_gzip(raw) as stream:
+            while chunk := stream.read(gzip_backend.READ_BUFFER_SIZE):
+                total += len(chunk)
+        return total
+
+    def extract() -> None:
+        target = workdir / f"extract-{backend}"
+        extract_tarball(archive, target)
+        shutil.rmtree(target)
+
+    return {
+        "inflate_s": _median_seconds(inflate, repeat),
+        "extract_s": _median_seconds(extract, repeat),
+        "raw_bytes": inflate(),
+    }
+
+
+def measure_baseline(archive: Path, workdir: Path, repeat: int) -> float:
+    """Extraction time with tarfile's own gzip handling (small reads, stdlib zlib)."""
+
+    def extract() -> None:
+        target = workdir / "extract-baseline"
+        with tarfile.open(archive, mode="r:gz") as tar:
+            try:
+                tar.extractall(target, filter="data")
+            except TypeError:
+                tar.extractall(target)
+        shutil.rmtree(target)
+
+    return _median_seconds(extract, repeat)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--preset", choices=list(PRESETS), default="small")
+    parser.add_argument("--files", type=int, help="Override file count.")
+    parser.add_argument("--size", help="Override total size, e.g. 100MB.")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="Write JSON results here.")
+    args = parser.parse_args()
+
+    files, size = PRESETS[args.preset]
+    spec = RepoSpec(
+        files=args.files or files,
+        total_bytes=parse_size(args.size) if args.size else size,
+        seed=args.seed,
+    )
+
+    from agent_skills_upd.gzip_backend import BACKENDS
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        workdir = Path(tmp_dir)
+        repo = generate_repo(spec, workdir / "repo")
+        baseline_s = measure_baseline(repo.archive, workdir, args.repeat)
+        for backend in BACKENDS:
+            measured = measure_backend(backend, repo.archive, workdir, args.repeat)
+            if measured is None:
+                print(f"{backend:<8} not installed", file=sys.stderr)
+                continue
+            megabytes = measured["raw_bytes"] / 1024**2
+            result = {
+                "backend": backend,
+                "archive_bytes": repo.archive.stat().st_size,
+                **measured,
+                "inflate_mb_s": megabytes / measured["inflate_s"],
+                "extract_mb_s": megabytes / measured["extract_s"],
+                "baseline_extract_mb_s": megabytes / baseline_s,
+            }
+            results.append(result)
+            print(
+                f"{backend:<8} inflate {result['inflate_mb_s']:>8.1f} MB/s  "
+                f"extract {result['extract_mb_s']:>8.1f} MB/s  "
+                f"(tarfile r:gz {result['baseline_extract_mb_s']:.1f} MB/s)",
+                file=sys.stderr,
+            )
+
+    report = {
+        "schema_version": SCHEMA_VERSION,
+        "suite": SUITE,
+        "revision": git_revision(),
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "spec": spec.to_dict(),
+        "results": results,
+    }
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+"""Benchmark the fetch/extract/install pipeline on synthetic repositories.
+
+Usage:
+    python benchmarks/bench_pipeline.py --preset small --layouts all
+    python benchmarks/bench_pipeline.py --files 5000 --size 200MB --latency 0.05 \\
+        --bandwidth 10MB --output results.json
+
+Each scenario generates a synthetic repository, serves its archive from a
+local HTTP server and runs the install in a fresh subprocess so peak RSS is
+measured per scenario. Results are written in a stable JSON format (see
+SCHEMA_VERSION) that benchmarks/compare.py can diff across revisions.
+"""
+
+import argparse
+import json
+import platform
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from server import ArchiveServer
+from synthetic import LAYOUTS, RepoSpec, generate_repo
+
+SCHEMA_VERSION = 1
+SUITE = "fetch-pipeline"
+USERNAME = "bench"
+
+PRESETS = {
+    "smoke": (10, 10 * 1024),
+    "small": (100, 1024**2),
+    "medium": (1_000, 10 * 1024**2),
+    "large": (10_000, 100 * 1024**2),
+    "xlarge": (100_000, 1024**3),
+}
+
+UNITS = {"B": 1, "KB": 1024, "MB": 1024**2, "GB": 1024**3}
+
+
+def parse_size(value: str) -> int:
+    """Parse sizes like 512, 10KB, 1.5GB."""
+    text = value.strip().upper().removesuffix("IB").removesuffix("B")
+    for suffix, factor in (("G", UNITS["GB"]), ("M", UNITS["MB"]), ("K", UNITS["KB"])):
+        if text.endswith(suffix):
+            return int(float(text[: -len(suffix)]) * factor)
+    return int(float(text))
+
+
+def scenario_id(spec: RepoSpec) -> str:
+    return f"{spec.layout}-{spec.files}f-{spec.total_bytes}B"
+
+
+def peak_rss_kb() -> int:
+    """Peak resident set size of this process in KiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def tree_bytes(path: Path) -> int:
+    if path.is_file():
+        return path.stat().st_size
+    return sum(entry.stat().st_size for entry in path.rglob("*") if entry.is_file())
+
+
+def run_one(base_url: str, spec: RepoSpec, repeat: int) -> dict:
+    """Run one scenario in this process and return its measurements."""
+    from agent_skills_upd import tracing
+    from agent_skills_upd.fetcher import ResourceType, fetch_resource
+
+    end_to_end = []
+    phase_runs: dict[str, list[float]] = {}
+    bytes_written = 0
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            dest = Path(tmp_dir) / "dest"
+            with tracing.tracing() as tracer:
+                start = time.perf_counter()
+                installed = fetch_resource(
+                    USERNAME,
+                    spec.skill_name,
+                    dest,
+                    ResourceType.SKILL,
+                    overwrite=True,
+                    host=base_url,
+                    repo=spec.repo_name,
+                )
+                end_to_end.append(time.perf_counter() - start)
+            bytes_written = tree_bytes(installed)
+
+            phases: dict[str, float] = {}
+            for span in tracer.spans:
+                phases[span.name] = phases.get(span.name, 0.0) + span.duration
+            for name, seconds in phases.items():
+                phase_runs.setdefault(name, []).append(seconds)
+
+    return {
+        "end_to_end_s": statistics.median(end_to_end),
+        "phases_s": {name: statistics.median(runs) for name, runs in sorted(phase_runs.items())},
+        "peak_rss_kb": peak_rss_kb(),
+        "bytes_written": bytes_written,
+    }
+
+
+def run_scenario(spec: RepoSpec, args: argparse.Namespace) -> dict:
+    """Generate, serve and measure one scenario in a child process."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        repo = generate_repo(spec, Path(tmp_dir))
+        with ArchiveServer(latency=args.latency, bandwidth=args.bandwidth) as server:
+            server.add_archive(USERNAME, spec.repo_name, repo.archive)
+            child = subprocess.run(
+                [
+                    sys.executable,
+                    __file__,
+                    "--run-one",
+                    json.dumps(
+                        {"base_url": server.base_url, "spec": spec.to_dict(), "repeat": args.repeat}
+                    ),
+                ],
+                capture_output=True,
+                text=True,
+                env={
+                    **os.environ,
+                    "AGENT_SKILLS_UPD_NO_DAEMON": "1",
+                    "AGENT_SKILLS_UPD_CACHE_DIR": str(Path(tmp_dir) / "cache"),
+                },
+            )
+        if child.returncode != 0:
+            raise RuntimeError(f"Scenario {scenario_id(spec)} failed:\n{child.stderr}")
+        measurements = json.loads(child.stdout)
+        return {
+            "id": scenario_id(spec),
+            "spec": spec.to_dict(),
+            "archive_bytes": repo.archive.stat().st_size,
+            "resource_files": repo.resource_files,
+            "resource_bytes": repo.resource_bytes,
+            **measurements,
+        }
+
+
+def git_revision() -> str | None:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).parent,
+        )
+        return result.stdout.strip()
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return None
+
+
+def gzip_backend_name() -> str:
+    from agent_skills_upd.gzip_backend import backend_name
+
+    return backend_name()
+
+
+def build_specs(args: argparse.Namespace) -> list[RepoSpec]:
+    layouts = list(LAYOUTS) if args.layouts == "all" else args.layouts.split(",")
+    if args.files is not None or args.size is not None:
+        default_files, default_size = PRESETS[args.preset]
+        sizes = [(args.files or default_files, parse_size(args.size) if args.size else default_size)]
+    elif args.preset == "sweep":
+        sizes = list(PRESETS.values())[:-1]
+    else:
+        sizes = [PRESETS[args.preset]]
+    return [
+        RepoSpec(layout=layout, files=files, total_bytes=size, seed=args.seed)
+        for files, size in sizes
+        for layout in layouts
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--preset", choices=[*PRESETS, "sweep"], default="smoke")
+    parser.add_argument("--files", type=int, help="Override file count.")
+    parser.add_argument("--size", help="Override total size, e.g. 10MB.")
+    parser.add_argument("--layouts", default="claude", help="Comma list or 'all'.")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds per response.")
+    parser.add_argument("--bandwidth", type=parse_size, help="Bytes per second, e.g. 10MB.")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="Write JSON results here.")
+    parser.add_argument("--run-one", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_one:
+        payload = json.loads(args.run_one)
+        print(json.dumps(run_one(payload["base_url"], RepoSpec(**payload["spec"]), payload["repeat"])))
+        return
+
+    results = []
+    for spec in build_specs(args):
+        result = run_scenario(spec, args)
+        results.append(result)
+        print(
+            f"{result['id']:<40} total {result['end_to_end_s'] * 1000:>9.1f} ms  "
+            + "  ".join(f"{k} {v * 1000:.1f}" for k, v in result["phases_s"].items())
+            + f"  rss {result['peak_rss_kb'] / 1024:.1f} MiB",
+            file=sys.stderr,
+        )
+
+    report = {
+        "schema_version": SCHEMA_VERSION,
+        "suite": SUITE,
+        "revision": git_revision(),
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "gzip_backend": gzip_backend_name(),
+        },
+        "network": {"latency_s": args.latency, "bandwidth_bps": args.bandwidth},
+        "results": results,
+    }
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Measure cold-start cost of the CLI entry points.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs N] [--json]
+
+Each run spawns a fresh interpreter, so the numbers include interpreter
+start-up and every import made by the entry point before it can print help.
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+ENTRY_POINTS = {
+    "skill-upd --help": "agent_skills_upd.cli.skill",
+    "command-upd --help": "agent_skills_upd.cli.command",
+    "agent-upd --help": "agent_skills_upd.cli.agent",
+}
+
+
+def time_entry_point(module: str, runs: int) -> list[float]:
+    """Return wall-clock seconds for `python -m <module> --help` over N runs."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-m", module, "--help"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            check=True,
+        )
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--json", action="store_true", help="Emit JSON results.")
+    args = parser.parse_args()
+
+    results = {}
+    for label, module in ENTRY_POINTS.items():
+        timings = time_entry_point(module, args.runs)
+        results[label] = {
+            "runs": args.runs,
+            "median_ms": round(statistics.median(timings) * 1000, 2),
+            "min_ms": round(min(timings) * 1000, 2),
+        }
+
+    if args.json:
+        print(json.dumps(results, indent=2, sort_keys=True))
+        return
+
+    for label, stats in results.items():
+        print(f"{label:<22} median {stats['median_ms']:>8.2f} ms  min {stats['min_ms']:>8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Compare two benchmark result files.
+
+Usage:
+    python benchmarks/compare.py baseline.json candidate.json
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+METRICS = ("end_to_end_s", "peak_rss_kb", "bytes_written")
+
+
+def load(path: Path) -> dict:
+    report = json.loads(path.read_text(encoding="utf-8"))
+    if report.get("schema_version") != 1:
+        sys.exit(f"{path}: unsupported schema_version {report.get('schema_version')}")
+    return {result["id"]: result for result in report["results"]}
+
+
+def ratio(old: float, new: float) -> str:
+    if not old:
+        return "   n/a"
+    return f"{(new - old) / old * 100:+6.1f}%"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("candidate", type=Path)
+    args = parser.parse_args()
+
+    baseline = load(args.baseline)
+    candidate = load(args.candidate)
+    for scenario in sorted(baseline.keys() & candidate.keys()):
+        old, new = baseline[scenario], candidate[scenario]
+        print(scenario)
+        for metric in METRICS:
+            print(f"  {metric:<16} {old[metric]:>14.4f} -> {new[metric]:>14.4f}  {ratio(old[metric], new[metric])}")
+        for phase in sorted(old["phases_s"].keys() & new["phases_s"].keys()):
+            o, n = old["phases_s"][phase], new["phases_s"][phase]
+            print(f"  phase {phase:<10} {o:>14.4f} -> {n:>14.4f}  {ratio(o, n)}")
+
+    for scenario in sorted(baseline.keys() ^ candidate.keys()):
+        side = "baseline" if scenario in baseline else "candidate"
+        print(f"{scenario}: only in {side}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+"""Local HTTP stand-in for GitHub and Clawdhub.
+
+Serves branch archives in GitHub's URL shape
+(`/<user>/<repo>/archive/refs/heads/<ref>.tar.gz`), smart-HTTP default
+branch advertisements, and Clawdhub's `/api/skill` and `/api/download`
+endpoints, from archives or fixture directories. Point Clawdhub requests
+at it with AGENT_SKILLS_UPD_CLAWDHUB_API=<base_url>/api.
+
+Downloads carry an ETag: `If-None-Match` revalidations get a 304 and
+single `Range` requests a 206. Costs and faults can be injected:
+
+- latency: seconds added before each response
+- bandwidth: bytes per second for response bodies
+- error_rate: fraction of requests answered with a 503 (seeded, so
+  runs are reproducible)
+- rate_limit: requests allowed before 429s; every response carries
+  GitHub's X-RateLimit-* headers when set
+- redirects: archives redirect to a codeload-style URL, as on github.com
+- stall: seconds to wait between headers and body, to trigger timeouts
+"""
+
+import io
+import json
+import random
+import re
+import shutil
+import tarfile
+import tempfile
+import threading
+import time
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+CHUNK_SIZE = 64 * 1024
+RATE_LIMIT_WINDOW = 3600
+
+_RANGE_RE = re.compile(r"bytes=(\d*)-(\d*)$")
+
+
+def _pkt_line(data: bytes) -> bytes:
+    return f"{len(data) + 4:04x}".encode() + data
+
+
+def _advertisement(ref: str) -> bytes:
+    """Minimal upload-pack ref advertisement naming `ref` as HEAD's target."""
+    head = b"0" * 40 + b" HEAD\0symref=HEAD:refs/heads/" + ref.encode() + b"\n"
+    return _pkt_line(b"# service=git-upload-pack\n") + b"0000" + _pkt_line(head) + b"0000"
+
+
+def _zip_directory(directory: Path) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for path in sorted(directory.rglob("*")):
+            if path.is_file():
+                archive.write(path, path.relative_to(directory).as_posix())
+    return buffer.getvalue()
+
+
+class ArchiveServer:
+    """Serve repository archives and Clawdhub skills from local files.
+
+    Each archive's ref is also advertised as the default branch at
+    `/<user>/<repo>.git/info/refs`, like a smart-HTTP git host.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        bandwidth: int | None = None,
+        error_rate: float = 0.0,
+        rate_limit: int | None = None,
+        redirects: bool = False,
+        stall: float = 0.0,
+        seed: int = 0,
+    ):
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.redirects = redirects
+        self.stall = stall
+        self.archives: dict[str, Path] = {}
+        self.advertisements: dict[str, bytes] = {}
+        # slug -> (metadata document, package path)
+        self.clawdhub: dict[str, tuple[dict, Path]] = {}
+        self.bytes_sent = 0
+        self.requests = 0  # download requests, including revalidations
+        self.log: list[tuple[str, int]] = []  # (path, status) of every request
+        self._random = random.Random(seed)
+        self._served = 0
+        self._lock = threading.Lock()
+        self._workdir: Path | None = None
+        self._httpd: ThreadingHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+
+    def add_archive(self, username: str, repo: str, archive: Path, ref: str = "main") -> None:
+        self.archives[f"/{username}/{repo}/archive/refs/heads/{ref}.tar.gz"] = archive
+        self.advertisements[f"/{username}/{repo}.git/info/refs"] = _advertisement(ref)
+
+    def add_repo(self, username: str, repo: str, directory: Path, ref: str = "main") -> Path:
+        """Serve a fixture directory as the repo's branch archive; return the archive."""
+        archive = self._scratch() / f"{username}-{repo}-{ref.replace('/', '-')}.tar.gz"
+        with tarfile.open(archive, "w:gz") as tar:
+            tar.add(directory, arcname=f"{repo}-{ref.replace('/', '-')}")
+        self.add_archive(username, repo, archive, ref)
+        return archive
+
+    def add_clawdhub_skill(self, slug: str, source: Path, version: str = "1.0.0") -> None:
+        """Publish a skill directory (or a ready .zip package) on the Clawdhub API."""
+        if source.is_dir():
+            package = self._scratch() / f"{slug}-{version}.zip"
+            package.write_bytes(_zip_directory(source))
+        else:
+            package = source
+        metadata = {"skill": {"slug": slug}, "latestVersion": {"version": version}}
+        self.clawdhub[slug] = (metadata, package)
+
+    def _scratch(self) -> Path:
+        if self._workdir is None:
+            self._workdir = Path(tempfile.mkdtemp(prefix="archive-server-"))
+        return self._workdir
+
+    @property
+    def base_url(self) -> str:
+        assert self._httpd is not None, "server not started"
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _admit(self) -> tuple[int | None, dict[str, str]]:
+        """Apply injected faults; return an error status (or None) and extra headers."""
+        with self._lock:
+            self._served += 1
+            headers = {}
+            if self.rate_limit is not None:
+                remaining = max(self.rate_limit - self._served, 0)
+                headers = {
+                    "X-RateLimit-Limit": str(self.rate_limit),
+                    "X-RateLimit-Remaining": str(remaining),
+                    "X-RateLimit-Reset": str(int(time.time()) + RATE_LIMIT_WINDOW),
+                }
+                if self._served > self.rate_limit:
+                    return 429, {**headers, "Retry-After": str(RATE_LIMIT_WINDOW)}
+            if self.error_rate and self._random.random() < self.error_rate:
+                return 503, headers
+        return None, headers
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):  # noqa: A002 - stdlib signature
+                pass
+
+            def _reply(self, status: int, headers: dict[str, str], body: bytes = b"") -> None:
+                with server._lock:
+                    server.log.append((self.path, status))
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if body:
+                    self.wfile.write(body)
+
+            def do_GET(self):
+                if server.latency:
+                    time.sleep(server.latency)
+                error, headers = server._admit()
+                if error is not None:
+                    self._reply(error, headers)
+                    return
+
+                url = urlsplit(self.path)
+                query = {key: values[0] for key, values in parse_qs(url.query).items()}
+                advertisement = server.advertisements.get(url.path)
+                if advertisement is not None:
+                    content_type = "application/x-git-upload-pack-advertisement"
+                    self._reply(200, {**headers, "Content-Type": content_type}, advertisement)
+                    return
+
+                if url.path in server.archives and server.redirects:
+                    location = "/codeload" + url.path.replace("/archive/", "/tar.gz/", 1)
+                    self._reply(302, {**headers, "Location": location})
+                    return
+                if url.path.startswith("/codeload/"):
+                    original = url.path[len("/codeload") :].replace("/tar.gz/", "/archive/", 1)
+                    archive = server.archives.get(original)
+                else:
+                    archive = server.archives.get(url.path)
+                if archive is not None:
+                    self._send_file(archive, "application/x-gzip", headers)
+                    return
+
+                skill = server.clawdhub.get(query.get("slug", ""))
+                if url.path == "/api/skill" and skill is not None:
+                    body = json.dumps(skill[0]).encode("utf-8")
+                    self._reply(200, {**headers, "Content-Type": "application/json"}, body)
+                    return
+                if url.path == "/api/download" and skill is not None:
+                    self._send_file(skill[1], "application/zip", headers)
+                    return
+                self._reply(404, headers)
+
+            def _send_file(self, path: Path, content_type: str, headers: dict[str, str]) -> None:
+                stat = path.stat()
+                size = stat.st_size
+                etag = f'"{stat.st_mtime_ns:x}-{size:x}"'
+                headers = {**headers, "ETag": etag, "Accept-Ranges": "bytes"}
+                with server._lock:
+                    server.requests += 1
+                if self.headers.get("If-None-Match") == etag:
+                    self._reply(304, headers)
+                    return
+
+                start, end, status = 0, size - 1, 200
+                requested = self.headers.get("Range")
+                if requested:
+                    match = _RANGE_RE.match(requested.strip())
+                    if match is None or match.groups() == ("", ""):
+                        self._reply(416, {**headers, "Content-Range": f"bytes */{size}"})
+                        return
+                    first, last = match.groups()
+                    if first:
+                        start, end = int(first), min(int(last), size - 1) if last else size - 1
+                    else:
+                        start = max(size - int(last), 0)
+                    if start > end:
+                        self._reply(416, {**headers, "Content-Range": f"bytes */{size}"})
+                        return
+                    status = 206
+                    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+
+                with server._lock:
+                    server.log.append((self.path, status))
+                self.send_response(status)
+                for name, value in {**headers, "Content-Type": content_type}.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(end - start + 1))
+                self.end_headers()
+                if server.stall:
+                    self.wfile.flush()
+                    time.sleep(server.stall)
+                self._send_body(path, start, end - start + 1)
+
+            def _send_body(self, path: Path, offset: int, length: int) -> None:
+                started = time.perf_counter()
+                sent = 0
+                try:
+                    with path.open("rb") as handle:
+                        handle.seek(offset)
+                        while sent < length:
+                            chunk = handle.read(min(CHUNK_SIZE, length - sent))
+                            if not chunk:
+                                break
+                            self.wfile.write(chunk)
+                            sent += len(chunk)
+                            if server.bandwidth:
+                                ahead = sent / server.bandwidth - (time.perf_counter() - started)
+                                if ahead > 0:
+                                    time.sleep(ahead)
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client gave up (timeout or cancelled download).
+                    pass
+                with server._lock:
+                    server.bytes_sent += sent
+
+        return Handler
+
+    def __enter__(self) -> "ArchiveServer":
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        assert self._httpd is not None
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._workdir is not None:
+            shutil.rmtree(self._workdir, ignore_errors=True)
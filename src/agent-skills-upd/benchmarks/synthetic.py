@@ -0,0 +1,133 @@
+"""Synthetic agent-resources repositories for benchmarks.
+
+A synthetic repo contains one target skill laid out in one of the
+supported repository structures, plus sibling skills that act as the
+rest of the repository. File contents are deterministic for a given
+seed so runs are comparable across revisions.
+"""
+
+import random
+import tarfile
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+# Where the target skill lives for each supported layout (see
+# RESOURCE_SEARCH_PATTERNS in agent_skills_upd.fetcher).
+LAYOUTS = {
+    "claude": ".claude/skills/{name}",
+    "rootdir": "{name}",
+    "anthropic": "skills/{name}",
+    "opencode": "skill/{name}",
+    "openai-curated": "skills/.curated/{name}",
+    "openai-experimental": "skills/.experimental/{name}",
+    "root": "",
+}
+
+# Layouts that only resolve when --repo points at a non-default repository.
+CUSTOM_REPO_LAYOUTS = {"root"}
+
+BLOCK_SIZE = 64 * 1024
+
+
+@dataclass(frozen=True)
+class RepoSpec:
+    """Shape of a synthetic repository."""
+
+    layout: str = "claude"
+    files: int = 10
+    total_bytes: int = 10 * 1024
+    resource_fraction: float = 0.1
+    skill_name: str = "bench-skill"
+    seed: int = 0
+
+    @property
+    def repo_name(self) -> str:
+        return "bench-root" if self.layout in CUSTOM_REPO_LAYOUTS else "agent-resources"
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+@dataclass
+class SyntheticRepo:
+    """A generated repository and its GitHub-style archive."""
+
+    spec: RepoSpec
+    tree: Path
+    archive: Path
+    resource_files: int
+    resource_bytes: int
+
+
+def _payload(rng: random.Random) -> bytes:
+    """Return a block of pseudo-random bytes that files are sliced from."""
+    return rng.randbytes(BLOCK_SIZE)
+
+
+def _write_file(path: Path, size: int, block: bytes, offset: int) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("wb") as handle:
+        remaining = size
+        while remaining > 0:
+            start = offset % BLOCK_SIZE
+            chunk = block[start : start + min(remaining, BLOCK_SIZE - start)]
+            handle.write(chunk)
+            remaining -= len(chunk)
+            offset += len(chunk)
+
+
+def _skill_md(name: str) -> str:
+    return f"---\nname: {name}\ndescription: Synthetic benchmark skill\n---\n\n# {name}\n"
+
+
+def generate_repo(spec: RepoSpec, workdir: Path) -> SyntheticRepo:
+    """
+    Generate a synthetic repo tree and its `<repo>-main` tar.gz archive.
+
+    Args:
+        spec: Repository shape
+        workdir: Directory to generate into (must be empty or absent)
+
+    Returns:
+        SyntheticRepo describing the generated tree and archive.
+    """
+    if spec.layout not in LAYOUTS:
+        raise ValueError(f"Unknown layout '{spec.layout}'. Available: {', '.join(LAYOUTS)}")
+
+    rng = random.Random(spec.seed)
+    block = _payload(rng)
+    root_name = f"{spec.repo_name}-main"
+    tree = workdir / root_name
+    tree.mkdir(parents=True)
+
+    resource_rel = LAYOUTS[spec.layout].format(name=spec.skill_name)
+    resource_dir = tree / resource_rel if resource_rel else tree
+    resource_dir.mkdir(parents=True, exist_ok=True)
+    (resource_dir / "SKILL.md").write_text(_skill_md(spec.skill_name), encoding="utf-8")
+
+    data_files = max(spec.files - 1, 0)
+    resource_count = min(data_files, max(1, round(data_files * spec.resource_fraction)))
+    file_size = spec.total_bytes // max(data_files, 1)
+    sibling_parent = (resource_dir.parent if resource_rel else tree) / "_siblings"
+
+    resource_bytes = 0
+    for index in range(data_files):
+        if index < resource_count:
+            path = resource_dir / "data" / f"{index // 1000:03d}" / f"file-{index}.bin"
+            resource_bytes += file_size
+        else:
+            sibling = f"sibling-{index % 50}"
+            path = sibling_parent / sibling / f"file-{index}.bin"
+        _write_file(path, file_size, block, rng.randrange(BLOCK_SIZE))
+
+    archive = workdir / f"{root_name}.tar.gz"
+    with tarfile.open(archive, "w:gz", compresslevel=6) as tar:
+        tar.add(tree, arcname=root_name)
+
+    return SyntheticRepo(
+        spec=spec,
+        tree=tree,
+        archive=archive,
+        resource_files=resource_count + 1,
+        resource_bytes=resource_bytes,
+    )
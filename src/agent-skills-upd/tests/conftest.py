@@ -0,0 +1,44 @@
+"""Shared pytest fixtures."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+from agent_skills_upd.cache import CACHE_DIR_ENV
+from agent_skills_upd.fetcher import CLAWDHUB_API_ENV
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "benchmarks"))
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path, monkeypatch):
+    """Keep every test's cache out of the real user cache directory."""
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setenv(CACHE_DIR_ENV, str(cache_dir))
+    return cache_dir
+
+
+@pytest.fixture
+def fake_host(monkeypatch):
+    """
+    Run the local GitHub/Clawdhub stand-in, with Clawdhub requests sent to it.
+
+    Repos are fetched with host=fake_host.base_url. Faults (error_rate,
+    rate_limit, stall, ...) can be switched on by setting the attributes.
+    """
+    from server import ArchiveServer
+
+    with ArchiveServer() as server:
+        monkeypatch.setenv(CLAWDHUB_API_ENV, f"{server.base_url}/api")
+        yield server
+
+
+@pytest.fixture
+def bench_repo(fake_host, tmp_path):
+    """A small synthetic repo with skill `bench-skill`, published on fake_host by `bench`."""
+    from synthetic import RepoSpec, generate_repo
+
+    repo = generate_repo(RepoSpec(files=10, total_bytes=32 * 1024), tmp_path / "repo")
+    fake_host.add_archive("bench", repo.spec.repo_name, repo.archive)
+    return repo
@@ -0,0 +1,15 @@
+"""Helpers for tests that patch httpx.Client with mocks."""
+
+from contextlib import nullcontext
+
+
+def serve_streams(mock_client) -> None:
+    """Answer `client.stream()` like the mocked `client.get()`, so streamed downloads work."""
+    client = mock_client.return_value.__enter__.return_value
+
+    def stream(method, url, **kwargs):
+        response = client.get(url, **kwargs)
+        response.iter_bytes.side_effect = lambda chunk_size=None: iter([response.content])
+        return nullcontext(response)
+
+    client.stream.side_effect = stream
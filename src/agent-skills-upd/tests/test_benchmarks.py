@@ -0,0 +1,66 @@
+"""Smoke test keeping the benchmark suite runnable."""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+BENCHMARKS_DIR = Path(__file__).parent.parent / "benchmarks"
+
+
+def test_pipeline_benchmark_smoke(tmp_path):
+    """The smallest preset runs end to end and writes a schema v1 report."""
+    output = tmp_path / "results.json"
+    subprocess.run(
+        [
+            sys.executable,
+            str(BENCHMARKS_DIR / "bench_pipeline.py"),
+            "--preset",
+            "smoke",
+            "--layouts",
+            "claude,root",
+            "--repeat",
+            "1",
+            "--output",
+            str(output),
+        ],
+        check=True,
+        capture_output=True,
+    )
+
+    report = json.loads(output.read_text(encoding="utf-8"))
+    assert report["schema_version"] == 1
+    assert [result["id"] for result in report["results"]] == [
+        "claude-10f-10240B",
+        "root-10f-10240B",
+    ]
+    for result in report["results"]:
+        assert {"download", "extract", "find", "copy"} <= set(result["phases_s"])
+        assert result["bytes_written"] > 0
+        assert result["peak_rss_kb"] > 0
+
+
+def test_gzip_benchmark_smoke(tmp_path):
+    """The gzip backend benchmark measures at least the stdlib backend."""
+    output = tmp_path / "gzip.json"
+    subprocess.run(
+        [
+            sys.executable,
+            str(BENCHMARKS_DIR / "bench_gzip.py"),
+            "--preset",
+            "smoke",
+            "--repeat",
+            "1",
+            "--output",
+            str(output),
+        ],
+        check=True,
+        capture_output=True,
+    )
+
+    report = json.loads(output.read_text(encoding="utf-8"))
+    assert report["suite"] == "gzip-backends"
+    backends = {result["backend"]: result for result in report["results"]}
+    assert "stdlib" in backends
+    assert backends["stdlib"]["inflate_mb_s"] > 0
+    assert backends["stdlib"]["extract_mb_s"] > 0
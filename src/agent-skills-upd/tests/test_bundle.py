@@ -0,0 +1,87 @@
+"""Tests for offline bundles."""
+
+import json
+import zipfile
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from typer.testing import CliRunner
+
+from agent_skills_upd.bundle import BUNDLE_INDEX, fetch_bundle_resource
+from agent_skills_upd.cli.command import app as command_app
+from agent_skills_upd.cli.skill import app as skill_app
+from agent_skills_upd.exceptions import IntegrityError, ResourceNotFoundError
+from agent_skills_upd.fetcher import ResourceType
+
+
+def write_repo(root: Path) -> Path:
+    for name in ("alpha", "beta"):
+        skill_dir = root / ".claude" / "skills" / name
+        skill_dir.mkdir(parents=True, exist_ok=True)
+        (skill_dir / "SKILL.md").write_text(f"---\nname: {name}\n---\n{name}\n")
+        (skill_dir / "run.sh").write_text("#!/bin/sh\n")
+        (skill_dir / "run.sh").chmod(0o755)
+    commands = root / ".claude" / "commands"
+    commands.mkdir(parents=True, exist_ok=True)
+    (commands / "hello.md").write_text("# hello")
+    return root
+
+
+@pytest.fixture
+def bundle(tmp_path) -> Path:
+    source = write_repo(tmp_path / "repo")
+    output = tmp_path / "out" / "resources.zip"
+    result = CliRunner().invoke(
+        skill_app,
+        ["bundle", str(output), f"{source}#alpha", f"{source}#beta", f"command:{source}#hello"],
+    )
+    assert result.exit_code == 0, result.output
+    assert "Bundled 3 resource(s)" in result.output
+    return output
+
+
+def test_bundle_index_and_layout(bundle):
+    with zipfile.ZipFile(bundle) as archive:
+        index = json.loads(archive.read(BUNDLE_INDEX))
+        names = set(archive.namelist())
+    assert [(entry["type"], entry["name"]) for entry in index["resources"]] == [
+        ("skill", "alpha"),
+        ("skill", "beta"),
+        ("command", "hello"),
+    ]
+    assert ".claude/skills/beta/SKILL.md" in names
+    assert ".claude/commands/hello.md" in names
+
+
+def test_install_subset_offline(bundle, tmp_path):
+    """Installs read only the requested members, verify them, and need no network."""
+    with patch("httpx.Client", side_effect=AssertionError("network used")):
+        path = fetch_bundle_resource(bundle, "beta", tmp_path / "dest", ResourceType.SKILL)
+
+        result = CliRunner().invoke(
+            command_app,
+            ["hello", "--from-bundle", str(bundle), "--dest", str(tmp_path / "commands")],
+        )
+    assert result.exit_code == 0, result.output
+    assert (tmp_path / "commands" / "hello.md").read_text() == "# hello"
+    assert sorted(p.name for p in path.iterdir()) == ["SKILL.md", "run.sh"]
+    assert (path / "run.sh").stat().st_mode & 0o111
+    assert not (tmp_path / "dest" / "alpha").exists()
+
+    with pytest.raises(ResourceNotFoundError, match="Available: alpha, beta"):
+        fetch_bundle_resource(bundle, "gamma", tmp_path / "dest", ResourceType.SKILL)
+
+
+def test_tampered_bundle_is_rejected(bundle, tmp_path):
+    tampered = tmp_path / "tampered.zip"
+    with zipfile.ZipFile(bundle) as source, zipfile.ZipFile(tampered, "w") as target:
+        for info in source.infolist():
+            data = source.read(info)
+            if info.filename.endswith("alpha/SKILL.md"):
+                data += b"extra\n"
+            target.writestr(info, data)
+
+    with pytest.raises(IntegrityError):
+        fetch_bundle_resource(tampered, "alpha", tmp_path / "dest", ResourceType.SKILL)
+    assert not (tmp_path / "dest" / "alpha").exists()
@@ -0,0 +1,77 @@
+"""Tests for cache usage tracking and size-capped eviction."""
+
+import os
+import time
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from agent_skills_upd import cache_index
+from agent_skills_upd.cli.skill import app as skill_app
+from agent_skills_upd.fetcher import ResourceType, fetch_resource, get_archive_cache_path
+
+
+def cached_archive(repo: str, size: int, used_at: float, uses: int = 1) -> Path:
+    path = get_archive_cache_path("github.com", "user", repo, "main")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x" * size)
+    for _ in range(uses):
+        cache_index.record_use(path, "archive", "hit")
+    os.utime(path, (used_at, used_at))
+    with cache_index._connect() as conn:
+        conn.execute("UPDATE entries SET last_used = ? WHERE key LIKE ?", (used_at, f"%/{repo}/%"))
+    return path
+
+
+def test_archive_requests_are_counted(tmp_path, fake_host, bench_repo):
+    for index in range(2):
+        dest = tmp_path / f"dest{index}"
+        fetch_resource("bench", "bench-skill", dest, ResourceType.SKILL, host=fake_host.base_url)
+
+    stats = cache_index.cache_stats()
+    assert (stats.hits, stats.revalidated, stats.misses) == (0, 1, 1)
+    assert stats.hit_ratio == stats.miss_ratio == 0.5
+    assert stats.entries == 1
+    assert stats.bytes_saved == stats.total_size == stats.largest[0].size > 0
+
+    result = CliRunner().invoke(skill_app, ["cache", "stats"])
+    assert result.exit_code == 0, result.output
+    assert "hit ratio 50%" in result.output
+    assert "archives/" in result.output
+
+
+def test_gc_evicts_by_policy_and_keeps_other_state(isolated_cache_dir):
+    now = time.time()
+    oldest = cached_archive("oldest", 100, now - 3000, uses=5)
+    rarely = cached_archive("rarely", 100, now - 2000, uses=1)
+    recent = cached_archive("recent", 100, now - 1000, uses=3)
+    (isolated_cache_dir / "installs.db").write_bytes(b"registry")
+
+    assert [entry.key for entry in cache_index.gc(250, "lfu", grace=0)] == [
+        rarely.relative_to(isolated_cache_dir).as_posix()
+    ]
+    assert [entry.key for entry in cache_index.gc(150, "lru", grace=0)] == [
+        oldest.relative_to(isolated_cache_dir).as_posix()
+    ]
+    assert recent.exists() and not oldest.exists() and not rarely.exists()
+    assert (isolated_cache_dir / "installs.db").read_bytes() == b"registry"
+
+    # Entries in use (within the grace period) are never evicted.
+    cache_index.record_use(recent, "archive", "hit")
+    assert cache_index.gc(0) == []
+
+    result = CliRunner().invoke(skill_app, ["cache", "gc", "--max-size", "0"])
+    assert result.exit_code == 0, result.output
+    assert "Evicted 0 entries" in result.output
+
+
+def test_downloads_prune_a_capped_cache(tmp_path, monkeypatch, fake_host, bench_repo):
+    stale = cached_archive("stale", 64 * 1024, time.time() - 3600)
+    monkeypatch.setenv(cache_index.MAX_SIZE_ENV, "48K")
+
+    fetch_resource(
+        "bench", "bench-skill", tmp_path / "dest", ResourceType.SKILL, host=fake_host.base_url
+    )
+
+    assert not stale.exists()
+    assert [entry.kind for entry in cache_index.cache_stats().largest] == ["archive"]
@@ -0,0 +1,66 @@
+"""Tests for read-only cache layers."""
+
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from agent_skills_upd import cache_index
+from agent_skills_upd.cache import CACHE_DIR_ENV, LAYERS_ENV
+from agent_skills_upd.fetcher import ResourceType, fetch_resource
+from agent_skills_upd.watch import check_once
+
+from synthetic import RepoSpec, generate_repo
+
+
+def snapshot(root: Path) -> dict[str, int]:
+    return {
+        path.relative_to(root).as_posix(): path.stat().st_mtime_ns
+        for path in root.rglob("*")
+        if path.is_file() and not path.name.endswith(".lock") and "locks" not in path.parts
+    }
+
+
+@pytest.fixture
+def baked(tmp_path, monkeypatch, fake_host, bench_repo) -> Path:
+    """A cache populated at image build time, then mounted read-only."""
+    baked_dir = tmp_path / "baked"
+    monkeypatch.setenv(CACHE_DIR_ENV, str(baked_dir))
+    fetch_resource(
+        "bench", "bench-skill", tmp_path / "build", ResourceType.SKILL, host=fake_host.base_url
+    )
+    monkeypatch.setenv(CACHE_DIR_ENV, str(tmp_path / "cache"))
+    monkeypatch.setenv(LAYERS_ENV, str(baked_dir))
+    return baked_dir
+
+
+def test_install_from_layer_without_network(tmp_path, baked, fake_host):
+    before = snapshot(baked)
+    with patch("httpx.Client", side_effect=AssertionError("network used")):
+        installed = fetch_resource(
+            "bench", "bench-skill", tmp_path / "dest", ResourceType.SKILL, host=fake_host.base_url
+        )
+
+    assert (installed / "SKILL.md").exists()
+    assert snapshot(baked) == before
+    assert not (tmp_path / "cache" / "archives").exists()
+    stats = cache_index.cache_stats()
+    assert (stats.hits, stats.misses, stats.entries) == (1, 0, 0)
+
+
+def test_watch_revalidates_layered_archives(tmp_path, baked, fake_host):
+    fetch_resource(
+        "bench", "bench-skill", tmp_path / "dest", ResourceType.SKILL, host=fake_host.base_url
+    )
+    requests = fake_host.requests
+
+    assert [event.status for event in check_once(force=True)] == ["unchanged"]
+    assert fake_host.requests == requests + 1  # a 304 against the layer's ETag
+    assert not list((tmp_path / "cache").rglob("*.tar.gz"))
+
+    changed = generate_repo(
+        RepoSpec(files=10, total_bytes=32 * 1024, seed=1), tmp_path / "changed"
+    )
+    fake_host.add_archive("bench", changed.spec.repo_name, changed.archive)
+    assert [event.status for event in check_once(force=True)] == ["updated"]
+    assert list((tmp_path / "cache").rglob("*.tar.gz"))
@@ -2,27 +2,32 @@
 
 import json
 import tempfile
+import threading
+import time
 import zipfile
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
+import httpx
+
 from agent_skills_upd.fetcher import fetch_clawdhub_skill
 
 
-def create_clawdhub_zip(tmp_path: Path, skill_name: str) -> bytes:
+def create_clawdhub_zip(tmp_path: Path, skill_name: str, version: str | None = None) -> bytes:
     """Create a zip archive with a single root folder and SKILL.md."""
-    content_root = tmp_path / "content"
+    content_root = tmp_path / f"content-{version}"
     content_root.mkdir(parents=True)
     archive_root = content_root / "package"
     archive_root.mkdir()
 
+    stated = f"version: {version}\n" if version else ""
     (archive_root / "SKILL.md").write_text(
-        f"---\nname: {skill_name}\n---\n# Test Skill",
+        f"---\nname: {skill_name}\n{stated}---\n# Test Skill {version}",
         encoding="utf-8",
     )
     (archive_root / "note.txt").write_text("note", encoding="utf-8")
 
-    archive_path = tmp_path / "skill.zip"
+    archive_path = tmp_path / f"skill-{version}.zip"
     with zipfile.ZipFile(archive_path, "w") as archive:
         for path in archive_root.rglob("*"):
             archive.write(path, arcname=str(path.relative_to(content_root)))
@@ -95,3 +100,143 @@ def test_clawdhub_fetch_reads_old_version():
         assert result.was_existing is True
         assert result.old_version == "1.0.0"
         assert result.new_version == "2.0.0"
+
+
+def test_clawdhub_package_is_cached_per_version(tmp_path):
+    """A version fetched before is installed again without downloading it."""
+    metadata = {"latestVersion": {"version": "1.2.3"}}
+    archive_bytes = create_clawdhub_zip(tmp_path, "weather")
+
+    with patch("httpx.Client", return_value=mock_httpx(metadata, archive_bytes)):
+        fetch_clawdhub_skill("weather", tmp_path / "first")
+
+    # Downloading again would fail to extract this.
+    with patch("httpx.Client", return_value=mock_httpx(metadata, b"not an archive")):
+        result = fetch_clawdhub_skill("weather", tmp_path / "second")
+
+    assert (result.path / "note.txt").read_text(encoding="utf-8") == "note"
+
+
+def mock_speculative_httpx(
+    metadata: dict,
+    chunks,
+    archive_bytes: bytes = b"",
+    served_url: str = "https://clawdhub.com/api/download?slug=weather&tag=latest",
+) -> MagicMock:
+    """Mocked client answering the metadata GET, a streamed download and a regular one."""
+    metadata_done = threading.Event()
+
+    def get(url, *args, **kwargs):
+        response = MagicMock(status_code=200)
+        if url.endswith("/download"):
+            response.content = archive_bytes
+            return response
+        metadata_done.set()
+        response.json.return_value = metadata
+        return response
+
+    def iter_bytes():
+        # The download arrives after the metadata, one small chunk at a time.
+        metadata_done.wait(5)
+        yield from chunks
+
+    stream = MagicMock()
+    stream.__enter__.return_value.url = httpx.URL(served_url)
+    stream.__enter__.return_value.iter_bytes.side_effect = iter_bytes
+    mock_client = MagicMock()
+    mock_client.__enter__.return_value.get.side_effect = get
+    mock_client.__enter__.return_value.stream.return_value = stream
+    return mock_client
+
+
+def test_clawdhub_speculative_install_sends_both_requests(tmp_path):
+    """A speculative first install downloads alongside the metadata request."""
+    metadata = {"latestVersion": {"version": "1.2.3"}}
+    archive_bytes = create_clawdhub_zip(tmp_path, "weather", "1.2.3")
+    mock_client = mock_speculative_httpx(metadata, [archive_bytes])
+
+    with patch("httpx.Client", return_value=mock_client):
+        result = fetch_clawdhub_skill("weather", tmp_path / "skills", speculative=True)
+
+    client = mock_client.__enter__.return_value
+    assert client.get.call_count == 1
+    assert client.stream.call_count == 1
+    assert result.new_version == "1.2.3"
+    assert (result.path / "note.txt").read_text(encoding="utf-8") == "note"
+
+    # The package was cached under the version the metadata named.
+    with patch("httpx.Client", return_value=mock_httpx(metadata, b"not an archive")):
+        fetch_clawdhub_skill("weather", tmp_path / "again")
+
+
+def test_clawdhub_speculative_download_cancelled_when_cached(tmp_path):
+    """A speculative download stops once the metadata names a cached version."""
+    metadata = {"latestVersion": {"version": "1.2.3"}}
+    archive_bytes = create_clawdhub_zip(tmp_path, "weather")
+    with patch("httpx.Client", return_value=mock_httpx(metadata, archive_bytes)):
+        fetch_clawdhub_skill("weather", tmp_path / "first")
+
+    served = []
+
+    def slow_chunks():
+        for _ in range(500):
+            served.append(1)
+            time.sleep(0.002)
+            yield b"x"
+
+    with patch(
+        "httpx.Client", return_value=mock_speculative_httpx(metadata, slow_chunks())
+    ):
+        result = fetch_clawdhub_skill("weather", tmp_path / "second", speculative=True)
+
+    assert (result.path / "note.txt").read_text(encoding="utf-8") == "note"
+    assert len(served) < 500
+
+
+def test_clawdhub_speculative_package_must_match_metadata(tmp_path):
+    """A package of another version than the metadata names is downloaded again."""
+    metadata = {"latestVersion": {"version": "1.2.3"}}
+    # Published between the metadata request and the speculative download.
+    newer = create_clawdhub_zip(tmp_path, "weather", "1.3.0")
+    expected = create_clawdhub_zip(tmp_path, "weather", "1.2.3")
+    mock_client = mock_speculative_httpx(metadata, [newer], archive_bytes=expected)
+
+    with patch("httpx.Client", return_value=mock_client):
+        result = fetch_clawdhub_skill("weather", tmp_path / "skills", speculative=True)
+
+    client = mock_client.__enter__.return_value
+    assert client.get.call_count == 2
+    assert client.get.call_args.kwargs["params"]["version"] == "1.2.3"
+    assert "1.2.3" in (result.path / "SKILL.md").read_text(encoding="utf-8")
+
+
+def test_clawdhub_speculative_package_without_version_is_used(tmp_path):
+    """A package that doesn't state its version is used without downloading it again."""
+    metadata = {"latestVersion": {"version": "1.2.3"}}
+    archive_bytes = create_clawdhub_zip(tmp_path, "weather")
+    mock_client = mock_speculative_httpx(metadata, [archive_bytes])
+
+    with patch("httpx.Client", return_value=mock_client):
+        result = fetch_clawdhub_skill("weather", tmp_path / "skills", speculative=True)
+
+    client = mock_client.__enter__.return_value
+    assert client.get.call_count == 1
+    assert client.stream.call_count == 1
+    assert (result.path / "note.txt").read_text(encoding="utf-8") == "note"
+
+
+def test_clawdhub_speculative_package_checked_against_served_version(tmp_path):
+    """The version the download was served for is checked before the package's own."""
+    metadata = {"latestVersion": {"version": "1.2.3"}}
+    newer = create_clawdhub_zip(tmp_path, "weather")
+    expected = create_clawdhub_zip(tmp_path, "weather", "1.2.3")
+    served_url = "https://clawdhub.com/api/download?slug=weather&version=1.3.0"
+    mock_client = mock_speculative_httpx(
+        metadata, [newer], archive_bytes=expected, served_url=served_url
+    )
+
+    with patch("httpx.Client", return_value=mock_client):
+        result = fetch_clawdhub_skill("weather", tmp_path / "skills", speculative=True)
+
+    assert mock_client.__enter__.return_value.get.call_count == 2
+    assert "1.2.3" in (result.path / "SKILL.md").read_text(encoding="utf-8")
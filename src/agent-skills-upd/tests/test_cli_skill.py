@@ -91,3 +91,24 @@ def test_overwrite_flag_accepts_false():
         args, kwargs = mock_fetch.call_args
         assert args[2] is False
         assert kwargs == {}
+
+
+def test_reserved_names_install_through_explicit_add():
+    """A clawd slug named like a subcommand needs an explicit add."""
+    runner = CliRunner()
+
+    result = runner.invoke(app, ["--help"])
+    assert "reserved" in result.stdout
+    assert "watch" in result.stdout
+
+    with (
+        patch("agent_skills_upd.cli.skill.fetch_resource") as mock_fetch,
+        patch("agent_skills_upd.cli.skill.fetch_spinner", return_value=nullcontext()),
+        patch("agent_skills_upd.cli.skill.print_success_message"),
+    ):
+        mock_fetch.return_value = Path("watch")
+
+        result = runner.invoke(app, ["add", "watch", "--env", "clawd"])
+
+        assert result.exit_code == 0, result.output
+        assert mock_fetch.call_args.kwargs["repo"] == "watch"
@@ -0,0 +1,98 @@
+"""Tests for the Unix socket install daemon."""
+
+import os
+import socketserver
+import stat
+import tempfile
+import threading
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from agent_skills_upd.daemon import DaemonServer, daemon_available, run_install, serve, stop
+from agent_skills_upd.exceptions import RepoNotFoundError
+from agent_skills_upd.fetcher import ResourceType
+
+
+@pytest.fixture
+def running_daemon(monkeypatch):
+    """Start a daemon on a short socket path and stop it afterwards."""
+    with tempfile.TemporaryDirectory(dir="/tmp") as tmp_dir:
+        socket_path = Path(tmp_dir) / "d.sock"
+        monkeypatch.setenv("AGENT_SKILLS_UPD_SOCKET", str(socket_path))
+        ready = threading.Event()
+        thread = threading.Thread(
+            target=serve, args=(socket_path, ready.set), daemon=True
+        )
+        thread.start()
+        assert ready.wait(5)
+        yield socket_path
+        stop(socket_path)
+        thread.join(5)
+
+
+def test_run_install_falls_back_without_daemon():
+    """With no socket, the fetcher runs in-process."""
+    fetch = MagicMock(return_value=Path("local"))
+    fetch.__name__ = "fetch_resource"
+
+    assert run_install(fetch, "user", "name", overwrite=True) == Path("local")
+    fetch.assert_called_once_with("user", "name", overwrite=True)
+
+
+def test_run_install_uses_daemon(running_daemon):
+    """Requests are executed by the daemon and results decoded back."""
+    assert daemon_available(running_daemon)
+    local_fetch = MagicMock()
+    local_fetch.__name__ = "fetch_resource"
+
+    with patch(
+        "agent_skills_upd.fetcher.fetch_resource",
+        return_value=Path("/dest/skill"),
+    ) as daemon_fetch:
+        result = run_install(
+            local_fetch,
+            "user",
+            "skill",
+            Path("/dest"),
+            ResourceType.SKILL,
+            True,
+            host="github.com",
+        )
+
+    assert result == Path("/dest/skill")
+    local_fetch.assert_not_called()
+    args, kwargs = daemon_fetch.call_args
+    assert args == ("user", "skill", Path("/dest"), ResourceType.SKILL, True)
+    assert kwargs == {"host": "github.com"}
+
+
+def test_run_install_reraises_daemon_errors(running_daemon):
+    """Typed errors raised inside the daemon reach the client unchanged."""
+    local_fetch = MagicMock()
+    local_fetch.__name__ = "fetch_resource"
+
+    with patch(
+        "agent_skills_upd.fetcher.fetch_resource",
+        side_effect=RepoNotFoundError("Repository 'user/repo' not found."),
+    ):
+        with pytest.raises(RepoNotFoundError, match="user/repo"):
+            run_install(local_fetch, "user", "skill")
+
+
+def test_socket_is_owner_only_from_bind(monkeypatch):
+    """The socket is never reachable by other users, not even before the chmod."""
+    modes = []
+    bind = socketserver.UnixStreamServer.server_bind
+
+    def recording_bind(self):
+        bind(self)
+        modes.append(stat.S_IMODE(os.stat(self.server_address).st_mode))
+
+    monkeypatch.setattr(socketserver.UnixStreamServer, "server_bind", recording_bind)
+    with tempfile.TemporaryDirectory(dir="/tmp") as tmp_dir:
+        server = DaemonServer(Path(tmp_dir) / "d.sock")
+        server.server_close()
+
+    assert modes and not modes[0] & 0o077
@@ -0,0 +1,129 @@
+"""Tests for delta updates of git-backed installs."""
+
+import shutil
+
+import pytest
+
+from agent_skills_upd import installs, integrity, tracing
+from agent_skills_upd.fetcher import ResourceType, fetch_resource
+from agent_skills_upd.filters import parse_file_filter
+from agent_skills_upd.git_backend import get_bare_repo_path
+from test_git_backend import git, publish
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+
+
+def make_work(tmp_path):
+    work = tmp_path / "work"
+    skill = work / "skills" / "demo"
+    (skill / "scripts").mkdir(parents=True)
+    (skill / "SKILL.md").write_text("v1")
+    (skill / "notes.md").write_text("notes")
+    (skill / "old.md").write_text("old")
+    (skill / "scripts" / "run.sh").write_text("echo 1")
+    (skill / "big.bin").write_text("x" * 10_000)
+    (skill / "data").mkdir()
+    (skill / "data" / "table.csv").write_text("a,b\n")
+    return work, skill
+
+
+def install(host, dest, **kwargs):
+    with tracing.tracing() as trace:
+        path = fetch_resource(
+            "user", "demo", dest, ResourceType.SKILL, host=host, backend="git", **kwargs
+        )
+    return path, trace
+
+
+def installed(path):
+    return sorted(p.relative_to(path).as_posix() for p in path.rglob("*") if p.is_file())
+
+
+def test_update_fetches_only_changed_files(tmp_path):
+    work, skill = make_work(tmp_path)
+    remotes = tmp_path / "remotes"
+    host = publish(work, remotes, "user", "agent-resources")
+    dest = tmp_path / "dest"
+    file_filter = parse_file_filter(exclude=["*.bin"], max_file_size="1K")
+    path, _ = install(host, dest, file_filter=file_filter)
+    assert (path / "data" / "table.csv").exists()
+    assert not (path / "big.bin").exists()
+    # The first install already skipped the excluded blob.
+    bare = get_bare_repo_path(host, "user", "agent-resources")
+    missing = git("rev-list", "--objects", "--missing=print", "HEAD", cwd=bare).splitlines()
+    assert "?" + git("rev-parse", "HEAD:skills/demo/big.bin", cwd=work).strip() in missing
+
+    (skill / "SKILL.md").write_text("v2")
+    (skill / "old.md").unlink()
+    (skill / "new.md").write_text("new")
+    (skill / "scripts" / "run.sh").chmod(0o755)
+    (skill / "big.bin").write_text("y" * 10_000)
+    (skill / "data" / "table.csv").write_text("a,b\n" * 1000)
+    (work / "skills" / "other").mkdir()
+    (work / "skills" / "other" / "SKILL.md").write_text("other")
+    publish(work, remotes, "user", "agent-resources")
+    path, trace = install(host, dest, file_filter=file_filter)
+
+    # The grown table is over the size cap; its emptied directory goes too.
+    assert installed(path) == ["SKILL.md", "new.md", "notes.md", "scripts/run.sh"]
+    assert not (path / "data").exists()
+    assert (path / "SKILL.md").read_text() == "v2"
+    assert (path / "scripts" / "run.sh").stat().st_mode & 0o111
+    (delta,) = [span for span in trace.spans if span.name == "delta"]
+    assert delta.attrs["changed"] == 6
+    assert delta.attrs["files"] == 3
+
+    # Only the changed blobs inside the skill were fetched.
+    head = git("rev-parse", "HEAD", cwd=work).strip()
+    missing = git("rev-list", "--objects", "--missing=print", head, cwd=bare).splitlines()
+    for unfetched in ("skills/demo/big.bin", "skills/other/SKILL.md"):
+        assert "?" + git("rev-parse", f"HEAD:{unfetched}", cwd=work).strip() in missing
+
+    (record,) = installs.load_records()
+    assert record.validators == {"commit": head}
+    assert integrity.verify_install(path, record.files) == []
+
+
+def test_falls_back_to_full_fetch(tmp_path):
+    """Modified installs and commits the remote no longer has are fetched in full."""
+    work, skill = make_work(tmp_path)
+    remotes = tmp_path / "remotes"
+    host = publish(work, remotes, "user", "agent-resources")
+    bare = get_bare_repo_path(host, "user", "agent-resources")
+    dest = tmp_path / "dest"
+    path, _ = install(host, dest)
+
+    (path / "notes.md").write_text("local edit")
+    (skill / "SKILL.md").write_text("v2")
+    publish(work, remotes, "user", "agent-resources")
+    path, trace = install(host, dest)
+    assert not [span for span in trace.spans if span.name == "delta"]
+    assert (path / "notes.md").read_text() == "notes"
+
+    # A fresh clone fetches the installed commit again to compare against.
+    shutil.rmtree(bare)
+    (skill / "SKILL.md").write_text("v3")
+    publish(work, remotes, "user", "agent-resources")
+    path, trace = install(host, dest)
+    assert [span for span in trace.spans if span.name == "delta"]
+    assert (path / "SKILL.md").read_text() == "v3"
+
+    # Rewritten history: the installed commit is gone from the remote.
+    shutil.rmtree(bare)
+    (skill / "SKILL.md").write_text("v4")
+    git("add", "-A", cwd=work)
+    git("commit", "-q", "--amend", "-m", "rewritten", cwd=work)
+    remote = remotes / "user" / "agent-resources.git"
+    git("push", "-q", "--force", str(remote), "HEAD:main", cwd=work)
+    git("gc", "-q", "--prune=now", cwd=remote)
+    path, trace = install(host, dest)
+    assert not [span for span in trace.spans if span.name == "delta"]
+    assert (path / "SKILL.md").read_text() == "v4"
+    assert installed(path) == [
+        "SKILL.md",
+        "big.bin",
+        "data/table.csv",
+        "notes.md",
+        "old.md",
+        "scripts/run.sh",
+    ]
@@ -0,0 +1,55 @@
+"""Tests for extracting archives in worker processes during batch operations."""
+
+import os
+
+import pytest
+
+from agent_skills_upd import fetcher, tracing
+from agent_skills_upd.bundle import BundleItem
+from agent_skills_upd.exceptions import IntegrityError
+from agent_skills_upd.fetcher import ResourceType, download_repo_archive, extraction_pool
+from agent_skills_upd.prefetch import prefetch
+from agent_skills_upd.providers import get_repo_provider
+
+
+def make_repo(root, name):
+    skill = root / ".claude" / "skills" / name
+    skill.mkdir(parents=True)
+    (skill / "SKILL.md").write_text(f"---\nname: {name}\n---\n")
+    return root
+
+
+@pytest.fixture
+def pooled(monkeypatch):
+    # Use the pool even on one CPU and for tiny archives.
+    monkeypatch.setattr(os, "cpu_count", lambda: 4)
+    monkeypatch.setattr(fetcher, "POOL_MIN_ARCHIVE_BYTES", 0)
+
+
+def test_prefetch_extracts_in_worker_processes(fake_host, tmp_path, pooled):
+    items = []
+    for index in range(3):
+        fake_host.add_repo("bench", f"repo-{index}", make_repo(tmp_path / f"r{index}", "demo"))
+        provider = get_repo_provider(fake_host.base_url, "bench", f"repo-{index}")
+        items.append(BundleItem(ResourceType.SKILL, "demo", provider, f"repo-{index}"))
+
+    with tracing.tracing() as tracer:
+        results = prefetch(items, workers=3)
+
+    assert [result.error for result in results] == [None, None, None]
+    extracts = [span for span in tracer.spans if span.name == "extract"]
+    assert len(extracts) == 3
+    assert all(span.attrs.get("pool") for span in extracts)
+    assert fetcher._extract_pool is None
+
+
+def test_worker_errors_reach_the_caller(fake_host, tmp_path, pooled):
+    fake_host.add_repo("bench", "repo", make_repo(tmp_path / "repo", "demo"))
+    tarball = fetcher.fetch_repo_archive(fake_host.base_url, "bench", "repo", "main")
+    data = tarball.read_bytes()
+    tarball.write_bytes(data[: len(data) // 2])
+
+    with extraction_pool(2), pytest.raises(IntegrityError):
+        download_repo_archive(fake_host.base_url, "bench", "repo", tmp_path / "out")
+    # The corrupted copy was dropped, as for in-process extraction.
+    assert not tarball.exists()
@@ -0,0 +1,99 @@
+"""End-to-end tests against the local GitHub/Clawdhub stand-in."""
+
+import time
+
+import httpx
+import pytest
+
+from agent_skills_upd import fetcher
+from agent_skills_upd.exceptions import SkillUpdError
+from agent_skills_upd.fetcher import ResourceType, fetch_clawdhub_skill, fetch_resource
+
+
+def make_skill(root, name, version=None):
+    root.mkdir(parents=True)
+    stated = f"version: {version}\n" if version else ""
+    (root / "SKILL.md").write_text(f"---\nname: {name}\n{stated}---\n")
+    (root / "notes.md").write_text("notes")
+    return root
+
+
+def make_repo(root, name):
+    make_skill(root / ".claude" / "skills" / name, name)
+    return root
+
+
+def test_clawdhub_install_streams_from_fake_api(fake_host, tmp_path):
+    skill = make_skill(tmp_path / "weather", "weather", "1.2.3")
+    fake_host.add_clawdhub_skill("weather", skill, "1.2.3")
+
+    result = fetch_clawdhub_skill("weather", tmp_path / "skills", speculative=True)
+
+    assert result.new_version == "1.2.3"
+    assert (result.path / "notes.md").read_text() == "notes"
+    paths = sorted(path.split("?")[0] for path, _ in fake_host.log)
+    assert paths == ["/api/download", "/api/skill"]
+
+
+def test_clawdhub_cancelled_download_does_not_wait_for_body(fake_host, tmp_path):
+    """Cancelling shuts the speculative connection down under a blocked read."""
+    skill = make_skill(tmp_path / "weather", "weather", "1.2.3")
+    fake_host.add_clawdhub_skill("weather", skill, "1.2.3")
+    fetch_clawdhub_skill("weather", tmp_path / "first")
+
+    fake_host.stall = 3
+    started = time.perf_counter()
+    result = fetch_clawdhub_skill("weather", tmp_path / "second", speculative=True)
+
+    assert time.perf_counter() - started < 2
+    assert (result.path / "notes.md").read_text() == "notes"
+
+
+def test_archive_redirects_and_revalidation(fake_host, tmp_path):
+    fake_host.redirects = True
+    fake_host.add_repo("alice", "agent-resources", make_repo(tmp_path / "repo", "demo"))
+
+    for dest in ("one", "two"):
+        path = fetch_resource(
+            "alice", "demo", tmp_path / dest, ResourceType.SKILL, host=fake_host.base_url
+        )
+        assert (path / "SKILL.md").exists()
+
+    statuses = [status for path, status in fake_host.log if "tar.gz" in path]
+    assert statuses == [302, 200, 302, 304]
+
+
+def test_injected_faults_surface_as_errors(fake_host, tmp_path, monkeypatch):
+    fake_host.add_repo("alice", "agent-resources", make_repo(tmp_path / "repo", "demo"))
+
+    def fetch():
+        return fetch_resource(
+            "alice", "demo", tmp_path / "dest", ResourceType.SKILL, host=fake_host.base_url
+        )
+
+    fake_host.error_rate = 1.0
+    with pytest.raises(SkillUpdError, match="503"):
+        fetch()
+
+    fake_host.error_rate = 0.0
+    fake_host.stall = 1.0
+    monkeypatch.setattr(fetcher, "HTTP_TIMEOUT", 0.2)
+    with pytest.raises(SkillUpdError, match="Network error"):
+        fetch()
+
+
+def test_range_requests_and_rate_limit_headers(fake_host, tmp_path):
+    archive = fake_host.add_repo("alice", "agent-resources", make_repo(tmp_path / "repo", "demo"))
+    url = f"{fake_host.base_url}/alice/agent-resources/archive/refs/heads/main.tar.gz"
+    fake_host.rate_limit = 2
+
+    with httpx.Client() as client:
+        partial = client.get(url, headers={"Range": "bytes=0-9"})
+        assert partial.status_code == 206
+        assert partial.content == archive.read_bytes()[:10]
+        assert partial.headers["X-RateLimit-Remaining"] == "1"
+
+        client.get(url)
+        limited = client.get(url)
+        assert limited.status_code == 429
+        assert limited.headers["X-RateLimit-Remaining"] == "0"
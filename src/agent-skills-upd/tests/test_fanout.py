@@ -0,0 +1,77 @@
+"""Tests for installing one fetch into several destinations."""
+
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from agent_skills_upd.cli.command import app as command_app
+from agent_skills_upd.cli.skill import app as skill_app
+from agent_skills_upd.fetcher import ResourceType, fetch_local_resource
+
+
+def write_repo(root: Path, version: str = "v1") -> Path:
+    skill_dir = root / ".claude" / "skills" / "demo"
+    skill_dir.mkdir(parents=True, exist_ok=True)
+    (skill_dir / "SKILL.md").write_text(f"---\nname: demo\n---\n{version}\n")
+    (skill_dir / "data.txt").write_text(version * 100)
+    commands = root / ".claude" / "commands"
+    commands.mkdir(parents=True, exist_ok=True)
+    (commands / "hello.md").write_text(f"# hello {version}")
+    return root
+
+
+def test_fan_out_links_targets_and_replaces_safely(tmp_path):
+    """Extra destinations share inodes, and later installs never write through them."""
+    source = write_repo(tmp_path / "repo")
+    dests = [tmp_path / "a", tmp_path / "b", tmp_path / "c", tmp_path / "a"]
+
+    results = fetch_local_resource(source, "demo", dests, ResourceType.SKILL)
+
+    assert results == [tmp_path / name / "demo" for name in ("a", "b", "c")]
+    first = (results[0] / "data.txt").stat()
+    for result in results[1:]:
+        assert (result / "data.txt").stat().st_ino == first.st_ino
+
+    write_repo(source, "v2")
+    fetch_local_resource(source, "demo", tmp_path / "a", ResourceType.SKILL)
+    assert (results[0] / "data.txt").read_text() == "v2" * 100
+    assert (results[1] / "data.txt").read_text() == "v1" * 100
+
+
+def test_cli_env_list_and_all(tmp_path, monkeypatch):
+    """--env takes comma-separated names or all; duplicates collapse."""
+    source = write_repo(tmp_path / "repo")
+    project = tmp_path / "project"
+    project.mkdir()
+    monkeypatch.chdir(project)
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    runner = CliRunner()
+
+    result = runner.invoke(skill_app, [f"{source}#demo", "--env", "claude,amp,ampcode"])
+    assert result.exit_code == 0, result.output
+    assert "Installed to 2 locations" in result.output
+    assert (project / ".claude" / "skills" / "demo" / "SKILL.md").exists()
+    assert (project / ".agents" / "skills" / "demo" / "SKILL.md").exists()
+
+    result = runner.invoke(command_app, [f"{source}#hello", "--env", "all"])
+    assert result.exit_code == 0, result.output
+    installed = sorted(p.relative_to(project).as_posix() for p in project.rglob("hello.md"))
+    assert installed == [
+        ".claude/commands/hello.md",
+        ".codex/commands/hello.md",
+        ".opencode/command/hello.md",
+    ]
+
+
+def test_cli_repeated_dest(tmp_path):
+    source = write_repo(tmp_path / "repo")
+    runner = CliRunner()
+
+    result = runner.invoke(
+        command_app,
+        [f"{source}#hello", "--dest", str(tmp_path / "x"), "--dest", str(tmp_path / "y")],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert (tmp_path / "x" / "hello.md").read_text() == "# hello v1"
+    assert (tmp_path / "y" / "hello.md").read_text() == "# hello v1"
@@ -0,0 +1,136 @@
+"""Tests for include/exclude and size filters."""
+
+import zipfile
+from unittest.mock import patch
+
+from typer.testing import CliRunner
+
+from agent_skills_upd import installs
+from agent_skills_upd.cli.skill import app as skill_app
+from agent_skills_upd.fetcher import (
+    ArchiveSelection,
+    ResourceType,
+    download_repo_archive,
+    fetch_local_resource,
+    sparse_cone_paths,
+)
+from agent_skills_upd.filters import FileFilter, parse_file_filter
+
+
+def make_source(root):
+    skill = root / ".claude" / "skills" / "demo"
+    (skill / "examples" / "data").mkdir(parents=True)
+    (skill / "SKILL.md").write_text("---\nname: demo\n---\n")
+    (skill / "notes.md").write_text("notes")
+    (skill / "clip.mp4").write_bytes(b"\0" * 4096)
+    (skill / "examples" / "data" / "big.csv").write_text("a,b\n" * 1000)
+    (skill / "scripts").mkdir()
+    (skill / "scripts" / "run.py").write_text("print()")
+    return root
+
+
+def installed(path):
+    return sorted(p.relative_to(path).as_posix() for p in path.rglob("*") if p.is_file())
+
+
+def test_patterns_follow_gitignore_rules():
+    file_filter = parse_file_filter(exclude=["examples", "*.mp4"], max_file_size="1K")
+    assert not file_filter.allows("examples/data/big.csv", 10)
+    assert not file_filter.allows("media/clip.mp4", 10)
+    assert not file_filter.allows("notes.md", 2048)
+    assert file_filter.allows("notes.md", 10)
+    assert file_filter.allows("SKILL.md", 10**9)
+
+    only_scripts = parse_file_filter(include=["scripts/*"])
+    assert only_scripts.allows("scripts/run.py", 10)
+    assert not only_scripts.allows("notes.md", 10)
+    assert FileFilter.from_dict(file_filter.to_dict()) == file_filter
+    assert not parse_file_filter()
+
+
+def test_filtered_files_are_not_installed_and_are_recorded(tmp_path):
+    source = make_source(tmp_path / "repo")
+    file_filter = parse_file_filter(exclude=["examples"], max_file_size="1K")
+
+    path = fetch_local_resource(
+        source, "demo", tmp_path / "dest", ResourceType.SKILL, file_filter=file_filter
+    )
+
+    assert installed(path) == ["SKILL.md", "notes.md", "scripts/run.py"]
+    (record,) = installs.load_records()
+    assert FileFilter.from_dict(record.filters) == file_filter
+
+
+def test_filtered_files_are_not_extracted(fake_host, tmp_path):
+    source = make_source(tmp_path / "repo")
+    (source / "README.md").write_text("readme")
+    fake_host.add_repo("acme", "repo", source)
+    file_filter = parse_file_filter(exclude=["examples", "*.mp4"])
+    selection = ArchiveSelection(tuple(sparse_cone_paths(ResourceType.SKILL, "demo")), file_filter)
+
+    root = download_repo_archive(
+        fake_host.base_url, "acme", "repo", tmp_path / "scratch", selection=selection
+    )
+
+    assert installed(root / ".claude" / "skills" / "demo") == [
+        "SKILL.md",
+        "notes.md",
+        "scripts/run.py",
+    ]
+    # Files outside the resource's candidate directories are still extracted.
+    assert (root / "README.md").read_text() == "readme"
+
+
+def test_configured_filters_apply_to_archive_sources(tmp_path):
+    source = make_source(tmp_path / "repo")
+    archive = tmp_path / "repo.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        for file in source.rglob("*"):
+            if file.is_file():
+                zf.write(file, file.relative_to(source).as_posix())
+    config = {"sources": {str(tmp_path / "*.zip"): {"include": ["*.md"]}}}
+
+    with patch("agent_skills_upd.config.load_user_config", return_value=config):
+        path = fetch_local_resource(archive, "demo", tmp_path / "dest", ResourceType.SKILL)
+        assert installed(path) == ["SKILL.md", "notes.md"]
+
+        # Filters given per invocation add to the configured ones.
+        path = fetch_local_resource(
+            archive,
+            "demo",
+            tmp_path / "other",
+            ResourceType.SKILL,
+            file_filter=parse_file_filter(exclude=["notes.md"]),
+        )
+        assert installed(path) == ["SKILL.md"]
+
+        # Include patterns given per invocation replace the configured ones.
+        path = fetch_local_resource(
+            archive,
+            "demo",
+            tmp_path / "third",
+            ResourceType.SKILL,
+            file_filter=parse_file_filter(include=["scripts"]),
+        )
+        assert installed(path) == ["SKILL.md", "scripts/run.py"]
+
+
+def test_cli_add_filter_options(tmp_path, monkeypatch):
+    source = make_source(tmp_path / "repo")
+    monkeypatch.chdir(tmp_path)
+    runner = CliRunner()
+
+    result = runner.invoke(
+        skill_app,
+        ["add", f"{source}#demo", "--exclude", "*.mp4", "--exclude", "examples"],
+    )
+    assert result.exit_code == 0, result.output
+    assert installed(tmp_path / ".claude" / "skills" / "demo") == [
+        "SKILL.md",
+        "notes.md",
+        "scripts/run.py",
+    ]
+
+    result = runner.invoke(skill_app, ["add", f"{source}#demo", "--max-file-size", "lots"])
+    assert result.exit_code == 1
+    assert "Invalid size" in result.output
@@ -0,0 +1,105 @@
+"""Tests for the git partial-clone + sparse-checkout backend."""
+
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from agent_skills_upd.exceptions import RepoNotFoundError
+from agent_skills_upd.fetcher import ResourceType, fetch_resource
+from agent_skills_upd.git_backend import get_bare_repo_path
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+
+GIT_IDENTITY = [
+    "-c", "user.name=Test",
+    "-c", "user.email=test@example.com",
+    "-c", "init.defaultBranch=main",
+]
+
+
+def git(*args: str, cwd: Path | None = None) -> str:
+    result = subprocess.run(
+        ["git", *GIT_IDENTITY, *args], cwd=cwd, capture_output=True, text=True, check=True
+    )
+    return result.stdout
+
+
+def publish(work: Path, remotes: Path, username: str, repo: str) -> str:
+    """Commit the work tree and push it to a bare repo served over file://."""
+    if not (work / ".git").exists():
+        git("init", "-q", cwd=work)
+    git("add", "-A", cwd=work)
+    git("commit", "-q", "-m", "update", cwd=work)
+    bare = remotes / username / f"{repo}.git"
+    if not bare.exists():
+        git("init", "-q", "--bare", str(bare))
+        git("config", "uploadpack.allowFilter", "true", cwd=bare)
+        git("config", "uploadpack.allowAnySHA1InWant", "true", cwd=bare)
+    git("push", "-q", "--force", str(bare), "HEAD:refs/heads/main", cwd=work)
+    return f"file://{remotes}"
+
+
+def test_git_backend_sparse_install_and_incremental_update(tmp_path):
+    """Only the resource's blobs are fetched, and updates reuse the clone."""
+    work = tmp_path / "work"
+    skill_dir = work / "skills" / "wanted"
+    skill_dir.mkdir(parents=True)
+    (skill_dir / "SKILL.md").write_text("v1")
+    other_dir = work / "skills" / "other"
+    other_dir.mkdir(parents=True)
+    (other_dir / "big.bin").write_text("x" * 10_000)
+    host = publish(work, tmp_path / "remotes", "user", "agent-resources")
+
+    dest = tmp_path / "dest"
+    result = fetch_resource("user", "wanted", dest, ResourceType.SKILL, host=host, backend="git")
+    assert (result / "SKILL.md").read_text() == "v1"
+    assert not (result / ".git").exists()
+
+    bare = get_bare_repo_path(host, "user", "agent-resources")
+    missing = git("rev-list", "--objects", "--missing=print", "HEAD", cwd=bare)
+    other_blob = git("rev-parse", "HEAD:skills/other/big.bin", cwd=work).strip()
+    assert f"?{other_blob}" in missing.splitlines()
+
+    (skill_dir / "SKILL.md").write_text("v2")
+    publish(work, tmp_path / "remotes", "user", "agent-resources")
+    result = fetch_resource("user", "wanted", dest, ResourceType.SKILL, host=host, backend="git")
+    assert (result / "SKILL.md").read_text() == "v2"
+    assert git("worktree", "list", "--porcelain", cwd=bare).count("worktree ") == 1
+
+
+def test_git_backend_root_skill_and_commands(tmp_path):
+    """Root-level skills widen the checkout; commands install as files."""
+    work = tmp_path / "work"
+    (work / "assets").mkdir(parents=True)
+    (work / "SKILL.md").write_text("---\nname: rooted\n---\n")
+    (work / "assets" / "note.txt").write_text("note")
+    host = publish(work, tmp_path / "remotes", "user", "rooted-skill")
+
+    result = fetch_resource(
+        "user", None, tmp_path / "skills", ResourceType.SKILL,
+        host=host, repo="rooted-skill", backend="git",
+    )
+    assert result.name == "rooted"
+    assert (result / "assets" / "note.txt").read_text() == "note"
+    assert not (result / ".git").exists()
+
+    cmd_work = tmp_path / "cmd-work"
+    (cmd_work / "commands").mkdir(parents=True)
+    (cmd_work / "commands" / "hello.md").write_text("# Hello")
+    host = publish(cmd_work, tmp_path / "remotes", "user", "agent-resources")
+    result = fetch_resource(
+        "user", "hello", tmp_path / "commands", ResourceType.COMMAND,
+        host=host, backend="git",
+    )
+    assert result.read_text() == "# Hello"
+
+
+def test_git_backend_missing_repo(tmp_path):
+    """A missing remote maps to RepoNotFoundError."""
+    with pytest.raises(RepoNotFoundError):
+        fetch_resource(
+            "user", "x", tmp_path / "dest", ResourceType.SKILL,
+            host=f"file://{tmp_path / 'nowhere'}", backend="git",
+        )
@@ -0,0 +1,47 @@
+"""Tests for the pluggable gzip backend."""
+
+import gzip
+import tarfile
+
+import pytest
+
+from agent_skills_upd import gzip_backend
+from agent_skills_upd.exceptions import IntegrityError
+from agent_skills_upd.fetcher import extract_tarball
+
+
+def make_tarball(tmp_path):
+    source = tmp_path / "src" / "repo-main"
+    source.mkdir(parents=True)
+    (source / "data.txt").write_text("x" * 100_000)
+    tarball = tmp_path / "repo.tar.gz"
+    with tarfile.open(tarball, "w:gz") as tar:
+        tar.add(source, arcname="repo-main")
+    return tarball
+
+
+def test_missing_backends_fall_back_to_stdlib(tmp_path, monkeypatch):
+    for requested in ("stdlib", "no-such-backend", "isal", "zlib-ng"):
+        monkeypatch.setenv(gzip_backend.GZIP_BACKEND_ENV, requested)
+        assert gzip_backend.backend_name() in gzip_backend.BACKENDS
+    monkeypatch.setenv(gzip_backend.GZIP_BACKEND_ENV, "stdlib")
+    assert gzip_backend.backend_name() == "stdlib"
+
+    tarball = make_tarball(tmp_path)
+    with tarball.open("rb") as raw, gzip_backend.open_gzip(raw) as stream:
+        assert stream.read() == gzip.decompress(tarball.read_bytes())
+
+
+@pytest.mark.parametrize("backend", gzip_backend.BACKENDS)
+def test_extract_with_each_backend(tmp_path, monkeypatch, backend):
+    monkeypatch.setenv(gzip_backend.GZIP_BACKEND_ENV, backend)
+    tarball = make_tarball(tmp_path)
+
+    extract_tarball(tarball, tmp_path / "out")
+    assert (tmp_path / "out" / "repo-main" / "data.txt").read_text() == "x" * 100_000
+
+    corrupted = tmp_path / "corrupted.tar.gz"
+    data = tarball.read_bytes()
+    corrupted.write_bytes(data[:20] + bytes(len(data) - 20))
+    with pytest.raises(IntegrityError):
+        extract_tarball(corrupted, tmp_path / "bad")
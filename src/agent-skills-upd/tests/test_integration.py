@@ -12,6 +12,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from agent_skills_upd.cli.common import get_destination
 from agent_skills_upd.exceptions import ResourceNotFoundError
 from agent_skills_upd.fetcher import ResourceType, fetch_resource
+from http_mock import serve_streams
 
 
 def create_mock_repo_tarball(
@@ -82,6 +83,7 @@ def test_backward_compatibility_claude_structure():
         mock_response.content = tarball_bytes
 
         with patch("httpx.Client") as mock_client:
+            serve_streams(mock_client)
             mock_client.return_value.__enter__.return_value.get.return_value = mock_response
 
             result = fetch_resource(
@@ -115,6 +117,7 @@ def test_anthropic_pattern_detection():
         mock_response.content = tarball_bytes
 
         with patch("httpx.Client") as mock_client:
+            serve_streams(mock_client)
             mock_client.return_value.__enter__.return_value.get.return_value = mock_response
 
             result = fetch_resource(
@@ -147,6 +150,7 @@ def test_opencode_pattern_detection():
         mock_response.content = tarball_bytes
 
         with patch("httpx.Client") as mock_client:
+            serve_streams(mock_client)
             mock_client.return_value.__enter__.return_value.get.return_value = mock_response
 
             result = fetch_resource(
@@ -179,6 +183,7 @@ def test_root_dir_pattern_detection():
         mock_response.content = tarball_bytes
 
         with patch("httpx.Client") as mock_client:
+            serve_streams(mock_client)
             mock_client.return_value.__enter__.return_value.get.return_value = mock_response
 
             result = fetch_resource(
@@ -211,6 +216,7 @@ def test_custom_destination():
         mock_response.content = tarball_bytes
 
         with patch("httpx.Client") as mock_client:
+            serve_streams(mock_client)
             mock_client.return_value.__enter__.return_value.get.return_value = mock_response
 
             result = fetch_resource(
@@ -247,6 +253,7 @@ def test_enhanced_error_messages():
         mock_response.content = tarball_bytes
 
         with patch("httpx.Client") as mock_client:
+            serve_streams(mock_client)
             mock_client.return_value.__enter__.return_value.get.return_value = mock_response
 
             try:
@@ -288,6 +295,7 @@ def test_manual_repo_override_root_skill():
         mock_response.content = tarball_bytes
 
         with patch("httpx.Client") as mock_client:
+            serve_streams(mock_client)
             mock_client.return_value.__enter__.return_value.get.return_value = mock_response
 
             result = fetch_resource(
@@ -325,6 +333,7 @@ def test_manual_repo_override_root_skill_derive_name():
         mock_response.content = tarball_bytes
 
         with patch("httpx.Client") as mock_client:
+            serve_streams(mock_client)
             mock_client.return_value.__enter__.return_value.get.return_value = mock_response
 
             result = fetch_resource(
@@ -360,6 +369,7 @@ def test_manual_repo_override_root_skill_name_mismatch():
         mock_response.content = tarball_bytes
 
         with patch("httpx.Client") as mock_client:
+            serve_streams(mock_client)
             mock_client.return_value.__enter__.return_value.get.return_value = mock_response
 
             try:
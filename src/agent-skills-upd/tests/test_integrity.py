@@ -0,0 +1,105 @@
+"""Tests for content digests computed while installing."""
+
+import hashlib
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from agent_skills_upd import installs
+from agent_skills_upd.cli.skill import app as skill_app
+from agent_skills_upd.exceptions import IntegrityError
+from agent_skills_upd.fetcher import (
+    ResourceType,
+    fetch_local_resource,
+    fetch_resource,
+    get_archive_cache_path,
+    read_archive_meta,
+)
+
+
+def write_repo(root: Path, body: str = "v1") -> Path:
+    skill_dir = root / ".claude" / "skills" / "demo"
+    skill_dir.mkdir(parents=True, exist_ok=True)
+    (skill_dir / "SKILL.md").write_text(f"---\nname: demo\n---\n{body}\n")
+    (skill_dir / "data.txt").write_text(body * 10)
+    commands = root / ".claude" / "commands"
+    commands.mkdir(parents=True, exist_ok=True)
+    (commands / "hello.md").write_text(f"# hello {body}")
+    return root
+
+
+def sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def test_digests_are_recorded_and_checked(tmp_path):
+    source = write_repo(tmp_path / "repo")
+    command = fetch_local_resource(source, "hello", tmp_path / "commands", ResourceType.COMMAND)
+    skill = fetch_local_resource(source, "demo", tmp_path / "skills", ResourceType.SKILL)
+
+    records = {record.name: record for record in installs.load_records()}
+    # A file resource's digest is the file's own sha256.
+    assert records["hello"].sha256 == sha256(command.read_bytes())
+    assert records["demo"].files == {
+        name: sha256((skill / name).read_bytes()) for name in ("SKILL.md", "data.txt")
+    }
+
+    write_repo(source, "v2")
+    with pytest.raises(IntegrityError):
+        fetch_local_resource(
+            source,
+            "demo",
+            tmp_path / "skills",
+            ResourceType.SKILL,
+            expected_sha256=records["demo"].sha256,
+        )
+    assert (skill / "data.txt").read_text() == "v1" * 10  # left untouched
+
+    fetch_local_resource(
+        source,
+        "hello",
+        tmp_path / "commands",
+        ResourceType.COMMAND,
+        expected_sha256="sha256:" + sha256(b"# hello v2"),
+    )
+    assert command.read_text() == "# hello v2"
+
+
+def test_corrupt_cached_archive_is_detected(tmp_path, fake_host, bench_repo):
+    """A corrupted cached archive fails extraction and is dropped from the cache."""
+
+    def install():
+        return fetch_resource(
+            "bench", "bench-skill", tmp_path / "dest", ResourceType.SKILL, host=fake_host.base_url
+        )
+
+    install()
+    repo_name = bench_repo.spec.repo_name
+    cached = get_archive_cache_path(fake_host.base_url, "bench", repo_name, "main")
+    # The digest was taken as the archive streamed to disk.
+    assert read_archive_meta(cached)["sha256"] == sha256(cached.read_bytes())
+    data = bytearray(cached.read_bytes())
+    data[len(data) // 2] ^= 0xFF
+    cached.write_bytes(bytes(data))
+
+    with pytest.raises(IntegrityError):
+        install()
+    assert not cached.exists()
+    assert (install() / "SKILL.md").exists()
+
+
+def test_cli_verify_reports_modified_files(tmp_path):
+    source = write_repo(tmp_path / "repo")
+    runner = CliRunner()
+    result = runner.invoke(skill_app, [f"{source}#demo", "--dest", str(tmp_path / "dest")])
+    assert result.exit_code == 0, result.output
+
+    result = runner.invoke(skill_app, ["verify"])
+    assert result.exit_code == 0, result.output
+    assert "Verified 1 of 1" in result.output
+
+    (tmp_path / "dest" / "demo" / "data.txt").write_text("tampered")
+    result = runner.invoke(skill_app, ["verify"])
+    assert result.exit_code == 1
+    assert "modified: data.txt" in result.output
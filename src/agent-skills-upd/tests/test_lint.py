@@ -0,0 +1,88 @@
+"""Tests for the header-only frontmatter parser and lint."""
+
+from pathlib import Path
+
+import pytest
+import yaml
+from typer.testing import CliRunner
+
+from agent_skills_upd.cli.skill import app as skill_app
+from agent_skills_upd.header import HeaderError, parse_header, read_header
+from agent_skills_upd.lint import lint_tree
+
+
+@pytest.mark.parametrize(
+    "header",
+    [
+        "name: pdf\ndescription: Read and write PDF files, fast",
+        "name: 'it''s'\ndescription: \"quoted\"",
+        "# comment\nname: pdf\n\nallowed-tools: Bash",
+        "name: yes",
+        "name: 1.0",
+        "name: pdf\ntags:\n  - a\n  - b",
+        "name: pdf\ndescription: >\n  folded\n  text",
+        "name: a\nname: b",
+        "name: \"esc\\tape\"",
+        "name: [a, b]",
+        "",
+    ],
+)
+def test_header_parser_matches_yaml(header):
+    assert parse_header(header) == (yaml.safe_load(header) or {})
+
+
+def test_read_header_stops_at_fence(tmp_path):
+    skill_file = tmp_path / "SKILL.md"
+    skill_file.write_text("---\nname: demo\n---\n" + "body\n" * 1000)
+    assert read_header(skill_file) == "name: demo\n"
+
+    (tmp_path / "plain.md").write_text("# no frontmatter\n")
+    assert read_header(tmp_path / "plain.md") is None
+
+    (tmp_path / "open.md").write_text("---\nname: demo\n")
+    with pytest.raises(HeaderError):
+        read_header(tmp_path / "open.md")
+
+
+def write(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+
+def test_lint_reports_problems(tmp_path):
+    write(tmp_path / ".claude/skills/good/SKILL.md", "---\nname: good\n---\n")
+    write(tmp_path / ".claude/skills/good/notes/commands/x.md", "not a command")
+    write(tmp_path / ".claude/skills/renamed/SKILL.md", "---\nname: other\n---\n")
+    write(tmp_path / ".claude/skills/broken/SKILL.md", "---\nname: [oops\n---\n")
+    write(tmp_path / "skills/nameless/SKILL.md", "---\ndescription: x\n---\n")
+    write(tmp_path / "skills/good/SKILL.md", "---\nname: good\n---\n")
+    write(tmp_path / ".claude/commands/hello.md", "# hello, no frontmatter needed\n")
+    write(tmp_path / ".claude/agents/reviewer.md", "---\nname: reviewer\n---\n")
+
+    resources, issues = lint_tree(tmp_path)
+
+    assert len(resources) == 7
+    problems = sorted(
+        (str(issue.path.relative_to(tmp_path)), issue.message.split(" ")[0]) for issue in issues
+    )
+    assert problems == [
+        (".claude/skills/broken/SKILL.md", "Invalid"),
+        (".claude/skills/good/SKILL.md", "Duplicate"),
+        (".claude/skills/renamed/SKILL.md", "Frontmatter"),
+        ("skills/good/SKILL.md", "Duplicate"),
+        ("skills/nameless/SKILL.md", "Frontmatter"),
+    ]
+
+
+def test_cli_lint(tmp_path):
+    write(tmp_path / "skills/good/SKILL.md", "---\nname: good\n---\n")
+    runner = CliRunner()
+
+    result = runner.invoke(skill_app, ["lint", str(tmp_path)])
+    assert result.exit_code == 0, result.output
+    assert "1 resource(s) OK" in result.output
+
+    write(tmp_path / "agents/bad.md", "---\nname: good-agent\n---\n")
+    result = runner.invoke(skill_app, ["lint", str(tmp_path)])
+    assert result.exit_code == 1
+    assert "does not match 'bad'" in result.output
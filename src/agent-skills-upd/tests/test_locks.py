@@ -0,0 +1,37 @@
+"""Tests for cross-process locks and download coalescing."""
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from agent_skills_upd.fetcher import ResourceType, fetch_resource
+
+
+def install_concurrently(server, dests: list[Path]) -> list[Path]:
+    def install(dest: Path) -> Path:
+        return fetch_resource(
+            "bench", "bench-skill", dest, ResourceType.SKILL, host=server.base_url
+        )
+
+    with ThreadPoolExecutor(max_workers=len(dests)) as pool:
+        return list(pool.map(install, dests))
+
+
+def test_concurrent_installs_share_one_download(tmp_path, fake_host, bench_repo):
+    """Installs that overlap a download wait for it instead of repeating it."""
+    fake_host.latency = 0.3
+    results = install_concurrently(fake_host, [tmp_path / f"dest{i}" for i in range(4)])
+
+    assert fake_host.bytes_sent == bench_repo.archive.stat().st_size
+    for result in results:
+        assert (result / "SKILL.md").exists()
+
+
+def test_concurrent_installs_to_one_destination(tmp_path, fake_host, bench_repo):
+    """Replacing the same destination concurrently leaves one complete copy."""
+    dest = tmp_path / "dest"
+    fake_host.latency = 0.05
+    results = install_concurrently(fake_host, [dest] * 4)
+
+    assert set(results) == {dest / "bench-skill"}
+    installed = sorted(p for p in (dest / "bench-skill").rglob("*") if p.is_file())
+    assert len(installed) == bench_repo.resource_files
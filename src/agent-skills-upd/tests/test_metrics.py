@@ -0,0 +1,86 @@
+"""Tests for the metrics registry and textfile export."""
+
+import tarfile
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from agent_skills_upd import metrics
+from agent_skills_upd.exceptions import RepoNotFoundError
+from agent_skills_upd.fetcher import ResourceType, fetch_resource
+from http_mock import serve_streams
+
+
+@pytest.fixture(autouse=True)
+def reset_registry():
+    metrics.REGISTRY.reset()
+    yield
+    metrics.REGISTRY.reset()
+
+
+def mock_client(status_code: int, content: bytes = b"") -> MagicMock:
+    response = MagicMock()
+    response.status_code = status_code
+    response.content = content
+    client = MagicMock()
+    client.return_value.__enter__.return_value.get.return_value = response
+    serve_streams(client)
+    return client
+
+
+def make_tarball(tmp_path: Path) -> bytes:
+    cmd_dir = tmp_path / "src" / "agent-resources-main" / ".claude" / "commands"
+    cmd_dir.mkdir(parents=True)
+    (cmd_dir / "hello.md").write_text("# Hello")
+    tarball_path = tmp_path / "repo.tar.gz"
+    with tarfile.open(tarball_path, "w:gz") as tar:
+        tar.add(tmp_path / "src" / "agent-resources-main", arcname="agent-resources-main")
+    return tarball_path.read_bytes()
+
+
+def test_fetch_updates_counters_and_histogram(tmp_path):
+    """Successful and failed fetches update the registry."""
+    tarball_bytes = make_tarball(tmp_path)
+    with patch("httpx.Client", mock_client(200, tarball_bytes)):
+        fetch_resource("user", "hello", tmp_path / "dest", ResourceType.COMMAND)
+    with patch("httpx.Client", mock_client(404)):
+        with pytest.raises(RepoNotFoundError):
+            fetch_resource("user", "hello", tmp_path / "dest", ResourceType.COMMAND)
+
+    assert metrics.DOWNLOADS.value(host="github.com") == 1
+    assert metrics.DOWNLOAD_BYTES.value(host="github.com") == len(tarball_bytes)
+    assert metrics.NOT_FOUND.value(host="github.com", kind="repo") == 1
+    assert metrics.INSTALLS.value(source="archive", result="ok") == 1
+    assert metrics.INSTALLS.value(source="archive", result="RepoNotFoundError") == 1
+    assert metrics.INSTALL_SECONDS.count(source="archive") == 2
+
+
+def test_openmetrics_rendering():
+    """Counters use family names without _total and files end with # EOF."""
+    metrics.DOWNLOADS.inc(host="github.com")
+    metrics.INSTALL_SECONDS.observe(0.2, source="archive")
+
+    text = metrics.render(metrics.collect())
+
+    assert "# TYPE agent_skills_upd_downloads counter" in text
+    assert 'agent_skills_upd_downloads_total{host="github.com"} 1' in text
+    assert 'agent_skills_upd_install_duration_seconds_bucket{source="archive",le="0.1"} 0' in text
+    assert 'agent_skills_upd_install_duration_seconds_bucket{source="archive",le="0.25"} 1' in text
+    assert 'agent_skills_upd_install_duration_seconds_bucket{source="archive",le="+Inf"} 1' in text
+    assert text.endswith("# EOF\n")
+
+
+def test_flush_merges_runs_into_textfile(tmp_path, monkeypatch):
+    """Merged flushes accumulate totals from separate runs."""
+    target = tmp_path / "agent_skills_upd.prom"
+    monkeypatch.setenv(metrics.METRICS_FILE_ENV, str(target))
+
+    for _ in range(2):
+        metrics.DOWNLOAD_BYTES.inc(100, host="github.com")
+        metrics.flush()
+
+    text = target.read_text()
+    assert "# TYPE agent_skills_upd_download_bytes_total counter" in text
+    assert 'agent_skills_upd_download_bytes_total{host="github.com"} 200' in text
+    assert "# EOF" not in text
@@ -0,0 +1,66 @@
+"""Tests for the negative-result cache."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from agent_skills_upd import negative
+from agent_skills_upd.exceptions import RepoNotFoundError, ResourceNotFoundError
+from agent_skills_upd.fetcher import ResourceType, fetch_clawdhub_skill, fetch_resource
+
+from synthetic import RepoSpec, generate_repo
+
+
+def fetch(server, repo_name, name, dest):
+    return fetch_resource(
+        "bench", name, dest, ResourceType.SKILL, host=server.base_url, repo=repo_name
+    )
+
+
+def test_missing_resource_is_not_downloaded_again(tmp_path, monkeypatch, fake_host, bench_repo):
+    repo_name = bench_repo.spec.repo_name
+    with pytest.raises(ResourceNotFoundError) as first:
+        fetch(fake_host, repo_name, "missing", tmp_path / "dest")
+    requests = fake_host.requests
+
+    with pytest.raises(ResourceNotFoundError) as second:
+        fetch(fake_host, repo_name, "missing", tmp_path / "dest")
+    assert str(second.value) == str(first.value)
+    assert fake_host.requests == requests
+
+    # Other resources of the same repository are unaffected.
+    fetch(fake_host, repo_name, "bench-skill", tmp_path / "dest")
+
+    monkeypatch.setenv(negative.NEGATIVE_TTL_ENV, "0")
+    with pytest.raises(ResourceNotFoundError):
+        fetch(fake_host, repo_name, "missing", tmp_path / "dest")
+    assert fake_host.requests > requests
+
+
+def test_missing_repo_is_remembered_until_cleared(tmp_path, fake_host):
+    repo = generate_repo(RepoSpec(files=5, total_bytes=8 * 1024), tmp_path / "repo")
+    with pytest.raises(RepoNotFoundError):
+        fetch(fake_host, repo.spec.repo_name, "bench-skill", tmp_path / "dest")
+
+    # Published since, but the miss is still cached.
+    fake_host.add_archive("bench", repo.spec.repo_name, repo.archive)
+    with pytest.raises(RepoNotFoundError):
+        fetch(fake_host, repo.spec.repo_name, "bench-skill", tmp_path / "dest")
+    assert fake_host.requests == 0
+
+    negative.clear()
+    path = fetch(fake_host, repo.spec.repo_name, "bench-skill", tmp_path / "dest")
+    assert (path / "SKILL.md").exists()
+
+
+def test_missing_clawdhub_skill_is_remembered(tmp_path):
+    response = MagicMock(status_code=404)
+    client = MagicMock()
+    client.__enter__.return_value.get.return_value = response
+
+    with patch("httpx.Client", return_value=client):
+        for _ in range(2):
+            with pytest.raises(ResourceNotFoundError):
+                fetch_clawdhub_skill("no-such-skill", tmp_path / "skills")
+
+    assert client.__enter__.return_value.get.call_count == 1
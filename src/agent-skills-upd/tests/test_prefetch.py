@@ -0,0 +1,57 @@
+"""Tests for warming the cache with prefetch."""
+
+import os
+
+from typer.testing import CliRunner
+
+from agent_skills_upd.bundle import BundleItem
+from agent_skills_upd.cli.skill import app as skill_app
+from agent_skills_upd.fetcher import ResourceType, fetch_resource
+from agent_skills_upd.prefetch import prefetch
+from agent_skills_upd.providers import get_repo_provider
+
+
+def test_prefetch_fills_cache_without_installing(tmp_path, monkeypatch, fake_host, bench_repo):
+    project = tmp_path / "project"
+    project.mkdir()
+    monkeypatch.chdir(project)
+    items = [
+        BundleItem(
+            ResourceType.SKILL,
+            name,
+            get_repo_provider(fake_host.base_url, "bench", bench_repo.spec.repo_name),
+            f"bench/{name}",
+        )
+        for name in ("bench-skill", "bench-skill", "missing")
+    ]
+
+    results = prefetch(items)
+
+    assert [result.name for result in results[:2]] == ["bench-skill", "bench-skill"]
+    assert "missing" in results[2].error
+    assert os.listdir(project) == []
+    downloaded = fake_host.bytes_sent
+
+    # Later installs only revalidate the cached archive.
+    fetch_resource(
+        "bench", "bench-skill", tmp_path / "dest", ResourceType.SKILL, host=fake_host.base_url
+    )
+    assert fake_host.bytes_sent == downloaded
+
+
+def test_cli_prefetch_manifest_and_failures(tmp_path):
+    source = tmp_path / "repo"
+    (source / ".claude" / "skills" / "demo").mkdir(parents=True)
+    (source / ".claude" / "skills" / "demo" / "SKILL.md").write_text("---\nname: demo\n---\n")
+    manifest = tmp_path / "refs.txt"
+    manifest.write_text(f"# resources for the image\n\n{source}#demo\n")
+    runner = CliRunner()
+
+    result = runner.invoke(skill_app, ["prefetch", "--manifest", str(manifest)])
+    assert result.exit_code == 0, result.output
+    assert "Prefetched 1 of 1 ref(s)" in result.output
+
+    result = runner.invoke(skill_app, ["prefetch", "-f", str(manifest), f"{source}#missing"])
+    assert result.exit_code == 1
+    assert "Prefetched 1 of 2 ref(s)" in result.output
+    assert f"{source}#missing" in result.output
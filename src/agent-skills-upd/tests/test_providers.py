@@ -0,0 +1,147 @@
+"""Tests for source providers and local installs."""
+
+import io
+import tarfile
+import zipfile
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from agent_skills_upd.cli.command import app as command_app
+from agent_skills_upd.cli.skill import app as skill_app
+from agent_skills_upd.exceptions import ResourceNotFoundError
+from agent_skills_upd.fetcher import ResourceType, fetch_local_resource
+from agent_skills_upd.providers import (
+    ArchiveProvider,
+    LocalArchiveProvider,
+    get_local_provider,
+)
+
+FILES = {
+    ".claude/skills/demo/SKILL.md": "---\nname: demo\n---\n",
+    ".claude/skills/demo/scripts/run.sh": "#!/bin/sh\necho hi\n",
+    ".claude/commands/hello.md": "# hello\n",
+    "skills/other/SKILL.md": "other",
+}
+
+
+def write_tree(root: Path, files: dict[str, str]) -> None:
+    for name, content in files.items():
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+
+
+def build_tarball(path: Path, files: dict[str, str], prefix: str = "repo-main/") -> None:
+    with tarfile.open(path, "w:gz") as tar:
+        for name, content in files.items():
+            data = content.encode()
+            info = tarfile.TarInfo(prefix + name)
+            info.size = len(data)
+            info.mode = 0o755 if name.endswith(".sh") else 0o644
+            tar.addfile(info, io.BytesIO(data))
+
+
+def test_local_dir_install_skips_git_metadata(tmp_path):
+    """Working trees install straight from disk, without .git."""
+    source = tmp_path / "work"
+    write_tree(source, {**FILES, ".claude/skills/demo/.git/HEAD": "ref"})
+
+    result = fetch_local_resource(source, "demo", tmp_path / "dest", ResourceType.SKILL)
+
+    assert (result / "scripts" / "run.sh").read_text().startswith("#!/bin/sh")
+    assert not (result / ".git").exists()
+
+    command = fetch_local_resource(source, "hello", tmp_path / "cmds", ResourceType.COMMAND)
+    assert command == tmp_path / "cmds" / "hello.md"
+
+
+@pytest.mark.parametrize("suffix", [".tar.gz", ".zip"])
+def test_local_archive_installs_only_resource_members(tmp_path, suffix):
+    """Archives are listed in place and only the resource's members are written."""
+    archive = tmp_path / f"resources{suffix}"
+    if suffix == ".zip":
+        with zipfile.ZipFile(archive, "w") as zf:
+            for name, content in FILES.items():
+                zf.writestr(f"repo-main/{name}", content)
+    else:
+        build_tarball(archive, FILES)
+
+    provider = get_local_provider(archive)
+    assert isinstance(provider, LocalArchiveProvider)
+    assert provider.capabilities.tree_listing
+    provider.close()
+
+    dest = tmp_path / "dest"
+    result = fetch_local_resource(archive, "demo", dest, ResourceType.SKILL)
+
+    assert sorted(p.relative_to(dest).as_posix() for p in dest.rglob("*") if p.is_file()) == [
+        "demo/SKILL.md",
+        "demo/scripts/run.sh",
+    ]
+    if suffix == ".tar.gz":
+        assert (result / "scripts" / "run.sh").stat().st_mode & 0o100
+
+
+def test_local_tarball_members_are_read_in_archive_order(tmp_path, monkeypatch):
+    """Compressed tar members are read front to back, never seeking backwards."""
+    files = {f".claude/skills/demo/{name}": name for name in ("z.md", "SKILL.md", "a.md")}
+    archive = tmp_path / "unsorted.tar.gz"
+    build_tarball(archive, files)
+    offsets = []
+    extractfile = tarfile.TarFile.extractfile
+
+    def recording_extractfile(self, member):
+        offsets.append(member.offset_data)
+        return extractfile(self, member)
+
+    provider = LocalArchiveProvider(archive)
+    monkeypatch.setattr(tarfile.TarFile, "extractfile", recording_extractfile)
+    provider.fetch_members(".claude/skills/demo", tmp_path / "dest", True)
+    provider.close()
+
+    assert len(offsets) == 3
+    assert offsets == sorted(offsets)
+    assert (tmp_path / "dest" / "z.md").read_text() == "z.md"
+
+
+def test_local_root_skill_and_not_found_message(tmp_path):
+    """Root SKILL.md sources resolve their name; misses name the local path."""
+    archive = tmp_path / "rooted.tar.gz"
+    build_tarball(archive, {"SKILL.md": "---\nname: rooted\n---\n", "notes.txt": "n"})
+
+    result = fetch_local_resource(archive, None, tmp_path / "dest", ResourceType.SKILL)
+    assert result == tmp_path / "dest" / "rooted"
+    assert (result / "notes.txt").read_text() == "n"
+
+    source = tmp_path / "work"
+    write_tree(source, FILES)
+    with pytest.raises(ResourceNotFoundError) as exc_info:
+        fetch_local_resource(source, "missing", tmp_path / "dest", ResourceType.COMMAND)
+    message = str(exc_info.value)
+    assert str(source) in message
+    assert "Found directories: .claude/skills, skills, .claude/commands" in message
+    assert "Visit" not in message
+
+    assert not ArchiveProvider("github.com", "user", "repo").capabilities.tree_listing
+
+
+def test_cli_installs_from_local_path(tmp_path):
+    """Path refs with a #name fragment install through the local provider."""
+    source = tmp_path / "work"
+    write_tree(source, FILES)
+    runner = CliRunner()
+
+    result = runner.invoke(skill_app, [f"{source}#demo", "--dest", str(tmp_path / "skills")])
+    assert result.exit_code == 0, result.output
+    assert "Installed skill 'demo'" in result.output
+    assert (tmp_path / "skills" / "demo" / "SKILL.md").exists()
+
+    result = runner.invoke(command_app, [f"file://{source}#hello", "--dest", str(tmp_path / "c")])
+    assert result.exit_code == 0, result.output
+    assert (tmp_path / "c" / "hello.md").exists()
+
+    result = runner.invoke(command_app, [str(source), "--dest", str(tmp_path / "c")])
+    assert result.exit_code == 1
+    assert "<path>#<command-name>" in result.output
@@ -0,0 +1,93 @@
+"""Tests for default-branch resolution."""
+
+import io
+import json
+import tarfile
+from unittest.mock import MagicMock, patch
+
+from agent_skills_upd import refs
+from agent_skills_upd.fetcher import ResourceType, fetch_resource
+from http_mock import serve_streams
+
+ADVERTISEMENT = (
+    b"001e# service=git-upload-pack\n0000"
+    b"004f" + b"0" * 40 + b" HEAD\x00multi_ack symref=HEAD:refs/heads/{branch} agent=git/2\n0000"
+)
+
+
+def branch_tarball(repo: str, branch: str) -> bytes:
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as tar:
+        data = b"# hello"
+        info = tarfile.TarInfo(f"{repo}-{branch}/.claude/commands/hello.md")
+        info.size = len(data)
+        tar.addfile(info, io.BytesIO(data))
+    return buffer.getvalue()
+
+
+def fake_host(branch: str, requests: list[str]):
+    """Answer info/refs with `branch` as default and serve only that branch."""
+
+    def get(url, **kwargs):
+        requests.append(url)
+        response = MagicMock()
+        response.status_code = 404
+        if url.endswith("/info/refs"):
+            response.status_code = 200
+            response.content = ADVERTISEMENT.replace(b"{branch}", branch.encode())
+        elif url.endswith(f"/refs/heads/{branch}.tar.gz"):
+            response.status_code = 200
+            response.content = branch_tarball("agent-resources", branch)
+        return response
+
+    return get
+
+
+def test_parse_symref_and_head_file():
+    assert refs.parse_symref(ADVERTISEMENT.replace(b"{branch}", b"trunk")) == "trunk"
+    assert refs.parse_symref(b"001e# service=git-upload-pack\n0000") is None
+    assert refs.parse_head_file(b"ref: refs/heads/master\n") == "master"
+    assert refs.parse_head_file(b"0123abcd\n") is None
+
+
+def test_default_branch_is_resolved_once_and_cached(tmp_path, isolated_cache_dir):
+    """A master-branch repo installs without guessing, and the branch is cached."""
+    requests: list[str] = []
+    with patch("httpx.Client") as mock_client:
+        serve_streams(mock_client)
+        mock_client.return_value.__enter__.return_value.get.side_effect = fake_host(
+            "master", requests
+        )
+        for _ in range(2):
+            result = fetch_resource("user", "hello", tmp_path / "dest", ResourceType.COMMAND)
+            assert result.read_text() == "# hello"
+
+    archive_url = "https://github.com/user/agent-resources/archive/refs/heads/master.tar.gz"
+    assert requests == [
+        "https://github.com/user/agent-resources.git/info/refs",
+        archive_url,
+        archive_url,
+    ]
+    cache = json.loads((isolated_cache_dir / refs.REFS_CACHE_FILENAME).read_text())
+    assert cache["github.com/user/agent-resources"]["branch"] == "master"
+
+
+def test_stale_cached_branch_is_re_resolved(tmp_path, isolated_cache_dir):
+    """A renamed default branch invalidates the cache instead of failing."""
+    isolated_cache_dir.mkdir(parents=True)
+    (isolated_cache_dir / refs.REFS_CACHE_FILENAME).write_text(
+        json.dumps(
+            {"github.com/user/agent-resources": {"branch": "master", "resolved_at": 4e9}}
+        )
+    )
+    requests: list[str] = []
+    with patch("httpx.Client") as mock_client:
+        serve_streams(mock_client)
+        mock_client.return_value.__enter__.return_value.get.side_effect = fake_host(
+            "trunk", requests
+        )
+        result = fetch_resource("user", "hello", tmp_path / "dest", ResourceType.COMMAND)
+
+    assert result.read_text() == "# hello"
+    assert requests[-1].endswith("/refs/heads/trunk.tar.gz")
+    assert refs.get_cached_branch("github.com", "user", "agent-resources") == "trunk"
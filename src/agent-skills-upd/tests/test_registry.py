@@ -0,0 +1,83 @@
+"""Tests for the install registry and the list/which/remove commands."""
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from agent_skills_upd import installs
+from agent_skills_upd.cli.command import app as command_app
+from agent_skills_upd.cli.skill import app as skill_app
+from agent_skills_upd.fetcher import ResourceType, fetch_local_resource
+
+
+def write_repo(root: Path) -> Path:
+    for name in ("alpha", "beta"):
+        skill_dir = root / ".claude" / "skills" / name
+        skill_dir.mkdir(parents=True, exist_ok=True)
+        (skill_dir / "SKILL.md").write_text(f"---\nname: {name}\n---\n")
+    commands = root / ".claude" / "commands"
+    commands.mkdir(parents=True, exist_ok=True)
+    (commands / "hello.md").write_text("# hello")
+    return root
+
+
+def test_list_which_remove(tmp_path):
+    source = write_repo(tmp_path / "repo")
+    skills = tmp_path / "skills"
+    for name in ("alpha", "beta"):
+        fetch_local_resource(source, name, skills, ResourceType.SKILL)
+    fetch_local_resource(source, "hello", tmp_path / "commands", ResourceType.COMMAND)
+    runner = CliRunner()
+
+    result = runner.invoke(skill_app, ["list"])
+    assert result.exit_code == 0, result.output
+    assert [line.split()[0] for line in result.output.splitlines()] == ["alpha", "beta"]
+    assert str(source) in result.output
+
+    result = runner.invoke(command_app, ["list", "--all"])
+    assert len(result.output.splitlines()) == 3
+
+    result = runner.invoke(skill_app, ["which", "beta"])
+    assert result.exit_code == 0, result.output
+    assert str(skills / "beta") in result.output
+
+    result = runner.invoke(skill_app, ["remove", "beta", "--dest", str(skills)])
+    assert result.exit_code == 0, result.output
+    assert not (skills / "beta").exists()
+    assert [record.name for record in installs.load_records("skill")] == ["alpha"]
+
+    assert runner.invoke(skill_app, ["which", "beta"]).exit_code == 1
+    assert runner.invoke(skill_app, ["remove", "beta", "--dest", str(skills)]).exit_code == 1
+
+
+def test_concurrent_installs_are_all_recorded(tmp_path):
+    files = {"SKILL.md": "0" * 64}
+
+    def install(index: int) -> None:
+        name = f"skill-{index}"
+        installs.record_install([tmp_path / name], "skill", name, {"provider": "local"}, {}, files)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(install, range(40)))
+
+    assert len(installs.load_records()) == 40
+
+
+def test_single_record_lookup_and_summaries(tmp_path):
+    files = {"SKILL.md": "0" * 64}
+    for name in ("alpha", "beta"):
+        installs.record_install([tmp_path / name], "skill", name, {"provider": "local"}, {}, files)
+
+    record = installs.load_record(tmp_path / "beta")
+    assert record.name == "beta"
+    assert record.files == files
+    assert installs.load_record(tmp_path / "gamma") is None
+
+    summaries = installs.load_records(with_files=False)
+    assert [(item.name, item.files) for item in summaries] == [("alpha", {}), ("beta", {})]
+    # Polling state saved from a summary leaves the digests alone.
+    summaries[1].failures = 2
+    installs.update_records(summaries)
+    record = installs.load_record(tmp_path / "beta")
+    assert (record.failures, record.files) == (2, files)
@@ -0,0 +1,60 @@
+"""Start-up cost regression tests for the CLI entry points."""
+
+import json
+import subprocess
+import sys
+from unittest.mock import patch
+
+from agent_skills_upd import config as config_module
+from agent_skills_upd.cli.common import get_environment_config
+
+HEAVY_MODULES = ["httpx", "rich", "yaml", "frontmatter"]
+
+PROBE = """
+import json, sys
+import agent_skills_upd.cli.skill
+import agent_skills_upd.cli.command
+import agent_skills_upd.cli.agent
+print(json.dumps(sorted(m for m in {heavy!r} if m in sys.modules)))
+"""
+
+
+def test_cli_import_does_not_load_heavy_modules():
+    """Importing the CLI modules must not pull in network/rendering/YAML stacks."""
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE.format(heavy=HEAVY_MODULES)],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert json.loads(result.stdout) == []
+
+
+def test_config_is_parsed_once_per_file_version(tmp_path):
+    """The user config is re-parsed only when its mtime/size change."""
+    home_dir = tmp_path / "home"
+    home_dir.mkdir()
+    config_path = home_dir / config_module.CONFIG_FILENAME
+    config_path.write_text(
+        "environments:\n  custom:\n    skill_dir: .custom/skills\n",
+        encoding="utf-8",
+    )
+    config_module._config_memo.clear()
+
+    with patch("agent_skills_upd.config.Path.home", return_value=home_dir):
+        with patch("yaml.safe_load", wraps=__import__("yaml").safe_load) as mock_load:
+            assert get_environment_config("custom")["skill_dir"] == ".custom/skills"
+            assert get_environment_config("custom")["skill_dir"] == ".custom/skills"
+            assert mock_load.call_count == 1
+
+            # A fresh process reuses the compiled JSON instead of parsing YAML.
+            config_module._config_memo.clear()
+            assert get_environment_config("custom")["skill_dir"] == ".custom/skills"
+            assert mock_load.call_count == 1
+
+            config_path.write_text(
+                "environments:\n  custom:\n    skill_dir: .changed/skills\n",
+                encoding="utf-8",
+            )
+            assert get_environment_config("custom")["skill_dir"] == ".changed/skills"
+            assert mock_load.call_count == 2
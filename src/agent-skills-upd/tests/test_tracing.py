@@ -0,0 +1,88 @@
+"""Tests for tracing spans, --timings and --trace."""
+
+import json
+import tarfile
+from contextlib import nullcontext
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from typer.testing import CliRunner
+
+from agent_skills_upd import tracing
+from agent_skills_upd.cli.command import app as command_app
+from agent_skills_upd.fetcher import ResourceType, fetch_resource
+from http_mock import serve_streams
+
+
+def make_tarball(tmp_path: Path) -> bytes:
+    """Build an agent-resources-main tarball with one two-file skill."""
+    skill_dir = tmp_path / "src" / "agent-resources-main" / ".claude" / "skills" / "traced"
+    skill_dir.mkdir(parents=True)
+    (skill_dir / "SKILL.md").write_text("---\nname: traced\n---\n")
+    (skill_dir / "data.txt").write_text("x" * 100)
+    tarball_path = tmp_path / "repo.tar.gz"
+    with tarfile.open(tarball_path, "w:gz") as tar:
+        tar.add(tmp_path / "src" / "agent-resources-main", arcname="agent-resources-main")
+    return tarball_path.read_bytes()
+
+
+def mock_client(tarball_bytes: bytes) -> MagicMock:
+    response = MagicMock()
+    response.status_code = 200
+    response.content = tarball_bytes
+    client = MagicMock()
+    client.return_value.__enter__.return_value.get.return_value = response
+    serve_streams(client)
+    return client
+
+
+def test_spans_cover_each_phase_with_counts(tmp_path):
+    """fetch_resource records download/extract/find/copy spans with counters."""
+    tarball_bytes = make_tarball(tmp_path)
+
+    with patch("httpx.Client", mock_client(tarball_bytes)):
+        with tracing.tracing() as tracer:
+            fetch_resource("user", "traced", tmp_path / "dest", ResourceType.SKILL)
+
+    spans = {span.name: span for span in tracer.spans}
+    assert {"download", "extract", "extract.gunzip", "find", "copy"} <= set(spans)
+    assert spans["download"].attrs["bytes"] == len(tarball_bytes)
+    assert spans["extract"].attrs["files"] == 2
+    assert spans["copy"].attrs == {"files": 2, "bytes": 121}
+
+
+def test_spans_are_noops_without_tracer():
+    """Without an active tracer nothing is recorded."""
+    with tracing.span("download") as span:
+        span.set(bytes=1)
+    assert not tracing.is_enabled()
+    assert span.attrs == {}
+
+
+def test_cli_timings_and_trace_file(tmp_path):
+    """--timings prints a breakdown and --trace appends across runs."""
+    runner = CliRunner()
+    trace_path = tmp_path / "trace.jsonl"
+
+    def fake_fetch(*args, **kwargs):
+        with tracing.span("download", bytes=10):
+            pass
+        return Path("hello.md")
+
+    with (
+        patch("agent_skills_upd.cli.command.fetch_resource", side_effect=fake_fetch),
+        patch("agent_skills_upd.cli.command.fetch_spinner", return_value=nullcontext()),
+        patch("agent_skills_upd.cli.command.print_success_message"),
+    ):
+        for _ in range(2):
+            result = runner.invoke(
+                command_app,
+                ["user/hello", "--timings", "--trace", str(trace_path)],
+            )
+            assert result.exit_code == 0
+            assert "Timings:" in result.stderr
+            assert "bytes=10" in result.stderr
+
+    events = [json.loads(line) for line in trace_path.read_text().splitlines()]
+    assert [event["name"] for event in events] == ["total", "download"] * 2
+    assert all(event["ph"] == "X" for event in events)
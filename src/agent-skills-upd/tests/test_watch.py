@@ -0,0 +1,88 @@
+"""Tests for keeping installed resources in sync with watch."""
+
+import shutil
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from agent_skills_upd import installs
+from agent_skills_upd.cli.skill import app as skill_app
+from agent_skills_upd.fetcher import ResourceType, fetch_local_resource, fetch_resource
+from agent_skills_upd.installs import InstallRecord
+from agent_skills_upd.watch import check_once, next_interval
+
+
+def write_repo(root: Path, version: str = "v1") -> Path:
+    skill_dir = root / ".claude" / "skills" / "demo"
+    skill_dir.mkdir(parents=True, exist_ok=True)
+    (skill_dir / "SKILL.md").write_text(f"---\nname: demo\n---\n{version}\n")
+    return root
+
+
+def test_unchanged_source_is_left_alone(tmp_path):
+    """A poll that finds no change rewrites nothing and backs off."""
+    source = write_repo(tmp_path / "repo")
+    installed = fetch_local_resource(source, "demo", tmp_path / "dest", ResourceType.SKILL)
+    inode = (installed / "SKILL.md").stat().st_ino
+
+    first = check_once(force=True, min_interval=10, max_interval=100)
+    second = check_once(force=True, min_interval=10, max_interval=100)
+
+    assert [event.status for event in first + second] == ["unchanged", "unchanged"]
+    assert second[0].record.interval == 2 * first[0].record.interval == 20
+    assert (installed / "SKILL.md").stat().st_ino == inode
+    assert check_once(min_interval=10, max_interval=100) == []  # nothing due yet
+
+
+def test_changed_source_is_applied(tmp_path):
+    source = write_repo(tmp_path / "repo")
+    installed = fetch_local_resource(source, "demo", tmp_path / "dest", ResourceType.SKILL)
+    write_repo(source, "v2")
+
+    events = check_once(force=True)
+
+    assert [event.status for event in events] == ["updated"]
+    assert (installed / "SKILL.md").read_text().endswith("v2\n")
+    assert check_once(force=True)[0].status == "unchanged"
+
+    shutil.rmtree(installed)
+    assert [event.status for event in check_once(force=True)] == ["removed"]
+    assert installs.load_records() == []
+
+
+def test_unchanged_archive_costs_a_304(tmp_path, fake_host, bench_repo):
+    """Polling a repo archive revalidates it instead of downloading it again."""
+    fetch_resource(
+        "bench", "bench-skill", tmp_path / "dest", ResourceType.SKILL, host=fake_host.base_url
+    )
+    downloaded = fake_host.bytes_sent
+
+    events = check_once(force=True)
+
+    assert [event.status for event in events] == ["unchanged"]
+    assert fake_host.bytes_sent == downloaded
+    assert fake_host.requests == 2
+
+
+def test_errors_back_off():
+    record = InstallRecord(path="x", resource_type="skill", name="x", source={})
+    assert next_interval(record, changed=False, failed=True, min_interval=10) == 20
+    record.failures = 3
+    assert next_interval(record, False, True, min_interval=10, max_interval=100) == 100
+    record.interval = 80
+    assert next_interval(record, changed=True, failed=False, min_interval=10) == 10
+
+
+def test_cli_watch_once_and_default_add(tmp_path):
+    """`watch` is a subcommand, while bare refs still run add."""
+    source = write_repo(tmp_path / "repo")
+    runner = CliRunner()
+
+    result = runner.invoke(skill_app, [f"{source}#demo", "--dest", str(tmp_path / "dest")])
+    assert result.exit_code == 0, result.output
+
+    write_repo(source, "v2")
+    result = runner.invoke(skill_app, ["watch", "--once"])
+    assert result.exit_code == 0, result.output
+    assert "Updated skill 'demo'" in result.output
+    assert "Checked 1 installed resource(s), 0 unchanged" in result.output